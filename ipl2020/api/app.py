@@ -4,15 +4,1298 @@ IPL Cricket Hub - Flask API Backend
 Provides REST API endpoints for live scores, points table, and match data
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from datetime import datetime, timedelta
+import numpy as np
+import csv
+import gc
+import io
 import json
+import os
 import random
+import threading
+import time
+import requests
+from array import array
+try:
+    import resource
+except ImportError:   # not available on Windows
+    resource = None
+try:
+    import fcntl
+except ImportError:   # not available on Windows
+    fcntl = None
+from requests.adapters import HTTPAdapter
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from itertools import islice
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# ==========================================
+# BALL-BY-BALL SCORING
+# ==========================================
+
+BALLS_PER_INNINGS = 120
+EXTRA_TYPES = ('wide', 'noball', 'bye', 'legbye')
+
+def format_overs(balls):
+    """Format a legal ball count as cricket overs, e.g. 105 -> '17.3'"""
+    return f"{balls // 6}.{balls % 6}"
+
+def plural(count, word):
+    return f"{count} {word}" if count == 1 else f"{count} {word}s"
+
+def add_to_totals(innings, ball):
+    """Add one validated delivery to an innings' runs / wickets / legal balls"""
+    innings['runs'] += ball['runs'] + ball['extras']
+    if ball['wicket']:
+        innings['wickets'] += 1
+    if ball['extra_type'] not in ('wide', 'noball'):
+        innings['balls'] += 1
+
+SERIES_ROLLING_OVERS = 3
+
+class InningsSeries:
+    """Per-over worm and Manhattan arrays for one innings, extended ball by ball.
+    
+    The last entry of each array describes the over in progress, so every
+    delivery is an O(1) update and charts never need the ball log.
+    """
+    
+    def __init__(self):
+        self.runs_per_over = array('H')
+        self.wickets_per_over = array('B')
+        self.cumulative_runs = array('H')
+        self.run_rate = array('f')
+        self.rolling_run_rate = array('f')
+    
+    @classmethod
+    def from_totals(cls, innings):
+        """Series for totals that came without ball detail, spread evenly over the overs"""
+        series = cls()
+        totals = {'runs': 0, 'wickets': 0, 'balls': 0}
+        for event in scripted_innings(innings['runs'], innings['wickets'], innings['balls']):
+            over = totals['balls'] // 6
+            totals['runs'] += event['runs']
+            totals['wickets'] += event['wicket']
+            totals['balls'] += 1
+            series.add_ball(over, event['runs'], event['wicket'], totals)
+        return series
+    
+    def add_ball(self, over, runs, wicket, innings):
+        """Add one delivery bowled in `over` (0-based); innings holds the updated totals"""
+        while over >= len(self.runs_per_over):
+            self.runs_per_over.append(0)
+            self.wickets_per_over.append(0)
+            self.cumulative_runs.append(self.cumulative_runs[-1] if len(self.cumulative_runs) else 0)
+            self.run_rate.append(0)
+            self.rolling_run_rate.append(0)
+        
+        self.runs_per_over[-1] += runs
+        self.wickets_per_over[-1] += wicket
+        self.cumulative_runs[-1] = innings['runs']
+        
+        balls = innings['balls']
+        if balls:
+            self.run_rate[-1] = innings['runs'] * 6 / balls
+            window_start = max(0, over + 1 - SERIES_ROLLING_OVERS)
+            window_runs = innings['runs'] - (self.cumulative_runs[window_start - 1] if window_start else 0)
+            window_balls = balls - window_start * 6
+            if window_balls > 0:
+                self.rolling_run_rate[-1] = window_runs * 6 / window_balls
+    
+    def to_dict(self, team, balls):
+        return {
+            'team': team,
+            'overs': format_overs(balls),
+            'runs_per_over': self.runs_per_over.tolist(),
+            'wickets_per_over': self.wickets_per_over.tolist(),
+            'cumulative_runs': self.cumulative_runs.tolist(),
+            'run_rate': [round(rate, 2) for rate in self.run_rate],
+            'rolling_run_rate': [round(rate, 2) for rate in self.rolling_run_rate]
+        }
+
+class MatchScorer:
+    """Keeps one match's score up to date from an append-only log of ball events.
+    
+    Each ball updates the running innings totals and rewrites only the score,
+    overs, rate and status fields of the match dict, so readers always see the
+    current state without replaying the log.
+    """
+    
+    def __init__(self, match):
+        self.match = match
+        self.batting_order = (match['team1'], match['team2'])
+        self.innings = [{'runs': 0, 'wickets': 0, 'balls': 0} for _ in self.batting_order]
+        self.series = [InningsSeries() for _ in self.batting_order]
+        self.current = 0
+        self.complete = False
+        self.events = []
+        self.synced = None   # last upstream totals and how many balls had been logged then
+        self._refresh()
+    
+    @property
+    def target(self):
+        return self.innings[0]['runs'] + 1
+    
+    @property
+    def started(self):
+        return bool(self.events) or any(innings['balls'] or innings['runs'] for innings in self.innings)
+    
+    def sync(self, innings, complete=False):
+        """Overwrite the innings totals from an upstream summary that has no ball detail"""
+        if not 1 <= len(innings) <= 2:
+            raise ValueError('A summary must have one or two innings')
+        try:
+            synced = [
+                {'runs': int(totals['runs']), 'wickets': int(totals['wickets']), 'balls': int(totals['balls'])}
+                for totals in innings
+            ]
+        except (TypeError, ValueError):
+            raise ValueError('Innings runs, wickets and balls must be integers')
+        for totals in synced:
+            if min(totals.values()) < 0 or totals['wickets'] > 10 or totals['balls'] > BALLS_PER_INNINGS:
+                raise ValueError('Invalid innings figures')
+        
+        for number, totals in enumerate(synced):
+            self.innings[number] = dict(totals)
+        first = self.innings[0]
+        first_over = first['wickets'] >= 10 or first['balls'] >= BALLS_PER_INNINGS
+        self.current = 1 if len(innings) == 2 or first_over else 0
+        self.complete = bool(complete) and len(innings) == 2
+        self.synced = {'innings': synced, 'events': len(self.events)}
+        self._rebuild_series()
+        self._refresh()
+    
+    def export_state(self):
+        return {
+            'match': self.match,
+            'innings': self.innings,
+            'current': self.current,
+            'complete': self.complete,
+            'events': self.events,
+            'synced': self.synced
+        }
+    
+    @classmethod
+    def from_state(cls, state):
+        scorer = cls(state['match'])
+        scorer.innings = state['innings']
+        scorer.current = state['current']
+        scorer.complete = state['complete']
+        scorer.events = state['events']
+        scorer.synced = state.get('synced')
+        scorer._rebuild_series()
+        scorer._refresh()
+        return scorer
+    
+    def _rebuild_series(self):
+        """Recompute the per-over series from the last synced totals and the ball log"""
+        self.series = [InningsSeries() for _ in self.batting_order]
+        totals = [{'runs': 0, 'wickets': 0, 'balls': 0} for _ in self.batting_order]
+        events = self.events
+        if self.synced is not None:
+            for number, synced in enumerate(self.synced['innings']):
+                totals[number] = dict(synced)
+                self.series[number] = InningsSeries.from_totals(synced)
+            events = self.events[self.synced['events']:]
+        
+        for ball in events:
+            innings = totals[ball['innings'] - 1]
+            over = innings['balls'] // 6
+            add_to_totals(innings, ball)
+            self.series[ball['innings'] - 1].add_ball(over, ball['runs'] + ball['extras'], ball['wicket'], innings)
+    
+    def series_data(self):
+        """Worm / Manhattan arrays for each innings that has started"""
+        return [
+            series.to_dict(team, innings['balls'])
+            for team, innings, series in zip(self.batting_order, self.innings, self.series)
+            if len(series.runs_per_over)
+        ]
+    
+    def record_ball(self, event):
+        """Apply one delivery and return the stored event"""
+        if self.complete:
+            raise ValueError('Match is already complete')
+        
+        ball = self._validate(event)
+        innings = self.innings[self.current]
+        over = innings['balls'] // 6
+        add_to_totals(innings, ball)
+        
+        ball['seq'] = len(self.events) + 1
+        ball['innings'] = self.current + 1
+        ball['over'] = format_overs(innings['balls'])
+        self.events.append(ball)
+        self.series[self.current].add_ball(over, ball['runs'] + ball['extras'], ball['wicket'], innings)
+        
+        if self._innings_over(innings, self.current):
+            if self.current == 0:
+                self.current = 1
+            else:
+                self.complete = True
+        
+        self._refresh(ball)
+        return ball
+    
+    def check_events(self, events):
+        """Raise ValueError if any event of a batch is malformed or comes after the
+        match ends, without changing any state, so a batch is applied all or nothing.
+        Returns the final innings totals if the batch completes the match, else None."""
+        innings = [dict(totals) for totals in self.innings]
+        current, complete = self.current, self.complete
+        for event in events:
+            if complete:
+                raise ValueError('Match is already complete')
+            ball = self._validate(event)
+            add_to_totals(innings[current], ball)
+            if self._innings_over(innings[current], current, innings[0]['runs'] + 1):
+                if current == 0:
+                    current = 1
+                else:
+                    complete = True
+        return innings if complete and not self.complete else None
+    
+    def _validate(self, event):
+        """Normalise an incoming event, raising ValueError if it is malformed"""
+        if not isinstance(event, dict):
+            raise ValueError('Ball event must be an object')
+        
+        try:
+            runs = int(event.get('runs', 0))
+            extras = int(event.get('extras', 0))
+        except (TypeError, ValueError):
+            raise ValueError('runs and extras must be integers')
+        
+        extra_type = event.get('extra_type') or None
+        if extra_type is not None and extra_type not in EXTRA_TYPES:
+            raise ValueError(f"extra_type must be one of {', '.join(EXTRA_TYPES)}")
+        if extra_type in ('wide', 'noball') and extras < 1:
+            extras = 1
+        if not 0 <= runs <= 7 or not 0 <= extras <= 7:
+            raise ValueError('runs and extras must be between 0 and 7')
+        
+        return {
+            'runs': runs,
+            'extras': extras,
+            'extra_type': extra_type,
+            'wicket': bool(event.get('wicket', False)),
+            'dismissal': event.get('dismissal'),
+            'batter': event.get('batter'),
+            'bowler': event.get('bowler')
+        }
+    
+    def _innings_over(self, innings, current, target=None):
+        if innings['wickets'] >= 10 or innings['balls'] >= BALLS_PER_INNINGS:
+            return True
+        return current == 1 and innings['runs'] >= (target or self.target)
+    
+    def _refresh(self, ball=None):
+        """Rewrite the derived score fields on the match dict"""
+        match = self.match
+        for number, innings in enumerate(self.innings, start=1):
+            match[f'team{number}_score'] = f"{innings['runs']}/{innings['wickets']}"
+            match[f'overs{number}'] = format_overs(innings['balls'])
+        
+        innings = self.innings[self.current]
+        match['live'] = self.started and not self.complete
+        match['run_rate'] = round(innings['runs'] * 6 / innings['balls'], 2) if innings['balls'] and match['live'] else None
+        match['required_rate'] = None
+        match['status'] = self._status()
+        
+        if self.current == 1 and match['live']:
+            balls_left = BALLS_PER_INNINGS - innings['balls']
+            match['required_rate'] = round((self.target - innings['runs']) * 6 / balls_left, 2)
+        
+        if ball is not None:
+            match['last_ball'] = {
+                'seq': ball['seq'],
+                'innings': ball['innings'],
+                'over': ball['over'],
+                'batter': ball['batter'],
+                'bowler': ball['bowler'],
+                'runs': ball['runs'] + ball['extras'],
+                'wicket': ball['wicket']
+            }
+    
+    def result(self, innings=None):
+        """Summarise a completed match in the shape StandingsTable expects
+        (from the given innings totals, or the scorer's own)"""
+        innings = innings or self.innings
+        first, second = self.batting_order
+        chase, target = innings[1], innings[0]['runs'] + 1
+        if chase['runs'] >= target:
+            winner = second
+        elif chase['runs'] == target - 1:
+            winner = None
+        else:
+            winner = first
+        
+        result = {
+            'winner': winner,
+            'venue': self.match.get('venue'),
+            'season': int(self.match['date'][:4]) if self.match.get('date') else None
+        }
+        for number, totals in enumerate(innings, start=1):
+            result[f'team{number}'] = self.batting_order[number - 1]
+            result[f'team{number}_runs'] = totals['runs']
+            result[f'team{number}_balls'] = totals['balls']
+            result[f'team{number}_wickets'] = totals['wickets']
+        return result
+    
+    def _status(self):
+        first, second = self.batting_order
+        chase = self.innings[1]
+        
+        if self.complete:
+            if chase['runs'] >= self.target:
+                return f"{second} won by {plural(10 - chase['wickets'], 'wicket')}"
+            if chase['runs'] == self.target - 1:
+                return "Match tied"
+            return f"{first} won by {plural(self.target - 1 - chase['runs'], 'run')}"
+        
+        if not self.started:
+            return "Yet to start"
+        
+        if self.current == 0:
+            innings = self.innings[0]
+            return f"Live - {first} {innings['runs']}/{innings['wickets']} after {format_overs(innings['balls'])} overs"
+        
+        if chase['balls'] == 0 and chase['runs'] == 0:
+            return f"Innings break - {second} need {plural(self.target, 'run')} to win"
+        
+        need = self.target - chase['runs']
+        balls_left = BALLS_PER_INNINGS - chase['balls']
+        return f"Live - {second} need {plural(need, 'run')} from {plural(balls_left, 'ball')}"
+
+def scripted_innings(runs, wickets, balls):
+    """Spread an innings total evenly over legal deliveries (used for mock data)"""
+    events = []
+    for i in range(balls):
+        events.append({
+            'runs': runs * (i + 1) // balls - runs * i // balls,
+            'wicket': wickets * (i + 1) // balls > wickets * i // balls
+        })
+    return events
+
+# ==========================================
+# POINTS TABLE
+# ==========================================
+
+POINTS_FOR_WIN = 2
+POINTS_FOR_NO_RESULT = 1
+
+def check_innings(team, runs, balls, wickets, chase_won=False):
+    """Raise ValueError for impossible innings figures. A won chase may have
+    no legal balls, since wides and no-balls alone can reach a small target."""
+    if runs < 0 or not (0 if chase_won else 1) <= balls <= BALLS_PER_INNINGS or not 0 <= wickets <= 10:
+        raise ValueError(f"Invalid innings figures for {team}")
+
+def normalize_result(result, teams):
+    """Validate a completed match result and return a copy with every figure cast.
+    
+    Raises ValueError for anything the points table, stats or archive would
+    reject, so a bad result is refused before any of them is touched.
+    """
+    team1, team2 = result['team1'], result['team2']
+    for team in (team1, team2):
+        if team not in teams:
+            raise ValueError(f"Unknown team: {team}")
+    if team1 == team2:
+        raise ValueError('A team cannot play itself')
+    
+    winner = result.get('winner')
+    if winner is not None and winner not in (team1, team2):
+        raise ValueError('winner must be one of the two teams')
+    try:
+        season = int(result.get('season') or datetime.now().year)
+    except (TypeError, ValueError):
+        raise ValueError('season must be a year')
+    
+    normalized = {
+        'team1': team1,
+        'team2': team2,
+        'winner': winner,
+        'no_result': bool(result.get('no_result', False)),
+        'venue': str(result.get('venue') or 'Unknown Venue'),
+        'season': season
+    }
+    if normalized['no_result']:
+        return normalized
+    
+    for number, team in ((1, team1), (2, team2)):
+        try:
+            runs = int(result[f'team{number}_runs'])
+            balls = int(result[f'team{number}_balls'])
+            wickets = int(result.get(f'team{number}_wickets', 0))
+        except (TypeError, ValueError):
+            raise ValueError(f"Innings figures for {team} must be integers")
+        check_innings(team, runs, balls, wickets, chase_won=number == 2 and winner == team2)
+        normalized[f'team{number}_runs'] = runs
+        normalized[f'team{number}_balls'] = balls
+        normalized[f'team{number}_wickets'] = wickets
+    return normalized
+
+class StandingsTable:
+    """Points table maintained incrementally from completed match results.
+    
+    Each result touches only the two teams involved: their rows are updated,
+    re-positioned in the sorted order and the served snapshot is rebuilt once.
+    Ties on points are broken by net run rate, then wins, then team name.
+    """
+    
+    def __init__(self, teams):
+        self.rows = {
+            team: {
+                'played': 0, 'won': 0, 'lost': 0, 'no_result': 0, 'points': 0,
+                'runs_for': 0, 'balls_faced': 0, 'runs_against': 0, 'balls_bowled': 0
+            }
+            for team in teams
+        }
+        self.order = sorted(self._sort_key(team) for team in self.rows)
+        self.results = 0
+        self.snapshot = []
+        self._rebuild_snapshot()
+    
+    def export_state(self):
+        return {'rows': self.rows, 'results': self.results}
+    
+    @classmethod
+    def from_state(cls, state):
+        table = cls(list(state['rows']))
+        table.rows = state['rows']
+        table.results = state['results']
+        table.order = sorted(table._sort_key(team) for team in table.rows)
+        table._rebuild_snapshot()
+        return table
+    
+    def record_result(self, result):
+        """Apply one completed match; winner=None means a tie or no result"""
+        team1, team2 = result['team1'], result['team2']
+        for team in (team1, team2):
+            if team not in self.rows:
+                raise ValueError(f"Unknown team: {team}")
+        if team1 == team2:
+            raise ValueError('A team cannot play itself')
+        
+        winner = result.get('winner')
+        if winner is not None and winner not in (team1, team2):
+            raise ValueError('winner must be one of the two teams')
+        no_result = bool(result.get('no_result', False))
+        
+        innings = {}
+        if not no_result:
+            for number, team in ((1, team1), (2, team2)):
+                runs = int(result[f'team{number}_runs'])
+                balls = int(result[f'team{number}_balls'])
+                wickets = int(result.get(f'team{number}_wickets', 0))
+                check_innings(team, runs, balls, wickets, chase_won=number == 2 and winner == team2)
+                # A side bowled out is charged its full quota of overs for NRR
+                innings[team] = (runs, BALLS_PER_INNINGS if wickets == 10 else balls)
+        
+        for team in (team1, team2):
+            self._remove(team)
+        
+        for team, opponent in ((team1, team2), (team2, team1)):
+            row = self.rows[team]
+            row['played'] += 1
+            if no_result or winner is None:
+                row['no_result'] += 1
+                row['points'] += POINTS_FOR_NO_RESULT
+            elif winner == team:
+                row['won'] += 1
+                row['points'] += POINTS_FOR_WIN
+            else:
+                row['lost'] += 1
+            
+            if innings:
+                row['runs_for'] += innings[team][0]
+                row['balls_faced'] += innings[team][1]
+                row['runs_against'] += innings[opponent][0]
+                row['balls_bowled'] += innings[opponent][1]
+            
+            insort(self.order, self._sort_key(team))
+        
+        self.results += 1
+        self._rebuild_snapshot()
+    
+    def net_run_rate(self, team):
+        row = self.rows[team]
+        if not row['balls_faced'] or not row['balls_bowled']:
+            return 0.0
+        return (row['runs_for'] * 6 / row['balls_faced']) - (row['runs_against'] * 6 / row['balls_bowled'])
+    
+    def _sort_key(self, team):
+        row = self.rows[team]
+        return (-row['points'], -self.net_run_rate(team), -row['won'], team)
+    
+    def _remove(self, team):
+        key = self._sort_key(team)
+        del self.order[bisect_left(self.order, key)]
+    
+    def _rebuild_snapshot(self):
+        snapshot = []
+        for position, key in enumerate(self.order, start=1):
+            team = key[-1]
+            row = self.rows[team]
+            snapshot.append({
+                "position": position,
+                "team": team,
+                "played": row['played'],
+                "won": row['won'],
+                "lost": row['lost'],
+                "no_result": row['no_result'],
+                "nrr": f"{self.net_run_rate(team):+.3f}",
+                "for": f"{row['runs_for']}/{format_overs(row['balls_faced'])}",
+                "against": f"{row['runs_against']}/{format_overs(row['balls_bowled'])}",
+                "points": row['points']
+            })
+        self.snapshot = snapshot
+
+HOME_GROUNDS = {
+    'CSK': 'MA Chidambaram Stadium, Chennai',
+    'MI': 'Wankhede Stadium, Mumbai',
+    'RCB': 'M Chinnaswamy Stadium, Bangalore',
+    'KKR': 'Eden Gardens, Kolkata',
+    'DC': 'Arun Jaitley Stadium, Delhi',
+    'SRH': 'Rajiv Gandhi International Stadium, Hyderabad',
+    'RR': 'Sawai Mansingh Stadium, Jaipur',
+    'PBKS': 'IS Bindra Stadium, Mohali',
+    'GT': 'Narendra Modi Stadium, Ahmedabad',
+    'LSG': 'BRSABV Ekana Stadium, Lucknow'
+}
+
+def generate_mock_results(teams, seed=2026, season=2026):
+    """Generate a deterministic 70-match league stage (14 games per team)"""
+    rng = random.Random(seed)
+    groups = (teams[:5], teams[5:])
+    
+    # Everyone once, one cross-group rival again, own group again
+    fixtures = [(a, b) for i, a in enumerate(teams) for b in teams[i + 1:]]
+    fixtures += list(zip(groups[0], groups[1]))
+    fixtures += [(a, b) for group in groups for i, a in enumerate(group) for b in group[i + 1:]]
+    
+    results = []
+    for team1, team2 in fixtures:
+        venue = HOME_GROUNDS.get(team1, 'Neutral Venue')
+        if rng.random() < 0.5:
+            team1, team2 = team2, team1
+        
+        runs1 = rng.randint(130, 230)
+        wickets1 = rng.randint(3, 10)
+        balls1 = rng.randint(100, 119) if wickets1 == 10 else 120
+        
+        if rng.random() < 0.5:
+            runs2 = runs1 + rng.randint(1, 6)
+            wickets2 = rng.randint(2, 8)
+            balls2 = rng.randint(90, 119)
+            winner = team2
+        else:
+            runs2 = runs1 - rng.randint(1, 50)
+            wickets2 = rng.randint(4, 10)
+            balls2 = rng.randint(95, 119) if wickets2 == 10 else 120
+            winner = team1
+        
+        results.append({
+            'team1': team1, 'team1_runs': runs1, 'team1_balls': balls1, 'team1_wickets': wickets1,
+            'team2': team2, 'team2_runs': runs2, 'team2_balls': balls2, 'team2_wickets': wickets2,
+            'winner': winner, 'venue': venue, 'season': season
+        })
+    return results
+
+# ==========================================
+# TOURNAMENT STATISTICS
+# ==========================================
+
+# Dismissals that are not credited to the bowler
+NON_BOWLER_DISMISSALS = ('run out', 'retired hurt', 'obstructing the field')
+
+class TournamentStats:
+    """Tournament records maintained as results and ball events arrive.
+    
+    Every update only compares against the current record holder, so both
+    ingestion and reading the summary are O(1).
+    """
+    
+    def __init__(self):
+        self.completed = 0
+        self.live = 0
+        self.highest = None   # (runs, wickets, team, opponent)
+        self.lowest = None
+        self.totals = {'sixes': 0, 'fours': 0, 'wickets': 0}
+        self.players = {'sixes': {}, 'fours': {}, 'wickets': {}}
+        self.leaders = {'sixes': None, 'fours': None, 'wickets': None}   # (count, player, team)
+    
+    def export_state(self):
+        return dict(vars(self))
+    
+    @classmethod
+    def from_state(cls, state):
+        stats = cls()
+        vars(stats).update(state)
+        # JSON turns the record tuples into lists
+        stats.highest = tuple(stats.highest) if stats.highest else None
+        stats.lowest = tuple(stats.lowest) if stats.lowest else None
+        stats.leaders = {record: tuple(leader) if leader else None for record, leader in stats.leaders.items()}
+        return stats
+    
+    def record_ball(self, ball, batting, bowling):
+        if ball['extra_type'] not in ('bye', 'legbye', 'wide'):
+            if ball['runs'] == 6:
+                self._credit('sixes', ball['batter'], batting)
+            elif ball['runs'] == 4:
+                self._credit('fours', ball['batter'], batting)
+        if ball['wicket']:
+            self.totals['wickets'] += 1
+            if (ball['dismissal'] or '').lower() not in NON_BOWLER_DISMISSALS:
+                self._credit('wickets', ball['bowler'], bowling, total=False)
+    
+    def record_result(self, result):
+        self.completed += 1
+        if result.get('no_result'):
+            return
+        
+        for number, opponent_number in ((1, 2), (2, 1)):
+            runs = int(result[f'team{number}_runs'])
+            wickets = int(result.get(f'team{number}_wickets', 0))
+            innings = (runs, wickets, result[f'team{number}'], result[f'team{opponent_number}'])
+            
+            if self.highest is None or (runs, -wickets) > (self.highest[0], -self.highest[1]):
+                self.highest = innings
+            # Only innings that ran their course count as low totals (not winning chases)
+            finished = wickets == 10 or int(result[f'team{number}_balls']) >= BALLS_PER_INNINGS
+            if finished and (self.lowest is None or (runs, -wickets) < (self.lowest[0], -self.lowest[1])):
+                self.lowest = innings
+    
+    def _credit(self, record, player, team, total=True):
+        if total:
+            self.totals[record] += 1
+        if not player:
+            return
+        counts = self.players[record]
+        counts[player] = counts.get(player, 0) + 1
+        leader = self.leaders[record]
+        if leader is None or counts[player] > leader[0]:
+            self.leaders[record] = (counts[player], player, team)
+    
+    def summary(self, total_teams, upcoming):
+        def total(record):
+            if record is None:
+                return None
+            runs, wickets, team, opponent = record
+            return {"team": team, "score": f"{runs}/{wickets}", "against": opponent}
+        
+        def leader(record):
+            if self.leaders[record] is None:
+                return None
+            count, player, team = self.leaders[record]
+            return {"player": player, "team": team, "count": count}
+        
+        return {
+            "total_matches": self.completed + self.live + upcoming,
+            "completed_matches": self.completed,
+            "live_matches": self.live,
+            "total_teams": total_teams,
+            "highest_score": total(self.highest)["score"] if self.highest else None,
+            "lowest_score": total(self.lowest)["score"] if self.lowest else None,
+            "records": {
+                "highest_total": total(self.highest),
+                "lowest_total": total(self.lowest),
+                "most_sixes": leader('sixes'),
+                "most_fours": leader('fours'),
+                "most_wickets": leader('wickets')
+            },
+            "totals": dict(self.totals)
+        }
+
+# ==========================================
+# HISTORICAL SCORECARD ARCHIVE
+# ==========================================
+
+ARCHIVE_COLUMNS = {
+    'team': np.int16,
+    'opponent': np.int16,
+    'venue': np.int16,
+    'season': np.int16,
+    'innings': np.int8,     # 1 = batting first, 2 = chasing
+    'runs': np.int16,
+    'wickets': np.int8,
+    'balls': np.int16,
+    'result': np.int8       # 1 = won, 0 = lost, -1 = tie / no result
+}
+ARCHIVE_METRICS = ('runs', 'wickets', 'balls', 'result')
+ARCHIVE_AGGREGATES = ('mean', 'sum', 'min', 'max', 'median', 'count')
+ARCHIVE_GROUPS = ('team', 'opponent', 'venue', 'season')
+RESULT_CODES = {'won': 1, 'lost': 0, 'tied': -1}
+
+class ScorecardArchive:
+    """Columnar archive of innings scorecards across seasons.
+    
+    Each field is a NumPy array (team, opponent and venue dictionary-encoded to
+    small ints), so a query is a handful of vectorized comparisons and a
+    reduction. Saved archives are one .npy file per column and are loaded with
+    mmap_mode='r'; the first append after loading copies them into memory.
+    """
+    
+    def __init__(self, capacity=1024):
+        self.names = {'team': [], 'venue': []}
+        self.codes = {'team': {}, 'venue': {}}
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in ARCHIVE_COLUMNS.items()}
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def append_result(self, result):
+        """Add both innings of a completed match"""
+        if result.get('no_result'):
+            return
+        season = result.get('season') or datetime.now().year
+        venue = self._code('venue', result.get('venue') or 'Unknown Venue')
+        winner = result.get('winner')
+        
+        for number, opponent_number in ((1, 2), (2, 1)):
+            team = result[f'team{number}']
+            outcome = RESULT_CODES['tied'] if winner is None else int(winner == team)
+            self._append(
+                team=self._code('team', team),
+                opponent=self._code('team', result[f'team{opponent_number}']),
+                venue=venue,
+                season=int(season),
+                innings=number,
+                runs=int(result[f'team{number}_runs']),
+                wickets=int(result.get(f'team{number}_wickets', 0)),
+                balls=int(result[f'team{number}_balls']),
+                result=outcome
+            )
+    
+    def query(self, team=None, opponent=None, venue=None, season_from=None, season_to=None,
+              innings=None, result=None, metric='runs', aggregate='mean', group_by=None):
+        """Aggregate one metric over the innings matching every filter"""
+        if metric not in ARCHIVE_METRICS:
+            raise ValueError(f"metric must be one of {', '.join(ARCHIVE_METRICS)}")
+        if aggregate not in ARCHIVE_AGGREGATES:
+            raise ValueError(f"agg must be one of {', '.join(ARCHIVE_AGGREGATES)}")
+        if group_by is not None and group_by not in ARCHIVE_GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(ARCHIVE_GROUPS)}")
+        
+        column = {name: values[:self.size] for name, values in self.columns.items()}
+        mask = np.ones(self.size, dtype=bool)
+        if team:
+            mask &= column['team'] == self.codes['team'].get(team.upper(), -1)
+        if opponent:
+            mask &= column['opponent'] == self.codes['team'].get(opponent.upper(), -1)
+        if venue:
+            # Venue matches by substring, e.g. 'Chinnaswamy'
+            needle = venue.lower()
+            venue_codes = [code for code, name in enumerate(self.names['venue']) if needle in name.lower()]
+            mask &= np.isin(column['venue'], venue_codes)
+        if season_from is not None:
+            mask &= column['season'] >= season_from
+        if season_to is not None:
+            mask &= column['season'] <= season_to
+        if innings is not None:
+            mask &= column['innings'] == innings
+        if result is not None:
+            mask &= column['result'] == RESULT_CODES[result]
+        
+        values = column[metric][mask].astype(np.float64)
+        summary = {'innings': int(mask.sum()), 'value': self._aggregate(values, aggregate)}
+        
+        if group_by is not None:
+            keys = column[group_by][mask]
+            summary['groups'] = self._group(keys, values, aggregate, group_by)
+        return summary
+    
+    def save(self, directory):
+        """Write one .npy per column (each replaced atomically) plus the dictionaries"""
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self.columns.items():
+            tmp_path = os.path.join(directory, f'{name}.tmp.npy')
+            np.save(tmp_path, values[:self.size])
+            os.replace(tmp_path, os.path.join(directory, f'{name}.npy'))
+        tmp_path = os.path.join(directory, 'dictionary.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.names, f)
+        os.replace(tmp_path, os.path.join(directory, 'dictionary.json'))
+    
+    @classmethod
+    def load(cls, directory):
+        archive = cls(capacity=0)
+        with open(os.path.join(directory, 'dictionary.json')) as f:
+            archive.names = json.load(f)
+        archive.codes = {kind: {name: code for code, name in enumerate(names)}
+                         for kind, names in archive.names.items()}
+        archive.columns = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                           for name in ARCHIVE_COLUMNS}
+        # Columns are saved one by one, so after a crash some may be longer
+        archive.size = min(len(values) for values in archive.columns.values())
+        return archive
+    
+    def truncate(self, size):
+        self.size = min(self.size, size)
+    
+    def _code(self, kind, name):
+        codes = self.codes[kind]
+        if name not in codes:
+            codes[name] = len(self.names[kind])
+            self.names[kind].append(name)
+        return codes[name]
+    
+    def _append(self, **row):
+        if self.size == len(self.columns['team']) or not self.columns['team'].flags.writeable:
+            capacity = max(1024, self.size * 2)
+            for name, values in self.columns.items():
+                grown = np.zeros(capacity, ARCHIVE_COLUMNS[name])
+                grown[:self.size] = values[:self.size]
+                self.columns[name] = grown
+        for name, value in row.items():
+            self.columns[name][self.size] = value
+        self.size += 1
+    
+    @staticmethod
+    def _aggregate(values, aggregate):
+        if aggregate == 'count':
+            return int(values.size)
+        if values.size == 0:
+            return None
+        return round(float(getattr(np, aggregate)(values)), 2)
+    
+    def _group(self, keys, values, aggregate, group_by):
+        if aggregate in ('mean', 'sum', 'count'):
+            minlength = int(keys.max()) + 1 if keys.size else 0
+            counts = np.bincount(keys, minlength=minlength)
+            sums = np.bincount(keys, weights=values, minlength=minlength)
+            present = np.nonzero(counts)[0]
+            if aggregate == 'mean':
+                results = sums[present] / counts[present]
+            elif aggregate == 'sum':
+                results = sums[present]
+            else:
+                results = counts[present]
+            pairs = zip(present.tolist(), results.tolist())
+        else:
+            pairs = ((key, self._aggregate(values[keys == key], aggregate)) for key in np.unique(keys).tolist())
+        
+        names = self.names['team'] if group_by in ('team', 'opponent') else self.names.get(group_by)
+        return [
+            {group_by: names[key] if names is not None else key, 'value': round(value, 2)}
+            for key, value in pairs
+        ]
+
+# ==========================================
+# FIXTURE INDEXES
+# ==========================================
+
+def time_sort_key(time_text):
+    """Turn '7:30 PM' into '19:30' so fixtures on one day sort by start time"""
+    for fmt in ("%I:%M %p", "%H:%M"):
+        try:
+            return datetime.strptime(time_text.strip(), fmt).strftime("%H:%M")
+        except (AttributeError, ValueError):
+            continue
+    return "99:99"
+
+class FixtureIndex:
+    """Hash index by match id plus date-sorted secondary indexes.
+    
+    Every secondary index is a sorted list of (date, time, id) keys, so a date
+    range is two bisects and a page is a slice: O(log n + k) per query. The
+    team+venue composite index keeps the combined filter on the same path.
+    """
+    
+    def __init__(self):
+        self.by_id = {}
+        self.by_date = []
+        self.by_team = {}
+        self.by_venue = {}
+        self.by_team_venue = {}
+        self.by_pairing = {}
+        self.max_id = 0
+    
+    def add(self, match):
+        if match['id'] in self.by_id:
+            self.remove(match['id'])
+        
+        self.by_id[match['id']] = match
+        self.by_pairing[self.pairing(match)] = match['id']
+        self.max_id = max(self.max_id, match['id'])
+        key = self._key(match)
+        for keys in self._indexes(match):
+            insort(keys, key)
+    
+    def remove(self, match_id):
+        match = self.by_id.pop(match_id)
+        self.by_pairing.pop(self.pairing(match), None)
+        key = self._key(match)
+        for keys in self._indexes(match):
+            del keys[bisect_left(keys, key)]
+    
+    def get(self, match_id):
+        return self.by_id.get(match_id)
+    
+    @staticmethod
+    def pairing(match):
+        """Identity of a fixture regardless of which side is listed first"""
+        return (match['date'], frozenset((match['team1'].upper(), match['team2'].upper())))
+    
+    def query(self, team=None, venue=None, date_from=None, date_to=None,
+              descending=False, offset=0, limit=20):
+        """Return (total, page) of fixtures matching every given filter"""
+        team = team.upper() if team else None
+        venue = venue.lower() if venue else None
+        if team and venue:
+            keys = self.by_team_venue.get((team, venue), [])
+        elif team:
+            keys = self.by_team.get(team, [])
+        elif venue:
+            keys = self.by_venue.get(venue, [])
+        else:
+            keys = self.by_date
+        
+        lo = bisect_left(keys, (date_from,)) if date_from else 0
+        hi = bisect_right(keys, (date_to, "\uffff")) if date_to else len(keys)
+        total = max(hi - lo, 0)
+        
+        if descending:
+            start, stop = max(hi - offset - limit, lo), hi - offset
+            page = keys[start:max(stop, start)][::-1]
+        else:
+            start = lo + offset
+            page = keys[start:min(start + limit, hi)]
+        
+        return total, [self.by_id[key[2]] for key in page]
+    
+    def _key(self, match):
+        return (match['date'], time_sort_key(match.get('time')), match['id'])
+    
+    def _indexes(self, match):
+        venue = match.get('venue', '').lower()
+        teams = {match['team1'].upper(), match['team2'].upper()}
+        yield self.by_date
+        yield self.by_venue.setdefault(venue, [])
+        for team in teams:
+            yield self.by_team.setdefault(team, [])
+            yield self.by_team_venue.setdefault((team, venue), [])
+
+# ==========================================
+# BULK FIXTURE IMPORT
+# ==========================================
+
+TEAM_ALIASES = {'PK': 'PBKS', 'KXIP': 'PBKS', 'DD': 'DC'}
+FIXTURE_STATUSES = ('upcoming', 'live', 'completed')
+MAX_REPORTED_ERRORS = 100
+
+def format_match_time(time_text):
+    """Accept '19:30' or '7:30 PM' and return the '7:30 PM' form used by the API"""
+    for fmt in ("%H:%M", "%I:%M %p"):
+        try:
+            parsed = datetime.strptime(time_text.strip(), fmt)
+            return parsed.strftime("%I:%M %p").lstrip("0")
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time: {time_text!r}")
+
+class FixtureImporter:
+    """Streams fixture rows from CSV or NDJSON into the data store.
+    
+    Rows are validated and indexed one at a time as they are read, so memory
+    stays flat however large the file is. Only the first MAX_REPORTED_ERRORS
+    row errors are kept in the report.
+    """
+    
+    # Header spellings (lowercased, spaces/underscores removed) -> field
+    COLUMNS = {'date': 'date', 'team1': 'team1', 'team2': 'team2', 'venue': 'venue',
+               'time': 'time', 'status': 'status'}
+    
+    def __init__(self, store):
+        self.store = store
+        self.known_teams = {team['short'] for team in store.teams}
+    
+    def load(self, lines, fmt='csv'):
+        """Import from an iterable of text lines and return a report"""
+        if fmt not in ('csv', 'ndjson'):
+            raise ValueError("format must be 'csv' or 'ndjson'")
+        
+        report = {'rows': 0, 'imported': 0, 'duplicates': 0, 'error_count': 0, 'errors': []}
+        started = time.perf_counter()
+        
+        rows = self._csv_rows(lines) if fmt == 'csv' else self._ndjson_rows(lines)
+        for line_number, row in rows:
+            report['rows'] += 1
+            try:
+                match = self._validate(row)
+                if self.store.add_fixture(match) is None:
+                    report['duplicates'] += 1
+                else:
+                    report['imported'] += 1
+            except (KeyError, TypeError, ValueError) as e:
+                report['error_count'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    message = f"Missing column: {e}" if isinstance(e, KeyError) else str(e)
+                    report['errors'].append({'line': line_number, 'error': message})
+        
+        elapsed = time.perf_counter() - started
+        report['seconds'] = round(elapsed, 4)
+        report['rows_per_sec'] = round(report['rows'] / elapsed) if elapsed > 0 else report['rows']
+        return report
+    
+    def _csv_rows(self, lines):
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        fields = [self.COLUMNS.get(name.strip().lower().replace(' ', '').replace('_', '')) for name in header]
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield reader.line_num, {field: value for field, value in zip(fields, row) if field}
+    
+    def _ndjson_rows(self, lines):
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+    
+    def _validate(self, row):
+        if not isinstance(row, dict):
+            raise ValueError('Row is not a JSON object')
+        
+        date = row['date'].strip()
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"Invalid date (expected YYYY-MM-DD): {date!r}")
+        
+        teams = []
+        for field in ('team1', 'team2'):
+            team = row[field].strip().upper()
+            team = TEAM_ALIASES.get(team, team)
+            if team not in self.known_teams:
+                raise ValueError(f"Unknown team: {row[field]!r}")
+            teams.append(team)
+        if teams[0] == teams[1]:
+            raise ValueError('A team cannot play itself')
+        
+        venue = (row.get('venue') or '').strip()
+        if not venue:
+            raise ValueError('Venue is required')
+        
+        status = (row.get('status') or 'upcoming').strip().lower()
+        if status not in FIXTURE_STATUSES:
+            raise ValueError(f"Invalid status: {status!r}")
+        
+        return {
+            "date": date,
+            "team1": teams[0],
+            "team2": teams[1],
+            "venue": venue,
+            "time": format_match_time(row.get('time') or '7:30 PM'),
+            "status": status
+        }
+
+# ==========================================
+# PERSISTENCE
+# ==========================================
+
+SNAPSHOT_MAGIC = b'IPLSNAP1'
+SNAPSHOT_EVERY = 10000   # journal records between compactions
+FOLLOW_INTERVAL = 1.0    # seconds between a read-only worker's journal checks
+
+class StoreJournal:
+    """Append-only operation log plus compact snapshots for IPLDataStore.
+    
+    Every successful mutation is appended to `journal.ndjson` with a sequence
+    number. Every SNAPSHOT_EVERY records the full state is written to
+    `snapshot.bin` (atomically, via rename) and the journal is started afresh.
+    On startup the snapshot is read and parsed, then journal records newer
+    than it are replayed; a torn final line from a crash is ignored. Each
+    process that restores gets its own copy of the state; workers only share
+    it when a `--preload` master restores before forking.
+    Writes are flushed to the OS per record, so they survive a process crash.
+    
+    Only the process holding an exclusive flock on `writer.lock` writes. It
+    is claimed after fork, so each worker competes with its own lock handle;
+    the other workers follow the journal read-only and retry the lock.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.log_path = os.path.join(directory, 'journal.ndjson')
+        self.snapshot_path = os.path.join(directory, 'snapshot.bin')
+        self.lock_path = os.path.join(directory, 'writer.lock')
+        self.seq = 0
+        self.since_snapshot = 0
+        self.offset = 0           # bytes of the journal already applied
+        self.snapshot_id = None   # (inode, mtime) of the snapshot last loaded
+        self.log = None
+        self.lock_file = None
+        self.pid = None           # process that claimed this journal
+        self.followed_at = 0.0
+        self.claim_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def writer(self):
+        return self.log is not None
+    
+    def restore(self, store):
+        """Load the snapshot and replay the journal into store; False if there was nothing"""
+        restored = False
+        
+        if os.path.exists(self.snapshot_path):
+            self.snapshot_id = self._snapshot_id()
+            state = self._read_snapshot()
+            store.restore_state(state['store'])
+            self.seq = state['seq']
+            self.offset = 0
+            self.since_snapshot = 0
+            restored = True
+        
+        return self._replay(store) or restored
+    
+    def _replay(self, store):
+        # Apply complete records after self.offset; a line without its '\n' is
+        # still being written (or was torn by a crash) and is left for later
+        if not os.path.exists(self.log_path):
+            return False
+        applied = False
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.offset += len(line)
+                if record['seq'] <= self.seq:
+                    continue
+                store.apply_op(record)
+                self.seq = record['seq']
+                self.since_snapshot += 1
+                applied = True
+        return applied
+    
+    def claim(self, store):
+        """Catch up with the journal and take the writer lock if it is free.
+        
+        Returns True when this process became the writer. Cheap to call on
+        every request: it only touches the disk once per FOLLOW_INTERVAL.
+        """
+        if self.writer and self.pid == os.getpid():
+            return False
+        if not self.claim_lock.acquire(blocking=False):
+            return False   # another thread is already catching up
+        try:
+            if self.pid != os.getpid():
+                # Forked: handles inherited from the parent are not ours to use
+                self.pid = os.getpid()
+                self.log = self.lock_file = None
+            elif time.monotonic() - self.followed_at < FOLLOW_INTERVAL:
+                return False
+            self.followed_at = time.monotonic()
+            
+            self.follow(store)
+            if not self._lock():
+                return False
+            self.follow(store)
+            # Drop a torn tail so new records aren't appended after garbage
+            if os.path.exists(self.log_path) and self.offset < os.path.getsize(self.log_path):
+                with open(self.log_path, 'r+b') as f:
+                    f.truncate(self.offset)
+            self.log = open(self.log_path, 'ab')
+            return True
+        finally:
+            self.claim_lock.release()
+    
+    def follow(self, store):
+        """Apply the writer's new records (reloading the snapshot after a compaction)"""
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if self._snapshot_id() != self.snapshot_id or size < self.offset:
+            self.offset = 0
+            return self.restore(store)
+        return self._replay(store)
+    
+    def _lock(self):
+        if fcntl is None:
+            return True   # no flock here: a single process is assumed
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self.lock_file = lock_file
+        return True
+    
+    def _snapshot_id(self):
+        try:
+            info = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return info.st_ino, info.st_mtime_ns
+    
+    def append(self, op):
+        """Write one record; returns True when it is time to compact"""
+        self.seq += 1
+        op['seq'] = self.seq
+        self.log.write(json.dumps(op, separators=(',', ':')).encode('utf-8') + b'\n')
+        self.log.flush()
+        self.since_snapshot += 1
+        return self.since_snapshot >= SNAPSHOT_EVERY
+    
+    def write_snapshot(self, state):
+        body = json.dumps({'seq': self.seq, 'store': state}, separators=(',', ':')).encode('utf-8')
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(len(body).to_bytes(8, 'little'))
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        
+        # Records up to self.seq are now in the snapshot; restart the journal
+        if self.log is not None:
+            self.log.close()
+        self.log = open(self.log_path, 'wb')
+        self.snapshot_id = self._snapshot_id()
+        self.offset = 0
+        self.since_snapshot = 0
+    
+    def _read_snapshot(self):
+        # Parsed into ordinary objects: sharing them between workers needs --preload
+        with open(self.snapshot_path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not an IPL store snapshot")
+            length = int.from_bytes(f.read(8), 'little')
+            return json.loads(f.read(length))
+
+# Read endpoints served from pre-serialized snapshots: resource -> store attribute
+SNAPSHOT_SOURCES = {
+    'live_scores': 'live_matches',
+    'points_table': 'points_table',
+    'upcoming_matches': 'upcoming_matches',
+    'teams': 'teams',
+    'stats': 'stats_summary'
+}
+
+# Match fields rewritten by ball events, diffed into the live-score change log
+LIVE_FIELDS = (
+    'team1_score', 'team2_score', 'overs1', 'overs2', 'status', 'live',
+    'run_rate', 'required_rate', 'last_ball'
+)
+CHANGE_LOG_SIZE = 1024
+
 # Mock data storage (replace with database in production)
 class IPLDataStore:
     def __init__(self):
@@ -29,89 +1312,760 @@ class IPLDataStore:
             {"id": "lsg", "name": "Lucknow Super Giants", "short": "LSG", "color": "#0093D2"}
         ]
         
+        self.teams_by_id = {team["id"]: team for team in self.teams}
+        
         self.live_matches = []
-        self.points_table = []
         self.upcoming_matches = []
+        self.fixtures = FixtureIndex()
+        self.standings = StandingsTable([team['short'] for team in self.teams])
+        self.stats = TournamentStats()
+        self.archive = ScorecardArchive()
+        self.scorers = {}
+        self.lock = threading.Lock()
+        
+        # Pre-serialized responses, rebuilt only when a resource's generation moves
+        self.generations = {resource: 0 for resource in SNAPSHOT_SOURCES}
+        self.updated_at = {resource: datetime.now().isoformat() for resource in SNAPSHOT_SOURCES}
+        self.snapshots = {}
+        
+        # (live_scores generation, match id, changed fields), one entry per generation
+        self.change_log = deque(maxlen=CHANGE_LOG_SIZE)
+        self.listeners = []
+        self.journal = None
+        self.journal_directory = None
+        
         self.generate_mock_data()
     
+    def touch(self, *resources):
+        """Record that resources changed, invalidating their cached responses"""
+        now = datetime.now().isoformat()
+        for resource in resources:
+            self.generations[resource] += 1
+            self.updated_at[resource] = now
+    
+    def snapshot(self, resource):
+        """Return (generation, JSON bytes) for a read endpoint's response"""
+        cached = self.snapshots.get(resource)
+        if cached is not None and cached[0] == self.generations[resource]:
+            return cached
+        
+        with self.lock:
+            generation = self.generations[resource]
+            body = json.dumps({
+                "success": True,
+                "data": getattr(self, SNAPSHOT_SOURCES[resource]),
+                "version": generation,
+                "timestamp": self.updated_at[resource]
+            }, separators=(',', ':')).encode('utf-8')
+            self.snapshots[resource] = (generation, body)
+        
+        return generation, body
+    
+    def add_live_match(self, match, innings=()):
+        """Register a match for ball-by-ball scoring, optionally replaying innings"""
+        with self.lock:
+            op = {'op': 'live_match', 'match': dict(match), 'innings': list(innings)}
+            scorer = MatchScorer(match)
+            for events in innings:
+                for event in events:
+                    self._count_ball(scorer, scorer.record_ball(event))
+            self._register_live_match(scorer)
+            self._journal(op)
+            return scorer
+    
+    def _register_live_match(self, scorer):
+        # Caller holds self.lock
+        match = scorer.match
+        if scorer.complete:
+            self._record_result(scorer.result())
+        elif match['live']:
+            self.stats.live += 1
+        
+        self.live_matches.append(match)
+        self.scorers[match['id']] = scorer
+        self.fixtures.add(match)
+        self._log_change(match['id'], dict(match))
+        self.touch('stats')
+    
+    def _start_match(self, fixture, match_id, innings=(), complete=False):
+        # Caller holds self.lock. Promotes the scheduled fixture (or creates one);
+        # the totals are checked before anything in the store changes.
+        scheduled = self.fixtures.get(match_id) if match_id is not None else None
+        if scheduled is not None:
+            # A scheduled fixture keeps its own details; the caller only says who bats first
+            names = {scheduled[side].upper(): scheduled[side] for side in ('team1', 'team2')}
+            fixture = dict(scheduled, team1=names[fixture['team1'].upper()], team2=names[fixture['team2'].upper()])
+        match = {
+            "id": match_id if match_id is not None else self.fixtures.max_id + 1,
+            "team1": fixture['team1'],
+            "team2": fixture['team2'],
+            "venue": fixture.get('venue') or 'Unknown Venue',
+            "date": fixture['date'],
+            "time": fixture.get('time') or '7:30 PM'
+        }
+        scorer = MatchScorer(match)
+        if innings:
+            scorer.sync(innings, complete)
+        self._register_live_match(scorer)
+        if match_id is not None:
+            self.upcoming_matches = [m for m in self.upcoming_matches if m['id'] != match_id]
+            self.touch('upcoming_matches')
+        return scorer
+    
+    def start_match(self, fixture):
+        """Open ball-by-ball scoring for a fixture (team1 bats first); returns the match"""
+        with self.lock:
+            known = {team['short'] for team in self.teams}
+            for field in ('team1', 'team2'):
+                if fixture.get(field) not in known:
+                    raise ValueError(f"Unknown team: {fixture.get(field)!r}")
+            if fixture['team1'] == fixture['team2']:
+                raise ValueError('A team cannot play itself')
+            datetime.strptime(fixture.get('date') or '', "%Y-%m-%d")
+            
+            match_id = self.fixtures.by_pairing.get(FixtureIndex.pairing(fixture))
+            if match_id in self.scorers:
+                raise ValueError(f"Match {match_id} is already being scored")
+            scorer = self._start_match(fixture, match_id)
+            self._journal({'op': 'start_match', 'fixture': fixture})
+            return scorer.match
+    
+    def sync_match(self, summary):
+        """Bring a match in line with upstream innings totals, creating it if needed"""
+        with self.lock:
+            pairing = FixtureIndex.pairing(summary)
+            match_id = self.fixtures.by_pairing.get(pairing)
+            scorer = self.scorers.get(match_id)
+            
+            if scorer is None:
+                scorer = self._start_match(summary, match_id, summary['innings'], summary.get('complete', False))
+            else:
+                was_live, was_complete = scorer.match['live'], scorer.complete
+                before = [scorer.match.get(field) for field in LIVE_FIELDS]
+                scorer.sync(summary['innings'], summary.get('complete', False))
+                changed = {
+                    field: scorer.match.get(field)
+                    for field, old in zip(LIVE_FIELDS, before)
+                    if scorer.match.get(field) != old
+                }
+                if not changed:
+                    return scorer.match
+                
+                self._log_change(scorer.match['id'], changed)
+                self.stats.live += scorer.match['live'] - was_live
+                if scorer.complete and not was_complete:
+                    self._record_result(scorer.result())
+                self.touch('stats')
+            
+            self._journal({'op': 'sync', 'summary': summary})
+            return scorer.match
+    
+    def _count_ball(self, scorer, ball):
+        batting = scorer.batting_order[ball['innings'] - 1]
+        bowling = scorer.batting_order[2 - ball['innings']]
+        self.stats.record_ball(ball, batting, bowling)
+    
+    def _record_result(self, result):
+        """Apply a result to the table, stats and archive; returns it normalized"""
+        result = normalize_result(result, self.standings.rows)
+        self.standings.record_result(result)
+        self.stats.record_result(result)
+        self.archive.append_result(result)
+        self.touch('points_table', 'stats')
+        return result
+    
+    def _log_change(self, match_id, fields):
+        """Bump the live-scores generation and remember what changed in it"""
+        self.touch('live_scores')
+        self.change_log.append((self.generations['live_scores'], match_id, fields))
+        for listener in self.listeners:
+            listener(match_id)
+    
+    def add_listener(self, listener):
+        """Call listener(match_id) whenever a live match changes"""
+        self.listeners.append(listener)
+    
+    def live_changes_since(self, since):
+        """Return (version, changes) since a client version; changes=None means resync"""
+        with self.lock:
+            version = self.generations['live_scores']
+            if since == version:
+                return version, []
+            if since > version or not self.change_log or since + 1 < self.change_log[0][0]:
+                return version, None
+            
+            merged = {}
+            skip = since + 1 - self.change_log[0][0]
+            for _, match_id, fields in islice(self.change_log, skip, None):
+                merged.setdefault(match_id, {}).update(fields)
+        
+        return version, [{**fields, 'id': match_id} for match_id, fields in merged.items()]
+    
+    def add_fixture(self, match):
+        """Register a fixture, assigning an id if needed; returns None for duplicates"""
+        with self.lock:
+            if FixtureIndex.pairing(match) in self.fixtures.by_pairing:
+                return None
+            if 'id' not in match:
+                match['id'] = self.fixtures.max_id + 1
+            self.fixtures.add(match)
+            if match.get('status', 'upcoming') == 'upcoming':
+                self.upcoming_matches.append(match)
+                self.touch('upcoming_matches', 'stats')
+            self._journal({'op': 'fixture', 'match': match})
+            return match
+    
+    def record_ball(self, match_id, event):
+        """Ingest one ball event; raises KeyError for unknown matches"""
+        with self.lock:
+            self._check_balls(match_id, [event])
+            return self._record_ball(match_id, event)
+    
+    def record_balls(self, match_id, events):
+        """Ingest a batch of ball events: if any is invalid, none is applied"""
+        with self.lock:
+            self._check_balls(match_id, events)
+            return [self._record_ball(match_id, event) for event in events]
+    
+    def _check_balls(self, match_id, events):
+        # Caller holds self.lock. The balls, and the result they would complete
+        # the match with, are checked before any of them is applied.
+        scorer = self.scorers[match_id]
+        final = scorer.check_events(events)
+        if final is not None:
+            normalize_result(scorer.result(final), self.standings.rows)
+    
+    def _record_ball(self, match_id, event):
+        # Caller holds self.lock
+        scorer = self.scorers[match_id]
+        was_live = scorer.match['live']
+        before = [scorer.match.get(field) for field in LIVE_FIELDS]
+        ball = scorer.record_ball(event)
+        self._log_change(match_id, {
+            field: scorer.match.get(field)
+            for field, old in zip(LIVE_FIELDS, before)
+            if scorer.match.get(field) != old
+        })
+        
+        self._count_ball(scorer, ball)
+        self.stats.live += scorer.match['live'] - was_live
+        if scorer.complete:
+            self._record_result(scorer.result())
+        self.touch('stats')
+        self._journal({'op': 'ball', 'match_id': match_id, 'event': event})
+        return ball
+    
+    def record_result(self, result):
+        """Ingest a completed match result into the points table"""
+        with self.lock:
+            result = self._record_result(result)
+            self._journal({'op': 'result', 'result': result})
+    
+    # ----- persistence -----
+    
+    def enable_persistence(self, directory):
+        """Restore from a journal + snapshot in directory.
+        
+        Nothing is opened for writing here, so a `--preload` master can call
+        it before forking; each worker then calls claim_journal().
+        """
+        journal = StoreJournal(directory)
+        self.journal_directory = directory
+        journal.restore(self)
+        self.journal = journal
+        return journal
+    
+    def claim_journal(self):
+        """Follow the journal, becoming its writer if no other process is.
+        
+        Returns True when this process just became the writer. Until then
+        the store is read-only: writes would not be journaled.
+        """
+        if self.journal is None or not self.journal.claim(self):
+            return False
+        if self.journal.snapshot_id is None:
+            self.compact()
+        return True
+    
+    @property
+    def read_only(self):
+        return self.journal is not None and not self.journal.writer
+    
+    def compact(self):
+        """Write a snapshot of the whole store and truncate the journal"""
+        with self.lock:
+            self._write_snapshot()
+    
+    def _journal(self, op):
+        # Caller holds self.lock. Read-only followers replaying ops skip this.
+        if self.journal is not None and self.journal.writer and self.journal.append(op):
+            self._write_snapshot()
+    
+    def _write_snapshot(self):
+        # The archive goes first: the snapshot records how many rows it covers,
+        # so a crash in between only leaves extra rows that restore trims off
+        self.archive.save(os.path.join(self.journal.directory, 'archive'))
+        self.journal.write_snapshot(self.export_state())
+    
+    def apply_op(self, record):
+        """Re-apply one journal record (used during restore)"""
+        op = record['op']
+        if op == 'ball':
+            self.record_ball(record['match_id'], record['event'])
+        elif op == 'result':
+            self.record_result(record['result'])
+        elif op == 'fixture':
+            self.add_fixture(record['match'])
+        elif op == 'live_match':
+            self.add_live_match(record['match'], record.get('innings', ()))
+        elif op == 'start_match':
+            self.start_match(record['fixture'])
+        elif op == 'sync':
+            self.sync_match(record['summary'])
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+    
+    def export_state(self):
+        return {
+            'live_matches': [self.scorers[match['id']].export_state() for match in self.live_matches],
+            'fixtures': [match for match in self.fixtures.by_id.values() if match['id'] not in self.scorers],
+            'upcoming_ids': [match['id'] for match in self.upcoming_matches],
+            'standings': self.standings.export_state(),
+            'stats': self.stats.export_state(),
+            'archive_rows': len(self.archive),
+            'generations': self.generations,
+            'updated_at': self.updated_at
+        }
+    
+    def restore_state(self, state):
+        with self.lock:
+            self.live_matches = []
+            self.scorers = {}
+            self.fixtures = FixtureIndex()
+            self.change_log.clear()
+            self.snapshots = {}
+            
+            for scorer_state in state['live_matches']:
+                scorer = MatchScorer.from_state(scorer_state)
+                self.live_matches.append(scorer.match)
+                self.scorers[scorer.match['id']] = scorer
+                self.fixtures.add(scorer.match)
+            for match in state['fixtures']:
+                self.fixtures.add(match)
+            self.upcoming_matches = [self.fixtures.get(match_id) for match_id in state['upcoming_ids']]
+            
+            self.standings = StandingsTable.from_state(state['standings'])
+            self.stats = TournamentStats.from_state(state['stats'])
+            archive_directory = os.path.join(self.journal_directory, 'archive')
+            if os.path.exists(archive_directory):
+                self.archive = ScorecardArchive.load(archive_directory)
+                self.archive.truncate(state.get('archive_rows', len(self.archive)))
+            self.generations.update(state['generations'])
+            self.updated_at.update(state['updated_at'])
+    
+    @property
+    def points_table(self):
+        return self.standings.snapshot
+    
+    @property
+    def stats_summary(self):
+        return self.stats.summary(len(self.teams), len(self.upcoming_matches))
+    
+    def get_ball_events(self, match_id, since=0):
+        """Return the ball log for a match after sequence number `since`"""
+        return self.scorers[match_id].events[since:]
+    
+    def match_series(self, match_id):
+        """Return (balls recorded, per-innings chart series) for a match"""
+        with self.lock:
+            scorer = self.scorers[match_id]
+            return len(scorer.events), scorer.series_data()
+    
     def generate_mock_data(self):
-        # Generate mock live matches
-        self.live_matches = [
+        # Generate mock history for past seasons (archive only)
+        self.archive = ScorecardArchive()
+        team_codes = [team['short'] for team in self.teams]
+        for season in range(2008, 2026):
+            for result in generate_mock_results(team_codes, seed=season, season=season):
+                self.archive.append_result(result)
+        
+        # Generate mock points table from a simulated league stage
+        self.standings = StandingsTable(team_codes)
+        self.stats = TournamentStats()
+        for result in generate_mock_results(team_codes):
+            self._record_result(result)
+        
+        # Generate mock live matches from scripted ball-by-ball innings
+        # (completed ones count towards the table like any other result)
+        self.change_log.clear()
+        self.live_matches = []
+        self.upcoming_matches = []
+        self.fixtures = FixtureIndex()
+        self.scorers = {}
+        self.add_live_match(
             {
                 "id": 1,
                 "team1": "CSK",
                 "team2": "MI",
-                "team1_score": "195/6",
-                "team2_score": "188/8",
-                "overs1": "20.0",
-                "overs2": "20.0",
-                "status": "CSK won by 7 runs",
                 "venue": "MA Chidambaram Stadium, Chennai",
-                "live": False,
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "time": "7:30 PM"
             },
+            innings=[scripted_innings(195, 6, 120), scripted_innings(188, 8, 120)]
+        )
+        self.add_live_match(
             {
                 "id": 2,
                 "team1": "RCB",
                 "team2": "KKR",
-                "team1_score": "165/8",
-                "team2_score": "142/5",
-                "overs1": "20.0",
-                "overs2": "17.3",
-                "status": "Live - KKR need 24 runs from 15 balls",
                 "venue": "M Chinnaswamy Stadium, Bangalore",
-                "live": True,
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "time": "3:30 PM"
-            }
-        ]
-        
-        # Generate mock points table
-        self.points_table = [
-            {"position": 1, "team": "GT", "played": 14, "won": 10, "lost": 4, "nrr": "+0.809", "points": 20},
-            {"position": 2, "team": "RR", "played": 14, "won": 9, "lost": 5, "nrr": "+0.298", "points": 18},
-            {"position": 3, "team": "LSG", "played": 14, "won": 9, "lost": 5, "nrr": "+0.251", "points": 18},
-            {"position": 4, "team": "RCB", "played": 14, "won": 8, "lost": 6, "nrr": "-0.253", "points": 16},
-            {"position": 5, "team": "DC", "played": 14, "won": 7, "lost": 7, "nrr": "+0.204", "points": 14},
-            {"position": 6, "team": "PBKS", "played": 14, "won": 7, "lost": 7, "nrr": "+0.126", "points": 14},
-            {"position": 7, "team": "KKR", "played": 14, "won": 6, "lost": 8, "nrr": "+0.146", "points": 12},
-            {"position": 8, "team": "SRH", "played": 14, "won": 6, "lost": 8, "nrr": "-0.379", "points": 12},
-            {"position": 9, "team": "CSK", "played": 14, "won": 4, "lost": 10, "nrr": "-0.203", "points": 8},
-            {"position": 10, "team": "MI", "played": 14, "won": 4, "lost": 10, "nrr": "-0.506", "points": 8}
-        ]
+            },
+            innings=[scripted_innings(165, 8, 120), scripted_innings(142, 5, 105)]
+        )
         
         # Generate mock upcoming matches
         base_date = datetime.now()
-        self.upcoming_matches = [
-            {
-                "id": 3,
-                "date": (base_date + timedelta(days=1)).strftime("%Y-%m-%d"),
-                "team1": "CSK",
-                "team2": "MI",
-                "venue": "Wankhede Stadium, Mumbai",
-                "time": "7:30 PM"
-            },
-            {
-                "id": 4,
-                "date": (base_date + timedelta(days=2)).strftime("%Y-%m-%d"),
-                "team1": "RCB",
-                "team2": "KKR",
-                "venue": "M Chinnaswamy Stadium, Bangalore",
-                "time": "3:30 PM"
-            },
-            {
-                "id": 5,
-                "date": (base_date + timedelta(days=2)).strftime("%Y-%m-%d"),
-                "team1": "GT",
-                "team2": "LSG",
-                "venue": "Narendra Modi Stadium, Ahmedabad",
-                "time": "7:30 PM"
-            }
-        ]
+        self.add_fixture({
+            "id": 3,
+            "date": (base_date + timedelta(days=1)).strftime("%Y-%m-%d"),
+            "team1": "CSK",
+            "team2": "MI",
+            "venue": "Wankhede Stadium, Mumbai",
+            "time": "7:30 PM"
+        })
+        self.add_fixture({
+            "id": 4,
+            "date": (base_date + timedelta(days=2)).strftime("%Y-%m-%d"),
+            "team1": "RCB",
+            "team2": "KKR",
+            "venue": "M Chinnaswamy Stadium, Bangalore",
+            "time": "3:30 PM"
+        })
+        self.add_fixture({
+            "id": 5,
+            "date": (base_date + timedelta(days=2)).strftime("%Y-%m-%d"),
+            "team1": "GT",
+            "team2": "LSG",
+            "venue": "Narendra Modi Stadium, Ahmedabad",
+            "time": "7:30 PM"
+        })
+
+# ==========================================
+# LIVE UPDATE PUSH HUB
+# ==========================================
+
+PUSH_COALESCE_WINDOW = 0.25   # seconds; bursts inside a window send one update
+PUSH_QUEUE_SIZE = 32          # per-client backlog before it is told to resync
+PUSH_HEARTBEAT = 15           # seconds between keep-alive comments
+ALL_MATCHES = '*'
+
+def sse_message(event, data, event_id=None):
+    """Encode one server-sent event"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+class PushSubscriber:
+    """One connected client: a bounded queue of encoded events"""
+    
+    def __init__(self, topic):
+        self.topic = topic
+        self.queue = deque()
+        self.resync = False
+        self.ready = threading.Event()
+    
+    def offer(self, message):
+        # A client that can't keep up loses its backlog and gets a fresh snapshot
+        if len(self.queue) >= PUSH_QUEUE_SIZE:
+            self.queue.clear()
+            self.resync = True
+        else:
+            self.queue.append(message)
+        self.ready.set()
+    
+    def drain(self, timeout):
+        """Wait for events; return (needs_resync, [encoded events])"""
+        self.ready.wait(timeout)
+        self.ready.clear()
+        resync, self.resync = self.resync, False
+        messages = []
+        while self.queue:
+            messages.append(self.queue.popleft())
+        return resync, messages
+
+class PushHub:
+    """Fans live score updates out to subscribers, one topic per match.
+    
+    Publishing only marks a match dirty. A flusher thread wakes once per
+    coalescing window, serializes the latest state of each dirty match once and
+    hands the same bytes to every subscriber of that match and of ALL_MATCHES,
+    so a burst of balls costs one message per client. Each connection needs its
+    own green thread at scale: run under gunicorn with `-k gevent` for 10k clients.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self.topics = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.flusher = None
+        store.add_listener(self.publish)
+    
+    def subscribe(self, topic=ALL_MATCHES):
+        subscriber = PushSubscriber(topic)
+        with self.lock:
+            self.topics.setdefault(topic, set()).add(subscriber)
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._run, name='push-hub', daemon=True)
+                self.flusher.start()
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            subscribers = self.topics.get(subscriber.topic)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.topics[subscriber.topic]
+    
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscribers) for subscribers in self.topics.values())
+    
+    def publish(self, match_id):
+        with self.lock:
+            self.dirty.add(match_id)
+        self.wakeup.set()
+    
+    def snapshot(self, topic):
+        """Encode the current state of everything a topic covers"""
+        with self.store.lock:
+            if topic == ALL_MATCHES:
+                matches = list(self.store.live_matches)
+            else:
+                matches = [self.store.scorers[topic].match]
+            version = self.store.generations['live_scores']
+            return sse_message('snapshot', {"version": version, "data": matches}, version)
+    
+    def flush(self):
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        
+        for match_id in dirty:
+            with self.store.lock:
+                version = self.store.generations['live_scores']
+                message = sse_message('score', self.store.scorers[match_id].match, version)
+            with self.lock:
+                subscribers = list(self.topics.get(match_id, ())) + list(self.topics.get(ALL_MATCHES, ()))
+            for subscriber in subscribers:
+                subscriber.offer(message)
+    
+    def _run(self):
+        while True:
+            self.wakeup.wait()
+            time.sleep(PUSH_COALESCE_WINDOW)
+            self.wakeup.clear()
+            self.flush()
+
+# ==========================================
+# UPSTREAM SCORE FEED
+# ==========================================
+
+FEED_LIVE_INTERVAL = 5       # seconds between polls while a match is live
+FEED_IDLE_INTERVAL = 60      # seconds between polls otherwise
+FEED_MAX_BACKOFF = 300       # ceiling for retry delays after failures
+FEED_TIMEOUT = 10
+
+def parse_overs(overs):
+    """Turn overs such as 17.3 or '17.3' into legal balls (105)"""
+    whole, _, part = str(overs).partition('.')
+    return int(whole or 0) * 6 + int(part or 0)
+
+def normalize_cricapi_matches(payload, teams):
+    """Convert a CricAPI-style currentMatches payload into sync_match summaries"""
+    by_name = {}
+    for team in teams:
+        by_name[team['short'].upper()] = team['short']
+        by_name[team['name'].upper()] = team['short']
+    for alias, short in TEAM_ALIASES.items():
+        by_name[alias] = short
+    
+    def short_name(name):
+        return by_name.get((name or '').strip().upper())
+    
+    summaries = []
+    for item in payload.get('data') or []:
+        names = {}
+        for info in item.get('teamInfo') or []:
+            names[(info.get('name') or '').upper()] = short_name(info.get('shortname')) or short_name(info.get('name'))
+        teams_in_match = [names.get(name.upper()) or short_name(name) for name in item.get('teams') or []]
+        if len(teams_in_match) != 2 or None in teams_in_match or not item.get('date'):
+            continue
+        
+        innings = []
+        batting_order = []
+        for score in item.get('score') or []:
+            # 'inning' looks like "Royal Challengers Bangalore Inning 1"
+            batting_name = (score.get('inning') or '').rsplit(' Inning', 1)[0]
+            batting = names.get(batting_name.upper()) or short_name(batting_name)
+            if batting not in teams_in_match or batting in batting_order:
+                continue
+            batting_order.append(batting)
+            innings.append({'runs': score.get('r', 0), 'wickets': score.get('w', 0), 'balls': parse_overs(score.get('o', 0))})
+        
+        ended = bool(item.get('matchEnded'))
+        if not innings or (ended and len(innings) < 2):
+            continue   # not started, or abandoned
+        
+        first = batting_order[0]
+        second = teams_in_match[1] if teams_in_match[0] == first else teams_in_match[0]
+        summaries.append({
+            'team1': first,
+            'team2': second,
+            'venue': item.get('venue'),
+            'date': item['date'][:10],
+            'innings': innings,
+            'complete': ended
+        })
+    return summaries
+
+class ScoreFeedPoller:
+    """Background worker that mirrors an upstream score feed into the data store.
+    
+    Uses one pooled keep-alive session and conditional requests (ETag /
+    Last-Modified), polls fast while a match is live and slowly otherwise, and
+    backs off exponentially with jitter when the upstream fails.
+    """
+    
+    def __init__(self, store, url, api_key=None, normalize=normalize_cricapi_matches):
+        self.store = store
+        self.url = url
+        self.api_key = api_key
+        self.normalize = normalize
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.etag = None
+        self.last_modified = None
+        self.live = False
+        self.failures = 0
+        self.stats = {'polls': 0, 'not_modified': 0, 'errors': 0, 'matches_synced': 0, 'last_error': None}
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.start_lock = threading.Lock()
+    
+    def poll_once(self):
+        """Fetch the feed once and sync it; returns False if nothing changed"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        params = {'apikey': self.api_key} if self.api_key else None
+        
+        self.stats['polls'] += 1
+        response = self.session.get(self.url, params=params, headers=headers, timeout=FEED_TIMEOUT)
+        if response.status_code == 304:
+            self.stats['not_modified'] += 1
+            return False
+        response.raise_for_status()
+        
+        summaries = self.normalize(response.json(), self.store.teams)
+        for summary in summaries:
+            self.store.sync_match(summary)
+        
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.live = any(not summary['complete'] for summary in summaries)
+        self.stats['matches_synced'] += len(summaries)
+        return True
+    
+    def next_interval(self):
+        if self.failures:
+            backoff = min(FEED_MAX_BACKOFF, FEED_LIVE_INTERVAL * 2 ** self.failures)
+            return backoff / 2 + random.uniform(0, backoff / 2)
+        base = FEED_LIVE_INTERVAL if self.live else FEED_IDLE_INTERVAL
+        return base * random.uniform(0.9, 1.1)
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+                self.failures = 0
+            except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+                self.failures += 1
+                self.stats['errors'] += 1
+                self.stats['last_error'] = str(e)
+            self.stop_event.wait(self.next_interval())
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='score-feed', daemon=True)
+        self.thread.start()
+    
+    @property
+    def running(self):
+        # A thread started before a fork is not alive in the child
+        return self.thread is not None and self.thread.is_alive()
+    
+    def ensure_started(self):
+        """Start polling in this process unless it already is (called per request)"""
+        if self.running or self.stop_event.is_set():
+            return
+        with self.start_lock:
+            if not self.running:
+                self.start()
+    
+    def stop(self):
+        self.stop_event.set()
+        self.session.close()
+    
+    def status(self):
+        return dict(self.stats, url=self.url, live=self.live, failures=self.failures, running=self.running)
 
 # Initialize data store
 data_store = IPLDataStore()
+if os.environ.get('IPL_DATA_DIR'):
+    data_store.enable_persistence(os.environ['IPL_DATA_DIR'])
+    # Keep the restored objects out of GC passes so workers forked from a
+    # `gunicorn --preload` master keep sharing their pages copy-on-write
+    gc.freeze()
+push_hub = PushHub(data_store)
+
+# The poller is started lazily by the first request a process serves, i.e.
+# after any fork, and only in the process that writes the journal
+score_feed = None
+if os.environ.get('SCORE_FEED_URL') and os.environ.get('SCORE_FEED_DISABLE') != '1':
+    score_feed = ScoreFeedPoller(data_store, os.environ['SCORE_FEED_URL'], os.environ.get('SCORE_FEED_API_KEY'))
+
+@app.before_request
+def claim_worker_roles():
+    """Claim or follow the persisted journal; only its writer accepts writes and polls the feed"""
+    if data_store.journal is not None:
+        data_store.claim_journal()
+    if data_store.read_only:
+        if request.method == 'POST':
+            return jsonify({
+                "success": False,
+                "error": "This worker is read-only; another process owns the data directory"
+            }), 503
+    elif score_feed is not None:
+        score_feed.ensure_started()
+    return None
+
+def snapshot_response(resource):
+    """Serve a cached JSON snapshot, answering 304 when the client's ETag is current"""
+    generation, body = data_store.snapshot(resource)
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(f"{resource}-{generation}")
+    return response.make_conditional(request)
 
 # API Routes
 @app.route('/')
@@ -122,11 +2076,20 @@ def index():
         "version": "1.0.0",
         "endpoints": {
             "live_scores": "/api/live-scores",
+            "live_score_changes": "/api/live-scores/changes?since=<version>",
+            "live_score_stream": "/api/live-scores/stream?match=<match_id>",
             "points_table": "/api/points-table",
             "upcoming_matches": "/api/upcoming-matches",
+            "fixtures": "/api/fixtures?team=&venue=&from=&to=&order=asc&limit=20&offset=0",
+            "fixture_import": "/api/fixtures/import",
             "teams": "/api/teams",
             "team_details": "/api/teams/<team_id>",
-            "match_details": "/api/matches/<match_id>"
+            "match_details": "/api/matches/<match_id>",
+            "start_match": "/api/matches",
+            "ball_events": "/api/matches/<match_id>/balls",
+            "match_series": "/api/matches/<match_id>/series",
+            "results": "/api/results",
+            "archive_query": "/api/archive/query?team=&opponent=&venue=&since=&until=&innings=&result=&metric=runs&agg=mean&group_by="
         }
     })
 
@@ -134,10 +2097,34 @@ def index():
 def get_live_scores():
     """Get current live scores"""
     try:
+        return snapshot_response('live_scores')
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/live-scores/changes', methods=['GET'])
+def get_live_score_changes():
+    """Get only the live-score fields that changed since a client's version"""
+    try:
+        since = request.args.get('since', -1, type=int)
+        version, changes = data_store.live_changes_since(since)
+        if changes is None:
+            # Client is too far behind (or new): send everything
+            return jsonify({
+                "success": True,
+                "full": True,
+                "data": data_store.live_matches,
+                "version": version,
+                "timestamp": data_store.updated_at['live_scores']
+            })
         return jsonify({
             "success": True,
-            "data": data_store.live_matches,
-            "timestamp": datetime.now().isoformat()
+            "full": False,
+            "data": changes,
+            "version": version,
+            "timestamp": data_store.updated_at['live_scores']
         })
     except Exception as e:
         return jsonify({
@@ -145,15 +2132,44 @@ def get_live_scores():
             "error": str(e)
         }), 500
 
+@app.route('/api/live-scores/stream', methods=['GET'])
+def stream_live_scores():
+    """Push live score updates as server-sent events (all matches or ?match=<id>)"""
+    topic = request.args.get('match', type=int)
+    if topic is None:
+        topic = ALL_MATCHES
+    elif topic not in data_store.scorers:
+        return jsonify({
+            "success": False,
+            "error": "Match not found"
+        }), 404
+    
+    subscriber = push_hub.subscribe(topic)
+    
+    def events():
+        try:
+            yield push_hub.snapshot(topic)
+            while True:
+                resync, messages = subscriber.drain(PUSH_HEARTBEAT)
+                if resync:
+                    yield push_hub.snapshot(topic)
+                elif messages:
+                    yield b"".join(messages)
+                else:
+                    yield b": keep-alive\n\n"
+        finally:
+            push_hub.unsubscribe(subscriber)
+    
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/points-table', methods=['GET'])
 def get_points_table():
     """Get current IPL points table"""
     try:
-        return jsonify({
-            "success": True,
-            "data": data_store.points_table,
-            "timestamp": datetime.now().isoformat()
-        })
+        return snapshot_response('points_table')
     except Exception as e:
         return jsonify({
             "success": False,
@@ -164,26 +2180,88 @@ def get_points_table():
 def get_upcoming_matches():
     """Get upcoming IPL matches"""
     try:
+        return snapshot_response('upcoming_matches')
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/fixtures', methods=['GET'])
+def get_fixtures():
+    """Query fixtures by team, venue and date range with paging"""
+    try:
+        order = request.args.get('order', 'asc')
+        limit = request.args.get('limit', 20, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        if not 1 <= limit <= 100 or offset < 0:
+            raise ValueError('limit must be 1-100 and offset must not be negative')
+        
+        total, fixtures = data_store.fixtures.query(
+            team=request.args.get('team'),
+            venue=request.args.get('venue'),
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            descending=order == 'desc',
+            offset=offset,
+            limit=limit
+        )
         return jsonify({
             "success": True,
-            "data": data_store.upcoming_matches,
+            "data": fixtures,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
             "timestamp": datetime.now().isoformat()
         })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
-@app.route('/api/teams', methods=['GET'])
-def get_teams():
-    """Get all IPL teams"""
+@app.route('/api/fixtures/import', methods=['POST'])
+def import_fixtures():
+    """Stream a CSV or NDJSON fixture file (raw body or 'file' upload) into the store"""
     try:
+        upload = request.files.get('file')
+        name = upload.filename if upload else ''
+        fmt = request.args.get('format')
+        if fmt is None:
+            is_ndjson = name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (request.mimetype or '')
+            fmt = 'ndjson' if is_ndjson else 'csv'
+        
+        stream = upload.stream if upload else request.stream
+        lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        report = FixtureImporter(data_store).load(lines, fmt)
         return jsonify({
             "success": True,
-            "data": data_store.teams,
+            "data": report,
             "timestamp": datetime.now().isoformat()
         })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/teams', methods=['GET'])
+def get_teams():
+    """Get all IPL teams"""
+    try:
+        return snapshot_response('teams')
     except Exception as e:
         return jsonify({
             "success": False,
@@ -194,7 +2272,7 @@ def get_teams():
 def get_team_details(team_id):
     """Get details for a specific team"""
     try:
-        team = next((t for t in data_store.teams if t["id"] == team_id), None)
+        team = data_store.teams_by_id.get(team_id)
         if team:
             return jsonify({
                 "success": True,
@@ -216,7 +2294,7 @@ def get_team_details(team_id):
 def get_match_details(match_id):
     """Get details for a specific match"""
     try:
-        match = next((m for m in data_store.live_matches if m["id"] == match_id), None)
+        match = data_store.fixtures.get(match_id)
         if match:
             return jsonify({
                 "success": True,
@@ -234,22 +2312,174 @@ def get_match_details(match_id):
             "error": str(e)
         }), 500
 
-@app.route('/api/stats', methods=['GET'])
-def get_stats():
-    """Get IPL statistics"""
+@app.route('/api/matches', methods=['POST'])
+def start_match():
+    """Start ball-by-ball scoring for a fixture ({team1, team2, date, venue, time})"""
     try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise ValueError('Fixture must be an object')
         return jsonify({
             "success": True,
-            "data": {
-                "total_matches": 74,
-                "completed_matches": len([m for m in data_store.live_matches if not m["live"]]),
-                "live_matches": len([m for m in data_store.live_matches if m["live"]]),
-                "total_teams": len(data_store.teams),
-                "highest_score": "263/5",
-                "lowest_score": "49/10"
-            },
+            "data": data_store.start_match(data),
+            "timestamp": datetime.now().isoformat()
+        }), 201
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "error": f"Invalid fixture: {e}"
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/matches/<int:match_id>/balls', methods=['POST'])
+def post_ball_events(match_id):
+    """Append one ball event (or {"events": [...]}) to a match"""
+    try:
+        data = request.get_json(silent=True)
+        events = data.get('events') if isinstance(data, dict) and 'events' in data else [data]
+        if not isinstance(events, list):
+            raise ValueError('events must be a list')
+        
+        recorded = data_store.record_balls(match_id, events)
+        return jsonify({
+            "success": True,
+            "data": data_store.scorers[match_id].match,
+            "recorded": len(recorded),
+            "timestamp": datetime.now().isoformat()
+        }), 201
+    except KeyError:
+        return jsonify({
+            "success": False,
+            "error": "Match not found"
+        }), 404
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/matches/<int:match_id>/balls', methods=['GET'])
+def get_ball_events(match_id):
+    """Get the ball-by-ball log for a match"""
+    try:
+        since = request.args.get('since', 0, type=int)
+        return jsonify({
+            "success": True,
+            "data": data_store.get_ball_events(match_id, since),
             "timestamp": datetime.now().isoformat()
         })
+    except KeyError:
+        return jsonify({
+            "success": False,
+            "error": "Match not found"
+        }), 404
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/matches/<int:match_id>/series', methods=['GET'])
+def get_match_series(match_id):
+    """Get per-over worm and Manhattan series for a match"""
+    try:
+        balls, series = data_store.match_series(match_id)
+        response = jsonify({
+            "success": True,
+            "data": {"match_id": match_id, "innings": series},
+            "version": balls,
+            "timestamp": datetime.now().isoformat()
+        })
+        response.set_etag(f"series-{match_id}-{balls}")
+        return response.make_conditional(request)
+    except KeyError:
+        return jsonify({
+            "success": False,
+            "error": "Match not found"
+        }), 404
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/results', methods=['POST'])
+def post_match_result():
+    """Record a completed match result in the points table"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise ValueError('Result must be an object')
+        data_store.record_result(data)
+        return jsonify({
+            "success": True,
+            "data": data_store.points_table,
+            "timestamp": datetime.now().isoformat()
+        }), 201
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "error": f"Invalid result: {e}"
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/archive/query', methods=['GET'])
+def query_archive():
+    """Aggregate historical innings, e.g. RCB first-innings average at Chinnaswamy since 2018"""
+    try:
+        result = request.args.get('result')
+        if result is not None and result not in RESULT_CODES:
+            raise ValueError(f"result must be one of {', '.join(RESULT_CODES)}")
+        
+        started = time.perf_counter()
+        with data_store.lock:
+            summary = data_store.archive.query(
+                team=request.args.get('team'),
+                opponent=request.args.get('opponent'),
+                venue=request.args.get('venue'),
+                season_from=request.args.get('since', type=int),
+                season_to=request.args.get('until', type=int),
+                innings=request.args.get('innings', type=int),
+                result=result,
+                metric=request.args.get('metric', 'runs'),
+                aggregate=request.args.get('agg', 'mean'),
+                group_by=request.args.get('group_by')
+            )
+        summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return jsonify({
+            "success": True,
+            "data": summary,
+            "timestamp": datetime.now().isoformat()
+        })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get IPL statistics"""
+    try:
+        return snapshot_response('stats')
     except Exception as e:
         return jsonify({
             "success": False,
@@ -260,10 +2490,25 @@ def get_stats():
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    health = {
         "status": "healthy",
         "timestamp": datetime.now().isoformat()
-    })
+    }
+    if data_store.journal is not None:
+        health["journal"] = {"writer": data_store.journal.writer, "seq": data_store.journal.seq}
+    if score_feed is not None:
+        health["score_feed"] = score_feed.status()
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        health["process"] = {
+            "pid": os.getpid(),
+            "cpu_user": usage.ru_utime,
+            "cpu_system": usage.ru_stime,
+            "max_rss_kb": usage.ru_maxrss,
+            "threads": threading.active_count(),
+            "stream_subscribers": push_hub.subscriber_count()
+        }
+    return jsonify(health)
 
 # Error handlers
 @app.errorhandler(404)
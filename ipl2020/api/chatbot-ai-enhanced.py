@@ -7,222 +7,1396 @@ Trains on historical data provided by admin
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import numpy as np
+import requests
+import heapq
 import json
-import pickle
+import mmap
 import os
+import struct
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from collections import defaultdict
+from collections import OrderedDict, deque
+from itertools import chain
+from operator import itemgetter
+try:
+    import fcntl
+except ImportError:   # not available on Windows
+    fcntl = None
 
 app = Flask(__name__)
 CORS(app)
 
 # Data storage paths
-DATA_FILE = 'ml_training_data.json'
-MODEL_FILE = 'ipl_model.pkl'
+DATA_FILE = 'ml_training_data.json'          # legacy whole-file format, migrated on startup
+MATCH_LOG_FILE = 'ml_training_data.ndjson'
+MODEL_FILE = 'ipl_model.bin'
+LEGACY_MODEL_FILE = 'ipl_model.pkl'         # pickled model from older versions (no longer read)
 
+# Model artifact: magic, header length, JSON header, then 64-byte aligned arrays
+MODEL_MAGIC = b'IPLMODL1'
+MODEL_FORMAT_VERSION = 3         # 2 adds team ratings, 3 decays idle ones in the table; older artifacts are rebuilt from the log
+MODEL_ALIGNMENT = 64
+MODEL_RELOAD_INTERVAL = 1.0      # seconds between stat checks for a newer artifact
+
+MATCH_LOG_SYNC_EVERY = 64        # fsync after this many appends...
+MATCH_LOG_SYNC_INTERVAL = 1.0    # ...or this many seconds, whichever comes first
+MATCH_LOG_COMPACT_MIN = 1000     # superseded records before compaction is worth it
+
+# Online learning: fold each added match into the model as it arrives
+ONLINE_LEARNING = os.environ.get('ML_ONLINE_LEARNING', '1') != '0'
+
+# ==========================================
+# MATCH LOG
+# ==========================================
+
+class MatchLog:
+    """Append-only NDJSON log of training matches.
+    
+    Each line is one match. Replacing the whole history appends a
+    {"op": "reset"} marker followed by the new matches, so no write ever
+    rewrites earlier lines. Appends are flushed immediately and fsynced in
+    batches. A torn last line left by a crash is cut off when the log is
+    replayed. Records before the last reset are dropped by a background
+    compaction that swaps the file in with an atomic rename.
+    
+    Several processes may share the log: appends, the torn-tail check and
+    the compaction swap all hold an exclusive flock on `<path>.lock`, and a
+    writer whose handle points at a file replaced by another process's
+    compaction reopens the path before appending. Each process keeps its
+    read position, so tail() and every write hand back the records other
+    processes appended since, in log order.
+    """
+    
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.lock_path = path + '.lock'
+        self.lock_file = None
+        self.lock_pid = None
+        self.file = None
+        self.reader = None     # open handle on the file being read...
+        self.offset = 0        # ...and the bytes of it read so far
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.live_records = 0
+        self.dead_records = 0
+        self.compacting = False
+        self.syncer = None
+        
+        if os.path.exists(self.path + '.tmp'):
+            os.remove(self.path + '.tmp')   # interrupted compaction; the log itself is intact
+        if legacy_path and os.path.exists(legacy_path) and not os.path.exists(self.path):
+            self._migrate(legacy_path)
+    
+    def _migrate(self, legacy_path):
+        with open(legacy_path, 'r') as f:
+            matches = json.load(f)
+        self._write_atomically(json.dumps(match, separators=(',', ':')) + '\n' for match in matches)
+        print(f"✅ Migrated {len(matches)} matches from {legacy_path} to {self.path}")
+    
+    def _write_atomically(self, lines):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            for line in lines:
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+    
+    def replay(self):
+        """Stream every record (matches and reset markers), then open for appending"""
+        self.live_records = self.dead_records = 0
+        self._switch_reader(None)
+        yield from self._read_records()
+        with self._exclusive():
+            # Lines other processes finished meanwhile are read; what is left is torn
+            yield from self._read_records()
+            if self.reader is not None and self.offset < os.fstat(self.reader.fileno()).st_size:
+                print(f"⚠️ Truncating torn tail of {self.path}")
+                with open(self.path, 'r+b') as f:
+                    f.truncate(self.offset)
+            self._open()
+    
+    def _switch_reader(self, reader):
+        if self.reader is not None:
+            self.reader.close()
+        self.reader, self.offset = reader, 0
+    
+    def _read_records(self):
+        try:
+            current = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        if self.reader is not None and os.fstat(current.fileno()).st_ino == os.fstat(self.reader.fileno()).st_ino:
+            current.close()
+        else:
+            # Replaced by a compaction, which keeps the last reset marker first,
+            # so reading it from the start supersedes what was read. The old file
+            # is held open until now, so its inode cannot have been reused.
+            self._switch_reader(current)
+        
+        f = self.reader
+        f.seek(self.offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self.offset += len(line)
+            if record.get('op') == 'reset':
+                self.dead_records += self.live_records + 1
+                self.live_records = 0
+            else:
+                self.live_records += 1
+            yield record
+    
+    @contextmanager
+    def _exclusive(self):
+        """Hold the cross-process lock on the log (a no-op where flock is unavailable)"""
+        if fcntl is None:
+            yield
+            return
+        if self.lock_pid != os.getpid():
+            # A handle inherited across fork shares the parent's lock, so open our own
+            self.lock_file = open(self.lock_path, 'a')
+            self.lock_pid = os.getpid()
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+    
+    def _open(self):
+        self.file = open(self.path, 'a')
+    
+    def _reopen_if_replaced(self):
+        # Caller holds the flock. After another process compacts, our handle
+        # points at the old inode and anything appended to it would be lost.
+        if self.file is not None:
+            try:
+                replaced = os.fstat(self.file.fileno()).st_ino != os.stat(self.path).st_ino
+            except FileNotFoundError:
+                replaced = True
+            if not replaced:
+                return
+            self.file.close()
+        self._open()
+    
+    def _read_to_end(self):
+        # Caller holds the flock, and self.file is open on the current log:
+        # everything in it has been read or was just written by us
+        info = os.fstat(self.file.fileno())
+        if self.reader is None or os.fstat(self.reader.fileno()).st_ino != info.st_ino:
+            self._switch_reader(open(self.path, 'rb'))
+        self.offset = info.st_size
+    
+    def tail(self):
+        """Records appended (by any process) since this one last read or wrote"""
+        with self.lock:
+            return list(self._read_records())
+    
+    def append(self, match):
+        """Append a match; returns the records other processes appended before it"""
+        return self._write([match])
+    
+    def reset(self, matches):
+        """Supersede the whole history with `matches`; returns the new history's id"""
+        marker = {'op': 'reset', 'id': uuid.uuid4().hex, 'at': datetime.now().isoformat()}
+        self._write([marker] + list(matches), reset=True)
+        return marker['id']
+    
+    def _write(self, records, reset=False):
+        with self.lock:
+            with self._exclusive():
+                self._reopen_if_replaced()
+                foreign = list(self._read_records())
+                for record in records:
+                    self.file.write(json.dumps(record, separators=(',', ':')) + '\n')
+                self.file.flush()
+                self._read_to_end()
+            
+            if reset:
+                self.dead_records += self.live_records + 1
+                self.live_records = len(records) - 1
+            else:
+                self.live_records += len(records)
+            self.pending += len(records)
+            if self.pending >= MATCH_LOG_SYNC_EVERY or time.monotonic() - self.last_sync >= MATCH_LOG_SYNC_INTERVAL:
+                self._sync()
+            elif self.syncer is None:
+                self.syncer = threading.Thread(target=self._sync_loop, daemon=True)
+                self.syncer.start()
+            compact = (not self.compacting and self.dead_records >= MATCH_LOG_COMPACT_MIN
+                       and self.dead_records > self.live_records)
+            if compact:
+                self.compacting = True
+        
+        if compact:
+            threading.Thread(target=self.compact, daemon=True).start()
+        return foreign
+    
+    def _sync(self):
+        # Caller holds self.lock
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+    
+    def _sync_loop(self):
+        while True:
+            time.sleep(MATCH_LOG_SYNC_INTERVAL)
+            with self.lock:
+                if self.pending and self.file is not None:
+                    self._sync()
+    
+    def sync(self):
+        """Force pending appends to disk"""
+        with self.lock:
+            if self.pending and self.file is not None:
+                self._sync()
+    
+    def compact(self):
+        """Rewrite the log without records superseded by a reset"""
+        try:
+            with self.lock, self._exclusive():
+                self._reopen_if_replaced()
+                copied = os.path.getsize(self.path)
+                src = open(self.path, 'rb')
+            
+            # Copy the live segment without holding the locks; appends continue
+            tmp = self.compact_path
+            live = 0
+            with src, open(tmp, 'wb') as dst:
+                segment_start = 0
+                position = 0
+                while position < copied:
+                    line = src.readline()
+                    position += len(line)
+                    if line.startswith(b'{"op":"reset"'):
+                        # Keep the marker, so a reader that restarts on the new file starts over
+                        segment_start = position - len(line)
+                src.seek(segment_start)
+                remaining = copied - segment_start
+                while remaining > 0:
+                    chunk = src.read(min(1 << 20, remaining))
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+                
+                # Catch up with anything appended meanwhile, then swap files
+                with self.lock, self._exclusive():
+                    if os.fstat(src.fileno()).st_ino != os.stat(self.path).st_ino:
+                        return   # another process compacted first
+                    src.seek(copied)
+                    tail = src.read()
+                    if b'{"op":"reset"' in tail:
+                        return   # superseded while copying; a later compaction will handle it
+                    dst.write(tail)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    os.replace(tmp, self.path)
+                    self.file.close()
+                    self._open()
+                    reader = self.reader
+                    if (reader is not None and os.fstat(reader.fileno()).st_ino == os.fstat(src.fileno()).st_ino
+                            and self.offset >= segment_start):
+                        # Our read position moves with the copied segment
+                        offset = self.offset - segment_start
+                        self._switch_reader(open(self.path, 'rb'))
+                        self.offset = offset
+                    self.pending = 0
+                    self.dead_records = 0
+                    live = self.live_records
+            print(f"🗜️ Compacted {self.path} to {live} matches")
+        finally:
+            self.compacting = False
+            if os.path.exists(self.compact_path):
+                os.remove(self.compact_path)
+    
+    @property
+    def compact_path(self):
+        # One per process, so two processes compacting at once don't share it
+        return f'{self.path}.{os.getpid()}.tmp'
+
+# ==========================================
+# COLUMNAR MATCH HISTORY
 # ==========================================
-# ENHANCED ML MODELS WITH TRAINING
+
+NO_TOSS = -1
+TOSS_BAT, TOSS_BOWL = 0, 1
+MAX_SCORE = np.iinfo(np.int32).max   # scores are stored as int32 columns
+
+BATCH_PREDICT_LIMIT = 1000  # fixtures per /api/predict/batch request
+
+EVAL_FOLDS = 5              # walk-forward test windows
+EVAL_MIN_MATCHES = 10       # below this there is nothing meaningful to hold out
+CALIBRATION_BUCKETS = 10
+
+FORM_WINDOW = 5             # recent results kept per team for form
+FORM_MIN_MATCHES = 3        # fewer than this reads as 'Insufficient data'
+
+def date_ordinal(date):
+    """'2024-03-25' -> 20240325 (None if missing or malformed)"""
+    try:
+        return int(datetime.strptime(str(date)[:10], '%Y-%m-%d').strftime('%Y%m%d'))
+    except ValueError:
+        return None
+
+def date_ordinals(dates):
+    """Vectorized date_ordinal for a sequence of dates (0 where missing or malformed)"""
+    text = np.array([str(date)[:10] if date else '' for date in dates], dtype='U10')
+    # Each U10 string is ten UCS-4 code points, so the digits are plain integer arithmetic
+    chars = text.view(np.uint32).reshape(len(text), 10).astype(np.int64)
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]] - ord('0')
+    valid = ((chars[:, 4] == ord('-')) & (chars[:, 7] == ord('-'))
+             & ((digits >= 0) & (digits <= 9)).all(axis=1))
+    
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    
+    # Reject impossible dates (month 13, 30 February) as strptime does
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (year >= 1)
+    months = ((np.where(valid, year, 1970) - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+    month_days = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+    valid &= day <= month_days
+    ordinals = np.where(valid, year * 10000 + month * 100 + day, 0)
+    
+    # Rare non-canonical spellings strptime still accepts, e.g. '2024-3-5'
+    for row in np.flatnonzero(~valid & (text != '')):
+        ordinals[row] = date_ordinal(text[row]) or 0
+    return ordinals
+
+class MatchColumns:
+    """The match history as parallel NumPy columns for vectorized training.
+    
+    Teams and venues are interned to small integer ids. Winner and toss
+    winner are stored as 0 (team1) / 1 (team2). Columns grow by doubling,
+    so appending a match is amortized O(1).
+    """
+    
+    DTYPES = {
+        'day': np.int32,
+        'team1': np.int16,
+        'team2': np.int16,
+        'venue': np.int32,
+        'team1_score': np.int32,
+        'team2_score': np.int32,
+        'winner': np.int8,
+        'toss_winner': np.int8,
+        'toss_decision': np.int8
+    }
+    
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.teams, self.team_ids = [], {}
+        self.venues, self.venue_ids = [], {}
+        self.data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.DTYPES.items()}
+    
+    def __len__(self):
+        return self.size
+    
+    def __getattr__(self, name):
+        data = self.__dict__.get('data')
+        if data is None or name not in data:
+            raise AttributeError(name)
+        return data[name][:self.size]
+    
+    @classmethod
+    def from_matches(cls, matches):
+        """Build the columns in bulk: one pass per field and vectorized date parsing"""
+        matches = list(matches)
+        n = len(matches)
+        columns = cls(capacity=max(1024, n))
+        data = columns.data
+        
+        # Undated matches sort with the match logged before them
+        days = date_ordinals([match.get('date') for match in matches])
+        previous = np.maximum.accumulate(np.where(days > 0, np.arange(n), -1)) if n else days
+        data['day'][:n] = np.where(previous >= 0, days[np.maximum(previous, 0)], 0)
+        
+        # Intern names in order of first appearance, so ids match those append() assigns
+        team1 = [match['team1'] for match in matches]
+        team2 = [match['team2'] for match in matches]
+        venues = [match.get('venue', 'unknown') for match in matches]
+        for name in dict.fromkeys(chain.from_iterable(zip(team1, team2))):
+            columns._intern(columns.teams, columns.team_ids, name)
+        for name in dict.fromkeys(venues):
+            columns._intern(columns.venues, columns.venue_ids, name)
+        for name, names, ids in (('team1', team1, columns.team_ids), ('team2', team2, columns.team_ids),
+                                 ('venue', venues, columns.venue_ids)):
+            data[name][:n] = np.fromiter(map(ids.__getitem__, names), dtype=cls.DTYPES[name], count=n)
+        
+        for name, field in (('team1_score', 'team1Score'), ('team2_score', 'team2Score')):
+            data[name][:n] = np.fromiter(map(itemgetter(field), matches), dtype=cls.DTYPES[name], count=n)
+        data['winner'][:n] = np.array([match['winner'] for match in matches], dtype=object) != 'team1'
+        
+        toss_winner = np.array([match.get('tossWinner') for match in matches], dtype=object)
+        toss_decision = np.array([match.get('tossDecision') for match in matches], dtype=object)
+        tossed = np.fromiter(map(bool, toss_winner), dtype=bool, count=n) & np.fromiter(map(bool, toss_decision), dtype=bool, count=n)
+        data['toss_winner'][:n] = np.where(tossed, toss_winner != 'team1', NO_TOSS)
+        data['toss_decision'][:n] = np.where(tossed, np.where(toss_decision == 'bat', TOSS_BAT, TOSS_BOWL), NO_TOSS)
+        columns.size = n
+        return columns
+    
+    def _intern(self, names, ids, name):
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+    
+    @classmethod
+    def encode(cls, match):
+        """A match's score, winner and toss values as a column row; raises if they do not fit"""
+        scores = np.array([match['team1Score'], match['team2Score']], dtype=cls.DTYPES['team1_score'])
+        if match.get('tossWinner') and match.get('tossDecision'):
+            toss = (0 if match['tossWinner'] == 'team1' else 1,
+                    TOSS_BAT if match['tossDecision'] == 'bat' else TOSS_BOWL)
+        else:
+            toss = (NO_TOSS, NO_TOSS)
+        return scores, 0 if match['winner'] == 'team1' else 1, toss
+    
+    def append(self, match, row=None):
+        """Add one match; `row` is its encode() result when the caller already has it"""
+        scores, winner, toss = row or self.encode(match)
+        if self.size == len(self.data['team1']):
+            for name, column in self.data.items():
+                grown = np.zeros(len(column) * 2, dtype=column.dtype)
+                grown[:self.size] = column
+                self.data[name] = grown
+        
+        row = self.size
+        # Undated matches sort with the match logged before them
+        day = date_ordinal(match.get('date'))
+        if day is None:
+            day = self.data['day'][row - 1] if row else 0
+        self.data['day'][row] = day
+        self.data['team1'][row] = self._intern(self.teams, self.team_ids, match['team1'])
+        self.data['team2'][row] = self._intern(self.teams, self.team_ids, match['team2'])
+        self.data['venue'][row] = self._intern(self.venues, self.venue_ids, match.get('venue', 'unknown'))
+        self.data['team1_score'][row], self.data['team2_score'][row] = scores
+        self.data['winner'][row] = winner
+        self.data['toss_winner'][row], self.data['toss_decision'][row] = toss
+        self.size += 1
+
+def aggregate_columns(columns, rows=None):
+    """Compute team, venue and toss aggregates with NumPy (over `rows`, or everything)"""
+    # rows may be an index array or a slice; ids beyond the selected rows just get zeros
+    def column(name):
+        values = getattr(columns, name)
+        return values if rows is None else values[rows]
+    
+    n_teams, n_venues = len(columns.teams), len(columns.venues)
+    team1, team2, venue = column('team1'), column('team2'), column('venue')
+    winner_team = np.where(column('winner') == 0, team1, team2)
+    
+    played = np.bincount(team1, minlength=n_teams) + np.bincount(team2, minlength=n_teams)
+    total_score = (np.bincount(team1, weights=column('team1_score'), minlength=n_teams)
+                   + np.bincount(team2, weights=column('team2_score'), minlength=n_teams))
+    wins = np.bincount(winner_team, minlength=n_teams)
+    
+    venue_matches = np.bincount(venue, minlength=n_venues)
+    venue_wins = np.zeros((n_venues, n_teams), dtype=np.int64)
+    np.add.at(venue_wins, (venue, winner_team), 1)
+    
+    toss_winner, toss_decision = column('toss_winner'), column('toss_decision')
+    tossed = toss_winner != NO_TOSS
+    toss_team = np.where(toss_winner == 0, team1, team2)
+    toss_won_match = tossed & (toss_team == winner_team)
+    
+    return {
+        'played': played,
+        'total_score': total_score,
+        'wins': wins,
+        'venue_matches': venue_matches,
+        'venue_wins': venue_wins,
+        'toss_total': int(tossed.sum()),
+        'bat_first_wins': int((toss_won_match & (toss_decision == TOSS_BAT)).sum()),
+        'bowl_first_wins': int((toss_won_match & (toss_decision == TOSS_BOWL)).sum())
+    }
+
 # ==========================================
+# TEAM RATINGS
+# ==========================================
+
+ELO_BASE = 1500.0
+ELO_SCALE = 400.0               # rating gap at which the stronger team is a 10:1 favourite
+ELO_K = 24.0                    # online rating step per result
+ELO_HOME_ADVANTAGE = 40.0       # rating points for playing at your home ground
+ELO_HALF_LIFE_DAYS = 730        # a result's weight (and an idle team's lead) halves over this
+ELO_PRIOR = 2.0                 # pull toward ELO_BASE in the batch fit; keeps unbeaten teams finite
+ELO_FIT_ITERATIONS = 25
+ELO_FIT_TOLERANCE = 0.01       # stop once no rating moves by more than this
+ELO_HISTORY_SEASONS = 10        # season-end refits recorded as rating history by train()
+ELO_HISTORY_LIMIT = 100         # rating history points kept per team
+
+HOME_GROUNDS = {
+    'CSK': ('Chidambaram', 'Chepauk'),
+    'MI': ('Wankhede',),
+    'RCB': ('Chinnaswamy',),
+    'KKR': ('Eden Gardens',),
+    'DC': ('Arun Jaitley', 'Feroz Shah Kotla'),
+    'SRH': ('Rajiv Gandhi',),
+    'RR': ('Sawai Mansingh',),
+    'PBKS': ('Bindra', 'PCA Stadium', 'Mohali'),
+    'GT': ('Narendra Modi', 'Motera'),
+    'LSG': ('Ekana',)
+}
+
+def is_home(team, venue):
+    venue = (venue or '').lower()
+    return any(ground.lower() in venue for ground in HOME_GROUNDS.get(team, ()))
+
+def home_matrix(teams, venues):
+    """home[team, venue] = 1 at a team's home ground; the extra last row and column are unknowns"""
+    home = np.zeros((len(teams) + 1, len(venues) + 1))
+    for i, team in enumerate(teams):
+        for v, venue in enumerate(venues):
+            if is_home(team, venue):
+                home[i, v] = 1.0
+    return home
+
+def day_numbers(days):
+    """YYYYMMDD ordinals -> days since 1970-01-01 (0, undated, stays 0)"""
+    days = np.asarray(days, dtype=np.int64)
+    dated = days > 0
+    days = np.where(dated, days, 19700101)
+    months = (days // 10000 - 1970) * 12 + days // 100 % 100 - 1
+    numbers = months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + days % 100 - 1
+    return np.where(dated, numbers, 0)
+
+def win_probabilities(ratings, home, team1, team2, venue):
+    """Vectorized predict_match: probability that team1 wins, for arrays of ids"""
+    diff = ratings[team1] - ratings[team2] + ELO_HOME_ADVANTAGE * (home[team1, venue] - home[team2, venue])
+    return 1 / (1 + 10 ** (-diff / ELO_SCALE))
+
+def fit_ratings(columns, rows, home=None, start=None):
+    """Bradley-Terry ratings (Elo scale) for every team id, fitted to the matches in `rows`.
+    
+    Each result counts 0.5 ** (age / ELO_HALF_LIFE_DAYS), measured from
+    the latest match in `rows`. `start` warm-starts the fit from earlier
+    ratings.
+    """
+    if home is None:
+        home = home_matrix(columns.teams, columns.venues)
+    matches = rating_inputs(columns, rows, home)
+    days = matches.pop('days')
+    weight = 0.5 ** ((days.max(initial=0) - days) / ELO_HALF_LIFE_DAYS)
+    return solve_ratings(len(columns.teams), weight=weight, start=start, **matches)
+
+def rating_inputs(columns, rows, home):
+    """Per-match arrays the rating fit needs: team ids, home offset, outcome and day number"""
+    team1, team2 = columns.team1[rows].astype(np.intp), columns.team2[rows].astype(np.intp)
+    venue = columns.venue[rows].astype(np.intp)
+    return {
+        'team1': team1,
+        'team2': team2,
+        'offset': ELO_HOME_ADVANTAGE * np.log(10) / ELO_SCALE * (home[team1, venue] - home[team2, venue]),
+        'won': (columns.winner[rows] == 0).astype(np.float64),
+        'days': day_numbers(columns.day[rows])
+    }
+
+def solve_ratings(n_teams, team1, team2, offset, won, weight, start=None):
+    """Maximize the weighted Bradley-Terry likelihood by Newton's method (in natural log-odds)"""
+    scale = np.log(10) / ELO_SCALE
+    strength = np.zeros(n_teams) if start is None else (np.asarray(start, dtype=np.float64) - ELO_BASE) * scale
+    pairs = team1 * n_teams + team2
+    for _ in range(ELO_FIT_ITERATIONS):
+        p = 1 / (1 + np.exp(-(strength[team1] - strength[team2] + offset)))
+        residual = weight * (won - p)
+        gradient = (np.bincount(team1, residual, n_teams) - np.bincount(team2, residual, n_teams)
+                    - ELO_PRIOR * strength)
+        curvature = weight * p * (1 - p)
+        between = np.bincount(pairs, curvature, n_teams * n_teams).reshape(n_teams, n_teams)
+        hessian = np.diag(np.bincount(team1, curvature, n_teams) + np.bincount(team2, curvature, n_teams)
+                          + ELO_PRIOR) - between - between.T
+        step = np.linalg.solve(hessian, gradient)
+        strength += step
+        if np.abs(step).max(initial=0) < ELO_FIT_TOLERANCE * scale:
+            break
+    return ELO_BASE + strength / scale
+
+def fit_rating_history(columns, n, home):
+    """Season-end refits over the first n matches: {team: [[date, rating], ...]}, oldest first"""
+    matches = rating_inputs(columns, slice(0, n), home)
+    # Sorted by date, each season's fit is on a prefix of the same arrays
+    order = np.argsort(matches['days'], kind='stable')
+    matches = {name: values[order] for name, values in matches.items()}
+    days, seasons = matches.pop('days'), columns.day[:n][order] // 10000
+    
+    history, ratings = {}, None
+    for season in np.unique(seasons[seasons > 0])[-ELO_HISTORY_SEASONS:].tolist():
+        end = int(np.searchsorted(seasons, season, side='right'))
+        prefix = {name: values[:end] for name, values in matches.items()}
+        weight = 0.5 ** ((days[end - 1] - days[:end]) / ELO_HALF_LIFE_DAYS)
+        ratings = solve_ratings(len(columns.teams), weight=weight, start=ratings, **prefix)
+        
+        played = np.zeros(len(columns.teams), dtype=bool)
+        played[prefix['team1']] = played[prefix['team2']] = True
+        season_end = int(columns.day[:n][order[end - 1]])
+        date = f"{season_end // 10000}-{season_end // 100 % 100:02d}-{season_end % 100:02d}"
+        for team_id in np.flatnonzero(played).tolist():
+            history.setdefault(columns.teams[team_id], []).append([date, round(float(ratings[team_id]), 1)])
+    return history
+
+def evaluate_walk_forward(columns, folds=EVAL_FOLDS, size=None, progress=None):
+    """Score the model on time-ordered holdouts it was not trained on.
+    
+    Matches are sorted by date and cut into folds + 1 windows. Each window
+    after the first is predicted by a model trained only on the windows
+    before it, so no result leaks into its own prediction.
+    """
+    n = len(columns) if size is None else size
+    if n < EVAL_MIN_MATCHES:
+        return None
+    
+    started = time.perf_counter()
+    order = np.argsort(columns.day[:n], kind='stable')
+    bounds = np.linspace(0, n, folds + 2).astype(int)
+    home = home_matrix(columns.teams, columns.venues)
+    probabilities, outcomes = [], []
+    for k in range(1, folds + 1):
+        train_rows, test_rows = order[:bounds[k]], order[bounds[k]:bounds[k + 1]]
+        if not len(train_rows) or not len(test_rows):
+            continue
+        ratings = fit_ratings(columns, train_rows, home)
+        probabilities.append(win_probabilities(ratings, home, columns.team1[test_rows],
+                                               columns.team2[test_rows], columns.venue[test_rows]))
+        outcomes.append(columns.winner[test_rows] == 0)
+        if progress:
+            progress(k / folds)
+    
+    p = np.concatenate(probabilities)
+    y = np.concatenate(outcomes).astype(np.float64)
+    clipped = np.clip(p, 1e-15, 1 - 1e-15)
+    
+    buckets = []
+    index = np.minimum((p * CALIBRATION_BUCKETS).astype(int), CALIBRATION_BUCKETS - 1)
+    counts = np.bincount(index, minlength=CALIBRATION_BUCKETS)
+    predicted = np.bincount(index, weights=p, minlength=CALIBRATION_BUCKETS)
+    observed = np.bincount(index, weights=y, minlength=CALIBRATION_BUCKETS)
+    for bucket in np.flatnonzero(counts).tolist():
+        buckets.append({
+            'range': [bucket / CALIBRATION_BUCKETS, (bucket + 1) / CALIBRATION_BUCKETS],
+            'matches': int(counts[bucket]),
+            'predicted': round(float(predicted[bucket] / counts[bucket]), 4),
+            'observed': round(float(observed[bucket] / counts[bucket]), 4)
+        })
+    
+    return {
+        'method': 'walk-forward',
+        'folds': len(probabilities),
+        'matches_evaluated': len(p),
+        'accuracy': round(float(np.mean((p > 0.5) == (y == 1))) * 100, 2),
+        'log_loss': round(float(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))), 4),
+        'brier_score': round(float(np.mean((p - y) ** 2)), 4),
+        'calibration': buckets,
+        'seconds': round(time.perf_counter() - started, 4)
+    }
+
+# ==========================================
+# MODEL SNAPSHOTS
+# ==========================================
+
+def new_team_stats():
+    return {
+        'matches_played': 0,
+        'wins': 0,
+        'total_score': 0,
+        'win_rate': 0.5
+    }
+
+def new_venue_stats():
+    return {'matches': 0, 'teams': {}}
+
+def validate_match(match):
+    """Raise ValueError unless a match record has everything training needs"""
+    if not isinstance(match, dict):
+        raise ValueError('Match must be an object')
+    if 'op' in match:
+        # The match log marks its control records (resets) with 'op'
+        raise ValueError("A match cannot have an 'op' field")
+    for field in ('team1', 'team2'):
+        if not match.get(field):
+            raise ValueError(f'{field} is required')
+        if not isinstance(match[field], str):
+            raise ValueError(f'{field} must be a string')
+    if match.get('venue') is not None and not isinstance(match['venue'], str):
+        raise ValueError('venue must be a string')
+    if match['team1'] == match['team2']:
+        raise ValueError('A team cannot play itself')
+    if match.get('date') and date_ordinal(match['date']) is None:
+        raise ValueError('date must be YYYY-MM-DD')
+    if match.get('winner') not in ('team1', 'team2'):
+        raise ValueError("winner must be 'team1' or 'team2'")
+    for field in ('team1Score', 'team2Score'):
+        score = match.get(field)
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError(f'{field} must be a number')
+        # is_integer() is False for NaN and infinity too
+        if (isinstance(score, float) and not score.is_integer()) or not 0 <= score <= MAX_SCORE:
+            raise ValueError(f'{field} must be a whole number from 0 to {MAX_SCORE}')
+
+def is_valid_match(match):
+    try:
+        validate_match(match)
+    except ValueError:
+        return False
+    return True
+
+def update_derived(stats):
+    if stats['matches_played'] > 0:
+        stats['win_rate'] = stats['wins'] / stats['matches_played']
+        stats['avg_score'] = stats['total_score'] / stats['matches_played']
+
+def accumulate_match(team_stats, venue_stats, toss_impact, match):
+    """Add a single match to the aggregates in place (the per-match training step)"""
+    team1 = match['team1']
+    team2 = match['team2']
+    winner = match['winner']
+    winner_team = team1 if winner == 'team1' else team2
+    
+    # Update team stats
+    team_stats[team1]['matches_played'] += 1
+    team_stats[team1]['total_score'] += match['team1Score']
+    
+    team_stats[team2]['matches_played'] += 1
+    team_stats[team2]['total_score'] += match['team2Score']
+    
+    team_stats[winner_team]['wins'] += 1
+    
+    # Update venue stats
+    venue = match.get('venue', 'unknown')
+    venue_stats[venue]['matches'] += 1
+    
+    if winner_team not in venue_stats[venue]['teams']:
+        venue_stats[venue]['teams'][winner_team] = 0
+    venue_stats[venue]['teams'][winner_team] += 1
+    
+    # Update toss impact
+    if match.get('tossWinner') and match.get('tossDecision'):
+        toss_impact['total'] += 1
+        toss_winner = team1 if match['tossWinner'] == 'team1' else team2
+        
+        if toss_winner == winner_team:
+            if match['tossDecision'] == 'bat':
+                toss_impact['bat_first_wins'] += 1
+            else:
+                toss_impact['bowl_first_wins'] += 1
+
+class ModelSnapshot:
+    """One published version of the trained model; never modified once published.
+    
+    Readers take `predictor.model` once and use only that object, so they
+    see a consistent model without locking. Writers derive a new snapshot
+    and publish it by assigning `predictor.model`, a single reference swap.
+    
+    Besides the aggregates it keeps, per team, a ring buffer of the last
+    FORM_WINDOW results ('W'/'L', oldest first) and an index of venue wins,
+    so form and insights never scan the match history or every venue.
+    Predictions come from the Elo ratings: `ratings` (team -> rating),
+    `rating_days` (team -> day number of its last dated match, for decay)
+    and `rating_history` (team -> deque of [date, rating]).
+    
+    `history` names the match history the model was trained on (the id of
+    the match log's last reset marker, None before the first reset), and
+    `matches_trained` is how many of that history's matches it includes.
+    """
+    
+    __slots__ = ('team_stats', 'venue_stats', 'toss_impact', 'matches_trained', 'version',
+                 'team_form', 'team_venues', 'ratings', 'rating_days', 'rating_history',
+                 'history', '_table')
+    
+    def __init__(self, team_stats=None, venue_stats=None, toss_impact=None,
+                 matches_trained=0, version=0, table=None, team_form=None, team_venues=None,
+                 ratings=None, rating_days=None, rating_history=None, history=None):
+        self.team_stats = team_stats if team_stats is not None else {}
+        self.venue_stats = venue_stats if venue_stats is not None else {}
+        self.toss_impact = toss_impact or {'bat_first_wins': 0, 'bowl_first_wins': 0, 'total': 0}
+        self.matches_trained = matches_trained
+        self.version = version
+        self.team_form = team_form if team_form is not None else {}
+        self.team_venues = team_venues if team_venues is not None else index_venue_wins(self.venue_stats)
+        self.ratings = ratings if ratings is not None else {}
+        self.rating_days = rating_days if rating_days is not None else {}
+        self.rating_history = rating_history if rating_history is not None else {}
+        self.history = history
+        self._table = table
+    
+    def rating(self, team, day=0):
+        """A team's rating, its lead over ELO_BASE decayed for the days it has been idle before `day`"""
+        rating = self.ratings.get(team, ELO_BASE)
+        last = self.rating_days.get(team, 0)
+        if day > last > 0:
+            rating = ELO_BASE + (rating - ELO_BASE) * 0.5 ** ((day - last) / ELO_HALF_LIFE_DAYS)
+        return rating
+    
+    @property
+    def latest_day(self):
+        """Day number of the model's most recent dated match, the day its ratings are quoted for"""
+        return max(self.rating_days.values(), default=0)
+    
+    def with_match(self, match):
+        """Copy-on-write: a new snapshot with one more match folded in, in O(teams + venues)"""
+        team1, team2 = match['team1'], match['team2']
+        venue = match.get('venue', 'unknown')
+        
+        # Only the two team entries and the venue entry change, so only they are copied
+        team_stats = dict(self.team_stats)
+        for team in (team1, team2):
+            team_stats[team] = dict(self.team_stats.get(team) or new_team_stats())
+        venue_stats = dict(self.venue_stats)
+        previous = self.venue_stats.get(venue) or new_venue_stats()
+        venue_stats[venue] = {'matches': previous['matches'], 'teams': dict(previous['teams'])}
+        toss_impact = dict(self.toss_impact)
+        
+        accumulate_match(team_stats, venue_stats, toss_impact, match)
+        for team in (team1, team2):
+            update_derived(team_stats[team])
+        
+        winner_team = team1 if match['winner'] == 'team1' else team2
+        team_form = dict(self.team_form)
+        for team in (team1, team2):
+            form = team_form[team] = deque(self.team_form.get(team, ()), maxlen=FORM_WINDOW)
+            form.append('W' if team == winner_team else 'L')
+        team_venues = dict(self.team_venues)
+        wins = team_venues[winner_team] = dict(self.team_venues.get(winner_team, {}))
+        wins[venue] = wins.get(venue, 0) + 1
+        
+        # One Elo step: move both ratings by K times the surprise of the result
+        day = int(day_numbers([date_ordinal(match.get('date')) or 0])[0])
+        rating1, rating2 = self.rating(team1, day), self.rating(team2, day)
+        expected = 1 / (1 + 10 ** (-(rating1 - rating2 + ELO_HOME_ADVANTAGE
+                                     * (is_home(team1, venue) - is_home(team2, venue))) / ELO_SCALE))
+        change = ELO_K * ((winner_team == team1) - expected)
+        ratings, rating_days, rating_history = dict(self.ratings), dict(self.rating_days), dict(self.rating_history)
+        for team, rating in ((team1, rating1 + change), (team2, rating2 - change)):
+            ratings[team] = rating
+            if day:
+                rating_days[team] = max(day, self.rating_days.get(team, 0))
+            history = rating_history[team] = deque(self.rating_history.get(team, ()), maxlen=ELO_HISTORY_LIMIT)
+            history.append([match.get('date'), round(rating, 1)])
+        
+        return ModelSnapshot(team_stats, venue_stats, toss_impact, self.matches_trained + 1,
+                             self.version, team_form=team_form, team_venues=team_venues,
+                             ratings=ratings, rating_days=rating_days, rating_history=rating_history,
+                             history=self.history)
+    
+    def form(self, team):
+        """Rate a team's last FORM_WINDOW results"""
+        results = self.team_form.get(team, ())
+        if len(results) < FORM_MIN_MATCHES:
+            return 'Insufficient data'
+        
+        win_rate = results.count('W') / len(results) * 100
+        if win_rate >= 60:
+            return 'Excellent'
+        elif win_rate >= 40:
+            return 'Good'
+        else:
+            return 'Poor'
+    
+    def best_venues(self, team, limit=3):
+        """The team's highest win-rate venues, from its own venue index"""
+        venues = [{'venue': venue, 'win_rate': wins / self.venue_stats[venue]['matches'] * 100, 'wins': wins}
+                  for venue, wins in self.team_venues.get(team, {}).items()]
+        return heapq.nlargest(limit, venues, key=lambda x: x['win_rate'])
+    
+    def table(self):
+        """Team-1 win probabilities for every (team1, team2, venue), built once per snapshot.
+        
+        The extra last team index stands for any team the model has not seen
+        (rated ELO_BASE, no home ground) and the extra last venue index for
+        an unknown or missing venue, so every lookup is a plain array index
+        whatever the size of the history. Ratings are decayed to `latest_day`,
+        as with_match would before a match on that day. Two readers racing
+        here just build the same table twice.
+        """
+        if self._table is not None:
+            return self._table
+        
+        teams, venues = list(self.team_stats), list(self.venue_stats)
+        n_teams, n_venues = len(teams), len(venues)
+        ratings = np.full(n_teams + 1, ELO_BASE)
+        played = np.zeros(n_teams + 1, dtype=np.int64)
+        day = self.latest_day
+        for i, team in enumerate(teams):
+            ratings[i] = self.rating(team, day)
+            played[i] = self.team_stats[team]['matches_played']
+        
+        team1, team2, venue_id = np.ogrid[:n_teams + 1, :n_teams + 1, :n_venues + 1]
+        tensor = win_probabilities(ratings, home_matrix(teams, venues), team1, team2, venue_id)
+        team_ids = {team: i for i, team in enumerate(teams)}
+        
+        self._table = {
+            'team_ids': team_ids,
+            'venue_ids': {venue: v for v, venue in enumerate(venues)},
+            'played': played,
+            'tensor': tensor
+        }
+        return self._table
+
+def index_venue_wins(venue_stats):
+    """Invert venue -> {team: wins} into team -> {venue: wins}"""
+    team_venues = {}
+    for venue, data in venue_stats.items():
+        for team, wins in data['teams'].items():
+            team_venues.setdefault(team, {})[venue] = wins
+    return team_venues
+
+def recent_form(columns, n):
+    """Each team's last FORM_WINDOW results over the first n matches, as ring buffers"""
+    rows = np.arange(n)
+    teams = np.concatenate([columns.team1[:n], columns.team2[:n]])
+    won = np.concatenate([columns.winner[:n] == 0, columns.winner[:n] == 1])
+    
+    # Group by team in match order, then keep the tail of each group
+    order = np.lexsort((np.concatenate([rows, rows]), teams))
+    teams, won = teams[order], won[order]
+    from_end = np.searchsorted(teams, teams, side='right') - np.arange(len(teams))
+    keep = from_end <= FORM_WINDOW
+    
+    team_form = {}
+    for team_id, result in zip(teams[keep].tolist(), won[keep].tolist()):
+        team = columns.teams[team_id]
+        if team not in team_form:
+            team_form[team] = deque(maxlen=FORM_WINDOW)
+        team_form[team].append('W' if result else 'L')
+    return team_form
+
+def build_model(columns, n, version=0, history=None):
+    """Build a snapshot of the model for the first n matches of the columnar history"""
+    totals = aggregate_columns(columns, slice(0, n))
+    
+    team_stats = {}
+    for team_id, team in enumerate(columns.teams[:len(totals['played'])]):
+        if not totals['played'][team_id]:
+            continue
+        stats = team_stats[team] = new_team_stats()
+        stats['matches_played'] = int(totals['played'][team_id])
+        stats['wins'] = int(totals['wins'][team_id])
+        stats['total_score'] = int(totals['total_score'][team_id])
+        update_derived(stats)
+    
+    venue_stats = {}
+    for venue_id, venue in enumerate(columns.venues[:len(totals['venue_matches'])]):
+        if not totals['venue_matches'][venue_id]:
+            continue
+        row = totals['venue_wins'][venue_id]
+        venue_stats[venue] = {
+            'matches': int(totals['venue_matches'][venue_id]),
+            'teams': {columns.teams[team_id]: int(row[team_id]) for team_id in np.flatnonzero(row)}
+        }
+    
+    toss_impact = {
+        'bat_first_wins': totals['bat_first_wins'],
+        'bowl_first_wins': totals['bowl_first_wins'],
+        'total': totals['toss_total']
+    }
+    
+    # Batch refit of the ratings; online Elo steps carry on from here
+    home = home_matrix(columns.teams, columns.venues)
+    fitted = fit_ratings(columns, slice(0, n), home)
+    days = day_numbers(columns.day[:n])
+    last_day = np.zeros(len(columns.teams), dtype=np.int64)
+    np.maximum.at(last_day, columns.team1[:n], days)
+    np.maximum.at(last_day, columns.team2[:n], days)
+    team_ids = [(team, columns.team_ids[team]) for team in team_stats]
+    rating_history = {team: deque(points, maxlen=ELO_HISTORY_LIMIT)
+                      for team, points in fit_rating_history(columns, n, home).items()}
+    
+    return ModelSnapshot(team_stats, venue_stats, toss_impact, n, version,
+                         team_form=recent_form(columns, n),
+                         ratings={team: float(fitted[i]) for team, i in team_ids},
+                         rating_days={team: int(last_day[i]) for team, i in team_ids},
+                         rating_history=rating_history, history=history)
 
 class AdvancedCricketPredictor:
     """ML model that trains on historical match data"""
     
-    def __init__(self):
+    def __init__(self, online=ONLINE_LEARNING):
         self.matches = []
-        self.team_stats = defaultdict(lambda: {
-            'matches_played': 0,
-            'wins': 0,
-            'total_score': 0,
-            'win_rate': 0.5
-        })
-        self.venue_stats = defaultdict(lambda: {'matches': 0, 'teams': {}})
-        self.toss_impact = {'bat_first_wins': 0, 'bowl_first_wins': 0, 'total': 0}
+        self.columns = MatchColumns()
+        self.history = None            # id of the match log's last reset marker
+        self.online = online
+        self.model = ModelSnapshot()   # current snapshot; replaced, never mutated
+        self.lock = threading.Lock()   # serializes writers; readers never take it
+        self.model_signature = None
+        self.reload_checked_at = 0.0
+        self.match_log = MatchLog(MATCH_LOG_FILE, legacy_path=DATA_FILE)
         
         self.load_model()
     
     def load_model(self):
         """Load saved model and data"""
-        if os.path.exists(MODEL_FILE):
-            with open(MODEL_FILE, 'rb') as f:
-                data = pickle.load(f)
-                self.team_stats = data['team_stats']
-                self.venue_stats = data['venue_stats']
-                self.toss_impact = data['toss_impact']
-                print("✅ Loaded trained model")
-        
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                self.matches = json.load(f)
-                print(f"✅ Loaded {len(self.matches)} historical matches")
-    
-    def save_model(self):
-        """Save trained model"""
-        with open(MODEL_FILE, 'wb') as f:
-            pickle.dump({
-                'team_stats': dict(self.team_stats),
-                'venue_stats': dict(self.venue_stats),
-                'toss_impact': self.toss_impact,
-                'trained_at': datetime.now().isoformat()
-            }, f)
-        print("✅ Model saved")
-    
-    def add_match(self, match_data):
-        """Add new match data"""
-        self.matches.append(match_data)
+        for record in self.match_log.replay():
+            if record.get('op') == 'reset':
+                self.matches = []
+                self.history = record.get('id') or record.get('at')
+            else:
+                self.matches.append(record)
+        try:
+            self.columns = MatchColumns.from_matches(self.matches)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            # Logged before add-match checked every field: leave those matches out
+            logged = len(self.matches)
+            self.matches = [match for match in self.matches if is_valid_match(match)]
+            self.columns = MatchColumns.from_matches(self.matches)
+            print(f"⚠️ Skipped {logged - len(self.matches)} invalid matches in {MATCH_LOG_FILE}")
+        if self.matches:
+            print(f"✅ Loaded {len(self.matches)} historical matches")
+        
+        loaded = self._load_artifact()
+        if loaded:
+            print(f"✅ Loaded trained model v{self.model.version}")
         
-        # Save to file
-        with open(DATA_FILE, 'w') as f:
-            json.dump(self.matches, f)
+        stale = os.path.exists(LEGACY_MODEL_FILE) or os.path.exists(MODEL_FILE)
+        if not loaded and stale and len(self.matches) >= 5:
+            # Upgrading from the pickle or an older artifact format: rebuild from the log
+            self.model = build_model(self.columns, len(self.columns), version=self.model.version + 1,
+                                     history=self.history)
+            self.save_model(self.model)
+            print(f"✅ Rebuilt model from {len(self.matches)} matches (replaces the old model file)")
         
-        return {'success': True, 'total_matches': len(self.matches)}
+        applied = self._catch_up()
+        if applied:
+            print(f"✅ Applied {applied} matches added since training")
     
-    def train(self):
-        """Train model on historical data"""
-        if len(self.matches) < 5:
-            return {
-                'success': False,
-                'error': 'Need at least 5 matches to train',
-                'current_matches': len(self.matches)
-            }
+    def _apply_record(self, record, row=None):
+        # A match log record, in log order: a reset marker starts a new history
+        if record.get('op') == 'reset':
+            self.matches = []
+            self.columns = MatchColumns()
+            self.history = record.get('id') or record.get('at')
+        else:
+            self.matches.append(record)
+            self.columns.append(record, row)
+    
+    def _catch_up(self):
+        """Fold in the matches logged after those the model includes; returns how many.
         
-        print(f"🔄 Training on {len(self.matches)} matches...")
+        Positions count matches within one history of the shared log, so this
+        is right whichever process appended them. A model trained on another
+        history (before a reset) is left alone until the next train.
+        """
+        model = self.model
+        if not (self.online and model.team_stats and model.history == self.history
+                and 0 < model.matches_trained < len(self.matches)):
+            return 0
+        for match in self.matches[model.matches_trained:]:
+            model = model.with_match(match)
+        applied = model.matches_trained - self.model.matches_trained
+        self.model = model
+        return applied
+    
+    def sync_log(self):
+        """Pick up matches other processes appended to the shared log"""
+        with self.lock:
+            for record in self.match_log.tail():
+                self._apply_record(record)
+            return self._catch_up()
+    
+    def _model_arrays(self, model):
+        teams = list(model.team_stats)
+        team_ids = {team: i for i, team in enumerate(teams)}
+        venues = list(model.venue_stats)
+        venue_wins = np.zeros((len(venues), len(teams)), dtype=np.int32)
+        for v, venue in enumerate(venues):
+            for team, wins in model.venue_stats[venue]['teams'].items():
+                venue_wins[v, team_ids[team]] = wins
+        # Recent results, oldest first: 1 win, 0 loss, -1 empty slot
+        team_form = np.full((len(teams), FORM_WINDOW), -1, dtype=np.int8)
+        for i, team in enumerate(teams):
+            results = [1 if result == 'W' else 0 for result in model.team_form.get(team, ())]
+            team_form[i, :len(results)] = results
         
-        # Reset stats
-        self.team_stats = defaultdict(lambda: {
-            'matches_played': 0,
-            'wins': 0,
-            'total_score': 0,
-            'win_rate': 0.5
+        table = model.table()
+        arrays = {
+            'team_played': np.array([model.team_stats[t]['matches_played'] for t in teams], dtype=np.int64),
+            'team_wins': np.array([model.team_stats[t]['wins'] for t in teams], dtype=np.int64),
+            'team_total_score': np.array([model.team_stats[t]['total_score'] for t in teams], dtype=np.int64),
+            'venue_matches': np.array([model.venue_stats[v]['matches'] for v in venues], dtype=np.int64),
+            'venue_wins': venue_wins,
+            'team_form': team_form,
+            'ratings': np.array([model.ratings.get(t, ELO_BASE) for t in teams], dtype=np.float64),
+            'rating_days': np.array([model.rating_days.get(t, 0) for t in teams], dtype=np.int64),
+            'table_played': table['played'],
+            'table_probabilities': table['tensor']
+        }
+        header = {
+            'teams': teams,
+            'venues': venues,
+            'table_teams': list(table['team_ids']),
+            'table_venues': list(table['venue_ids']),
+            'toss_impact': model.toss_impact,
+            'rating_history': {team: list(points) for team, points in model.rating_history.items()},
+            'matches_trained': model.matches_trained,
+            'log_history': model.history   # matches_trained counts within this history of the log
+        }
+        return header, arrays
+    
+    def save_model(self, model):
+        """Write a snapshot as the model artifact atomically (tmp file, fsync, rename)"""
+        header, arrays = self._model_arrays(model)
+        header.update({
+            'format': MODEL_FORMAT_VERSION,
+            'version': model.version,
+            'trained_at': datetime.now().isoformat(),
+            'arrays': []
         })
-        self.venue_stats = defaultdict(lambda: {'matches': 0, 'teams': {}})
-        self.toss_impact = {'bat_first_wins': 0, 'bowl_first_wins': 0, 'total': 0}
         
-        # Process each match
-        for match in self.matches:
-            self._process_match(match)
+        # Lay the arrays out after the header, each aligned for direct mapping
+        offset = 0
+        for name, array in arrays.items():
+            header['arrays'].append({'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+            offset += -(-array.nbytes // MODEL_ALIGNMENT) * MODEL_ALIGNMENT
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = -(-(len(MODEL_MAGIC) + 4 + len(header_bytes)) // MODEL_ALIGNMENT) * MODEL_ALIGNMENT
         
-        # Calculate derived stats
-        for team, stats in self.team_stats.items():
-            if stats['matches_played'] > 0:
-                stats['win_rate'] = stats['wins'] / stats['matches_played']
-                stats['avg_score'] = stats['total_score'] / stats['matches_played']
+        tmp = MODEL_FILE + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(MODEL_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+            for spec, array in zip(header['arrays'], arrays.values()):
+                f.seek(data_start + spec['offset'])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, MODEL_FILE)
         
-        # Save trained model
-        self.save_model()
+        self.model_signature = self._artifact_signature()
+        print(f"✅ Model v{model.version} saved")
+    
+    def _artifact_signature(self):
+        try:
+            st = os.stat(MODEL_FILE)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _load_artifact(self):
+        """Map the model artifact and adopt it; returns False if there is none (or it is unusable).
         
-        # Calculate accuracy
-        accuracy = self._calculate_accuracy()
+        An unusable file (outdated, corrupt or from a newer version) is reported
+        once and remembered by its signature, so it is not retried until it changes;
+        the current snapshot stays in place.
+        """
+        signature = self._artifact_signature()
+        if signature is None:
+            return False
         
-        return {
-            'success': True,
-            'matches_trained': len(self.matches),
-            'teams_analyzed': len(self.team_stats),
-            'venues_analyzed': len(self.venue_stats),
-            'accuracy': accuracy,
-            'trained_at': datetime.now().isoformat()
-        }
+        try:
+            model = self._read_artifact()
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"⚠️ Could not load {MODEL_FILE}: {e}")
+            model = None
+        self.model_signature = signature
+        if model is None:
+            return False
+        self.model = model
+        return True
     
-    def _process_match(self, match):
-        """Process a single match for training"""
-        team1 = match['team1']
-        team2 = match['team2']
-        winner = match['winner']
-        winner_team = team1 if winner == 'team1' else team2
-        loser_team = team2 if winner == 'team1' else team1
-        
-        # Update team stats
-        self.team_stats[team1]['matches_played'] += 1
-        self.team_stats[team1]['total_score'] += match['team1Score']
+    def _read_artifact(self):
+        # Returns the artifact's snapshot, or None for an older format
+        with open(MODEL_FILE, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(MODEL_MAGIC)] != MODEL_MAGIC:
+            raise ValueError(f'{MODEL_FILE} is not a model artifact')
+        (header_length,) = struct.unpack_from('<I', mapped, len(MODEL_MAGIC))
+        header_end = len(MODEL_MAGIC) + 4 + header_length
+        header = json.loads(mapped[len(MODEL_MAGIC) + 4:header_end])
+        if header['format'] < MODEL_FORMAT_VERSION:
+            print(f"⚠️ {MODEL_FILE} is format {header['format']}, expected {MODEL_FORMAT_VERSION}")
+            return None
+        if header['format'] != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format {header['format']}")
         
-        self.team_stats[team2]['matches_played'] += 1
-        self.team_stats[team2]['total_score'] += match['team2Score']
+        data_start = -(-header_end // MODEL_ALIGNMENT) * MODEL_ALIGNMENT
+        arrays = {}
+        for spec in header['arrays']:
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            arrays[spec['name']] = np.frombuffer(mapped, dtype=dtype, count=count,
+                                                 offset=data_start + spec['offset']).reshape(spec['shape'])
         
-        self.team_stats[winner_team]['wins'] += 1
+        team_stats = {}
+        for i, team in enumerate(header['teams']):
+            stats = team_stats[team] = new_team_stats()
+            stats['matches_played'] = int(arrays['team_played'][i])
+            stats['wins'] = int(arrays['team_wins'][i])
+            stats['total_score'] = int(arrays['team_total_score'][i])
+            update_derived(stats)
+        venue_stats = {}
+        for v, venue in enumerate(header['venues']):
+            row = arrays['venue_wins'][v]
+            venue_stats[venue] = {
+                'matches': int(arrays['venue_matches'][v]),
+                'teams': {header['teams'][i]: int(row[i]) for i in np.flatnonzero(row)}
+            }
+        team_form = {}
+        for i, team in enumerate(header['teams']):
+            results = arrays['team_form'][i]
+            team_form[team] = deque(('W' if r else 'L' for r in results[results >= 0].tolist()),
+                                    maxlen=FORM_WINDOW)
+        ratings = {team: float(arrays['ratings'][i]) for i, team in enumerate(header['teams'])}
+        rating_days = {team: int(arrays['rating_days'][i]) for i, team in enumerate(header['teams'])}
+        rating_history = {team: deque(points, maxlen=ELO_HISTORY_LIMIT)
+                          for team, points in header['rating_history'].items()}
         
-        # Update venue stats
-        venue = match.get('venue', 'unknown')
-        self.venue_stats[venue]['matches'] += 1
+        table = {
+            'team_ids': {team: i for i, team in enumerate(header['table_teams'])},
+            'venue_ids': {venue: v for v, venue in enumerate(header['table_venues'])},
+            'played': arrays['table_played'],
+            'tensor': arrays['table_probabilities']
+        }
+        return ModelSnapshot(team_stats, venue_stats, header['toss_impact'],
+                             header['matches_trained'], header['version'], table,
+                             team_form=team_form, ratings=ratings, rating_days=rating_days,
+                             rating_history=rating_history,
+                             history=header.get('log_history', self.history))   # absent before the key existed
+    
+    def maybe_reload(self):
+        """Follow other workers' matches and swap in an artifact one of them saved.
         
-        if winner_team not in self.venue_stats[venue]['teams']:
-            self.venue_stats[venue]['teams'][winner_team] = 0
-        self.venue_stats[venue]['teams'][winner_team] += 1
+        At most once a second: a read of the match log's tail and a stat call.
+        """
+        now = time.monotonic()
+        if now - self.reload_checked_at < MODEL_RELOAD_INTERVAL:
+            return False
+        self.reload_checked_at = now
+        self.sync_log()
+        if self._artifact_signature() == self.model_signature:
+            return False
         
-        # Update toss impact
-        if match.get('tossWinner') and match.get('tossDecision'):
-            self.toss_impact['total'] += 1
-            toss_winner = team1 if match['tossWinner'] == 'team1' else team2
+        with self.lock:
+            if self._artifact_signature() in (self.model_signature, None):
+                return False
+            if not self._load_artifact():
+                return False
+            # The saving worker may have trained on matches not yet tailed here
+            for record in self.match_log.tail():
+                self._apply_record(record)
+            self._catch_up()
+        print(f"🔄 Reloaded model v{self.model.version}")
+        return True
+    
+    def add_match(self, match_data):
+        """Add new match data (and learn from it straight away in online mode)"""
+        validate_match(match_data)
+        # Encoded before the log write, so a match the columns cannot hold is never logged
+        row = MatchColumns.encode(match_data)
+        with self.lock:
+            # Matches other workers logged first come first, as in the log
+            for record in self.match_log.append(match_data):
+                self._apply_record(record)
+            self._apply_record(match_data, row)
             
-            if toss_winner == winner_team:
-                if match['tossDecision'] == 'bat':
-                    self.toss_impact['bat_first_wins'] += 1
-                else:
-                    self.toss_impact['bowl_first_wins'] += 1
-    
-    def _calculate_accuracy(self):
-        """Calculate model accuracy on training data"""
-        if len(self.matches) < 10:
-            return 65  # Base accuracy
-        
-        correct = 0
-        for match in self.matches:
-            prediction = self.predict_match(match['team1'], match['team2'])
-            actual_winner = match['team1'] if match['winner'] == 'team1' else match['team2']
+            # Before the first full training there is no model to update
+            self._catch_up()
+            learned = self.model.history == self.history and self.model.matches_trained == len(self.matches)
             
-            if prediction['predicted_winner'] == actual_winner:
-                correct += 1
-        
-        accuracy = (correct / len(self.matches)) * 100
-        return round(accuracy, 2)
+            return {'success': True, 'total_matches': len(self.matches), 'learned': learned}
     
-    def predict_match(self, team1, team2, venue=None):
-        """Predict match winner using trained model"""
-        team1_stats = self.team_stats[team1]
-        team2_stats = self.team_stats[team2]
-        
-        # Base probability from win rate
-        team1_prob = team1_stats['win_rate'] * 100
-        team2_prob = team2_stats['win_rate'] * 100
-        
-        # Adjust for venue if provided
-        if venue and venue in self.venue_stats:
-            venue_data = self.venue_stats[venue]
-            if team1 in venue_data['teams']:
-                venue_wins = venue_data['teams'][team1]
-                venue_advantage = (venue_wins / venue_data['matches']) * 10
-                team1_prob += venue_advantage
-        
-        # Normalize probabilities
-        total = team1_prob + team2_prob
-        if total > 0:
-            team1_prob = (team1_prob / total) * 100
-            team2_prob = (team2_prob / total) * 100
-        else:
-            team1_prob = team2_prob = 50
+    def replace_matches(self, matches):
+        """Replace the stored match history (the model is stale until the next train)"""
+        for match in matches:
+            validate_match(match)
+        columns = MatchColumns.from_matches(matches)
+        with self.lock:
+            # Whatever other workers logged before the reset is superseded by it
+            self.history = self.match_log.reset(matches)
+            self.matches = list(matches)
+            self.columns = columns
+    
+    def train(self, progress=None):
+        """Train model on historical data.
+        
+        The new snapshot (aggregates and probability table) is built without
+        the lock, on the first n rows of the columnar history, while requests
+        keep predicting from the old one and add_match keeps working. It is
+        published under the lock with one reference swap, after catching up
+        on any matches added during the run.
+        """
+        progress = progress or (lambda stage, fraction: None)
+        self.sync_log()
+        with self.lock:
+            columns, n, version, history = self.columns, len(self.columns), self.model.version, self.history
+        if n < 5:
+            return {
+                'success': False,
+                'error': 'Need at least 5 matches to train',
+                'current_matches': n
+            }
+        
+        print(f"🔄 Training on {n} matches...")
+        progress('aggregating', 0.05)
+        model = build_model(columns, n, version=version + 1, history=history)
+        model.table()
+        
+        progress('publishing', 0.4)
+        with self.lock:
+            if self.columns is not columns:
+                return {'success': False, 'error': 'Match history was replaced during training'}
+            for match in self.matches[n:]:
+                model = model.with_match(match)
+            self.model = model
+            
+            # Save trained model
+            progress('saving', 0.5)
+            self.save_model(model)
+        
+        # Evaluate on time-ordered holdouts (None until there are enough matches)
+        progress('evaluating', 0.6)
+        evaluation = evaluate_walk_forward(columns, size=n,
+                                           progress=lambda fraction: progress('evaluating', 0.6 + 0.4 * fraction))
         
         return {
-            'team1': team1,
-            'team2': team2,
-            'team1_probability': round(team1_prob, 2),
-            'team2_probability': round(team2_prob, 2),
-            'predicted_winner': team1 if team1_prob > team2_prob else team2,
-            'confidence': round(abs(team1_prob - team2_prob), 2),
-            'based_on_matches': team1_stats['matches_played'] + team2_stats['matches_played']
+            'success': True,
+            'matches_trained': n,
+            'teams_analyzed': len(model.team_stats),
+            'venues_analyzed': len(model.venue_stats),
+            'accuracy': evaluation['accuracy'] if evaluation else None,
+            'evaluation': evaluation,
+            'trained_at': datetime.now().isoformat()
         }
     
-    def get_team_insights(self, team):
-        """Get detailed team insights"""
-        stats = self.team_stats[team]
+    def predict_many(self, fixtures):
+        """Predict a list of (team1, team2, venue) fixtures with array lookups"""
+        table = self.model.table()
+        unknown_team, unknown_venue = len(table['team_ids']), len(table['venue_ids'])
+        team1 = np.array([table['team_ids'].get(f[0], unknown_team) for f in fixtures], dtype=np.intp)
+        team2 = np.array([table['team_ids'].get(f[1], unknown_team) for f in fixtures], dtype=np.intp)
+        venue = np.array([table['venue_ids'].get(f[2], unknown_venue) if f[2] else unknown_venue
+                          for f in fixtures], dtype=np.intp)
         
-        # Find best venues
-        best_venues = []
-        for venue, data in self.venue_stats.items():
-            if team in data['teams']:
-                wins = data['teams'][team]
-                venue_matches = data['matches']
-                win_rate = (wins / venue_matches) * 100
-                best_venues.append({'venue': venue, 'win_rate': win_rate, 'wins': wins})
+        probabilities = table['tensor'][team1, team2, venue] * 100
+        based_on = table['played'][team1] + table['played'][team2]
         
-        best_venues.sort(key=lambda x: x['win_rate'], reverse=True)
+        predictions = []
+        for (name1, name2, _), team1_prob, matches in zip(fixtures, probabilities.tolist(), based_on.tolist()):
+            team2_prob = 100 - team1_prob
+            predictions.append({
+                'team1': name1,
+                'team2': name2,
+                'team1_probability': round(team1_prob, 2),
+                'team2_probability': round(team2_prob, 2),
+                'predicted_winner': name1 if team1_prob > team2_prob else name2,
+                'confidence': round(abs(team1_prob - team2_prob), 2),
+                'based_on_matches': matches
+            })
+        return predictions
+    
+    def predict_match(self, team1, team2, venue=None):
+        """Predict match winner using trained model"""
+        return self.predict_many([(team1, team2, venue)])[0]
+    
+    def get_team_insights(self, team):
+        """Get detailed team insights"""
+        model = self.model
+        stats = model.team_stats.get(team) or new_team_stats()
         
         return {
             'team': team,
@@ -230,40 +1404,264 @@ class AdvancedCricketPredictor:
             'wins': stats['wins'],
             'win_rate': round(stats['win_rate'] * 100, 2),
             'avg_score': round(stats.get('avg_score', 0), 2),
-            'best_venues': best_venues[:3],
-            'form': self._get_team_form(team)
+            'best_venues': model.best_venues(team),
+            'form': model.form(team),
+            'recent_results': list(model.team_form.get(team, ())),
+            'rating': round(model.rating(team, model.latest_day), 1)
         }
     
-    def _get_team_form(self, team):
-        """Get recent form (last 5 matches)"""
-        recent_matches = [m for m in self.matches[-10:] 
-                         if m['team1'] == team or m['team2'] == team]
+    def get_ratings(self):
+        """Current Elo ratings (idle teams decayed, as predictions use them), strongest first"""
+        model = self.model
+        day = model.latest_day
+        ratings = [{
+            'team': team,
+            'rating': round(model.rating(team, day), 1),
+            'matches_played': model.team_stats[team]['matches_played']
+        } for team in model.ratings]
+        ratings.sort(key=lambda x: x['rating'], reverse=True)
+        return ratings
+    
+    def get_rating_history(self, team):
+        """Season-end refits from the last training, then one point per match learned since"""
+        model = self.model
+        if team not in model.ratings:
+            return None
+        return {
+            'team': team,
+            'rating': round(model.rating(team, model.latest_day), 1),
+            'history': [{'date': date, 'rating': rating} for date, rating in model.rating_history.get(team, ())]
+        }
+
+# Initialize predictor
+predictor = AdvancedCricketPredictor()
+
+# ==========================================
+# BACKGROUND TRAINING JOBS
+# ==========================================
+
+TRAIN_JOB_HISTORY = 20   # finished jobs kept for status polling
+
+class TrainingJobs:
+    """Runs predictor.train() on a worker thread, one job at a time"""
+    
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.jobs = OrderedDict()
+        self.active = None
+        self.lock = threading.Lock()
+    
+    def start(self, matches=None):
+        """Queue a training run; returns (job, None) or (None, running job).
         
-        if len(recent_matches) < 3:
-            return 'Insufficient data'
+        Supplied matches are validated here but loaded on the job thread.
+        """
+        for match in matches or ():
+            validate_match(match)
+        with self.lock:
+            if self.active is not None:
+                return None, self.jobs[self.active]
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'status': 'queued',
+                'stage': None,
+                'progress': 0.0,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'seconds': None,
+                'stage_seconds': {},
+                'result': None,
+                'error': None
+            }
+            self.jobs[job['id']] = job
+            self.active = job['id']
+            while len(self.jobs) > TRAIN_JOB_HISTORY:
+                self.jobs.popitem(last=False)
         
-        recent_wins = sum(1 for m in recent_matches[-5:] 
-                         if (m['team1'] == team and m['winner'] == 'team1') or 
-                            (m['team2'] == team and m['winner'] == 'team2'))
+        threading.Thread(target=self._run, args=(job, matches), daemon=True).start()
+        return job, None
+    
+    def _run(self, job, matches=None):
+        started = time.perf_counter()
+        stage_started = [started]
         
-        win_rate = (recent_wins / min(5, len(recent_matches))) * 100
+        def progress(stage, fraction):
+            now = time.perf_counter()
+            with self.lock:
+                if job['stage'] and job['stage'] != stage:
+                    job['stage_seconds'][job['stage']] = round(now - stage_started[0], 4)
+                    stage_started[0] = now
+                job['stage'] = stage
+                job['progress'] = round(fraction, 3)
         
-        if win_rate >= 60:
-            return 'Excellent'
-        elif win_rate >= 40:
-            return 'Good'
-        else:
-            return 'Poor'
+        job['status'] = 'running'
+        job['started_at'] = datetime.now().isoformat()
+        try:
+            if matches:
+                progress('loading', 0.0)
+                self.predictor.replace_matches(matches)
+            result = self.predictor.train(progress=progress)
+            progress('done', 1.0)
+            job['result'] = result
+            job['status'] = 'succeeded' if result.get('success') else 'failed'
+            job['error'] = result.get('error')
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+            job['seconds'] = round(time.perf_counter() - started, 4)
+            with self.lock:
+                self.active = None
+    
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job, stage_seconds=dict(job['stage_seconds'])) if job else None
 
-# Initialize predictor
-predictor = AdvancedCricketPredictor()
+training_jobs = TrainingJobs(predictor)
+
+# ==========================================
+# SEASON SIMULATOR
+# ==========================================
+
+SEASON_SIMULATIONS = 100_000         # default Monte Carlo runs
+SEASON_SIMULATION_LIMIT = 1_000_000
+SEASON_SIMULATION_CHUNK = 25_000     # runs drawn at once; bounds memory at chunk x fixtures
+POINTS_PER_WIN = 2
+PLAYOFF_KEYWORDS = ('playoff', 'qualif', 'top 4', 'top four', 'top 2', 'title', 'champion')
+
+# The scores API (app.py) supplies the live points table and remaining fixtures
+SCORES_API_URL = os.environ.get('SCORES_API_URL', 'http://localhost:5000')
+SCORES_API_TIMEOUT = 3
+
+def parse_standings(table):
+    """Points-table rows (as served by app.py's /api/points-table) -> (teams, points, nrr)"""
+    if not isinstance(table, list) or len(table) < 4:
+        raise ValueError('table must list at least 4 teams')
+    teams, points, nrr = [], [], []
+    for row in table:
+        if not isinstance(row, dict) or not row.get('team'):
+            raise ValueError('Each table row needs a team')
+        if row['team'] in teams:
+            raise ValueError(f"{row['team']} appears twice in the table")
+        try:
+            points.append(int(row.get('points', 0)))
+            nrr.append(float(row.get('nrr') or 0))
+        except (TypeError, ValueError):
+            raise ValueError(f"Bad points or nrr for {row['team']}")
+        teams.append(row['team'])
+    return teams, np.array(points, dtype=np.float32), np.array(nrr)
+
+def fetch_season_state():
+    """(points table, remaining fixtures) from the scores API"""
+    table = requests.get(f'{SCORES_API_URL}/api/points-table', timeout=SCORES_API_TIMEOUT)
+    upcoming = requests.get(f'{SCORES_API_URL}/api/upcoming-matches', timeout=SCORES_API_TIMEOUT)
+    table.raise_for_status()
+    upcoming.raise_for_status()
+    try:
+        return table.json()['data'], upcoming.json()['data']
+    except (KeyError, TypeError) as e:
+        # Reported like any other upstream failure (a 502, or a chat reply)
+        raise requests.RequestException(f'unexpected response from the scores API: {e!r}')
+
+def simulate_season(model, table, fixtures, simulations=SEASON_SIMULATIONS, seed=None):
+    """Play out the remaining fixtures `simulations` times from the current table.
+    
+    Each fixture is a draw against the model's win probability, so a batch
+    of runs is one (runs x fixtures) matrix of uniforms, and final points
+    are two matrix products with the fixtures' one-hot team columns. Ties
+    on points go to the better current net run rate, then by lot. The top
+    four play the IPL bracket (Qualifier 1, Eliminator, Qualifier 2, Final)
+    at neutral venues.
+    """
+    started = time.perf_counter()
+    teams, points, nrr = parse_standings(table)
+    ids = {team: i for i, team in enumerate(teams)}
+    if isinstance(simulations, bool) or not isinstance(simulations, int) \
+            or not 1 <= simulations <= SEASON_SIMULATION_LIMIT:
+        raise ValueError(f'simulations must be 1-{SEASON_SIMULATION_LIMIT}')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise ValueError('seed must be a non-negative integer')
+    if not isinstance(fixtures, list):
+        raise ValueError('fixtures must be a list')
+    for fixture in fixtures:
+        if not isinstance(fixture, dict) or fixture.get('team1') not in ids or fixture.get('team2') not in ids:
+            raise ValueError('Each fixture needs team1 and team2 from the table')
+        if fixture['team1'] == fixture['team2']:
+            raise ValueError('A team cannot play itself')
+    
+    # Fixture and neutral-venue head-to-head probabilities from the model's table
+    lookup = model.table()
+    unknown_team, unknown_venue = len(lookup['team_ids']), len(lookup['venue_ids'])
+    model_ids = np.array([lookup['team_ids'].get(team, unknown_team) for team in teams], dtype=np.intp)
+    team1 = np.array([ids[f['team1']] for f in fixtures], dtype=np.intp)
+    team2 = np.array([ids[f['team2']] for f in fixtures], dtype=np.intp)
+    venue = np.array([lookup['venue_ids'].get(f.get('venue'), unknown_venue) for f in fixtures], dtype=np.intp)
+    p_team1 = lookup['tensor'][model_ids[team1], model_ids[team2], venue].astype(np.float32)
+    beats = lookup['tensor'][model_ids[:, None], model_ids[None, :], unknown_venue]
+    
+    n_teams, n_fixtures = len(teams), len(fixtures)
+    team1_points = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    team1_points[np.arange(n_fixtures), team1] = POINTS_PER_WIN
+    team2_points = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    team2_points[np.arange(n_fixtures), team2] = POINTS_PER_WIN
+    # Dense NRR rank (equal NRRs share a rank) sits between whole points
+    nrr_rank = np.unique(nrr, return_inverse=True)[1].reshape(-1)
+    
+    rng = np.random.default_rng(seed)
+    total_points = np.zeros(n_teams)
+    top4, top2, titles = (np.zeros(n_teams, dtype=np.int64) for _ in range(3))
+    for done in range(0, simulations, SEASON_SIMULATION_CHUNK):
+        runs = min(SEASON_SIMULATION_CHUNK, simulations - done)
+        won = (rng.random((runs, n_fixtures), dtype=np.float32) < p_team1).astype(np.float32)
+        final = points + won @ team1_points + (1 - won) @ team2_points
+        total_points += final.sum(axis=0)
+        
+        standing = final * (n_teams + 1) + nrr_rank + rng.random((runs, n_teams), dtype=np.float32)
+        order = np.argsort(-standing, axis=1)
+        top4 += np.bincount(order[:, :4].ravel(), minlength=n_teams)
+        top2 += np.bincount(order[:, :2].ravel(), minlength=n_teams)
+        
+        def play(a, b):
+            return np.where(rng.random(runs) < beats[a, b], a, b)
+        first, second, third, fourth = order[:, 0], order[:, 1], order[:, 2], order[:, 3]
+        qualifier1 = play(first, second)
+        eliminator = play(third, fourth)
+        qualifier2 = play(first + second - qualifier1, eliminator)
+        titles += np.bincount(play(qualifier1, qualifier2), minlength=n_teams)
+    
+    top4, top2, titles = top4.tolist(), top2.tolist(), titles.tolist()
+    results = [{
+        'team': team,
+        'points': int(points[i]),
+        'expected_points': round(float(total_points[i]) / simulations, 2),
+        'top4_probability': round(top4[i] / simulations * 100, 2),
+        'top2_probability': round(top2[i] / simulations * 100, 2),
+        'title_probability': round(titles[i] / simulations * 100, 2)
+    } for i, team in enumerate(teams)]
+    results.sort(key=lambda x: (x['top4_probability'], x['expected_points']), reverse=True)
+    
+    return {
+        'simulations': simulations,
+        'fixtures_remaining': n_fixtures,
+        'teams': results,
+        'model_version': model.version,
+        'seconds': round(time.perf_counter() - started, 4)
+    }
 
 # ==========================================
 # API ENDPOINTS
 # ==========================================
 
+@app.before_request
+def reload_model():
+    predictor.maybe_reload()
+
 @app.route('/')
 def index():
+    model = predictor.model
     return jsonify({
         'message': 'IPL Cricket Hub - Enhanced AI/ML API',
         'version': '2.0.0',
@@ -278,8 +1676,8 @@ def index():
         ],
         'stats': {
             'total_matches': len(predictor.matches),
-            'teams_tracked': len(predictor.team_stats),
-            'venues_tracked': len(predictor.venue_stats)
+            'teams_tracked': len(model.team_stats),
+            'venues_tracked': len(model.venue_stats)
         }
     })
 
@@ -290,25 +1688,45 @@ def add_match():
         match_data = request.json
         result = predictor.add_match(match_data)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/train', methods=['POST'])
 def train_model():
-    """Train model on historical data"""
+    """Start a background training run on the stored (or supplied) matches"""
     try:
         # Get matches from request or use stored
-        data = request.json
-        if 'matches' in data and len(data['matches']) > 0:
-            predictor.matches = data['matches']
-            with open(DATA_FILE, 'w') as f:
-                json.dump(predictor.matches, f)
+        data = request.get_json(silent=True) or {}
+        job, running = training_jobs.start(data.get('matches'))
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': 'A training run is already in progress',
+                'job_id': running['id'],
+                'status_url': f"/api/train/{running['id']}"
+            }), 409
         
-        result = predictor.train()
-        return jsonify(result)
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': f"/api/train/{job['id']}"
+        }), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/train/<job_id>', methods=['GET'])
+def train_status(job_id):
+    """Progress, timings and (when finished) the result of a training run"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Training job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
 @app.route('/api/predict', methods=['POST'])
 def predict_match():
     """Predict match with trained model"""
@@ -323,6 +1741,27 @@ def predict_match():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Predict a whole slate of fixtures in one request"""
+    try:
+        data = request.json or {}
+        fixtures = data.get('fixtures')
+        if not isinstance(fixtures, list) or not fixtures:
+            return jsonify({'success': False, 'error': 'fixtures must be a non-empty list'}), 400
+        if len(fixtures) > BATCH_PREDICT_LIMIT:
+            return jsonify({'success': False, 'error': f'At most {BATCH_PREDICT_LIMIT} fixtures per request'}), 400
+        
+        slate = []
+        for fixture in fixtures:
+            if not isinstance(fixture, dict) or not fixture.get('team1') or not fixture.get('team2'):
+                return jsonify({'success': False, 'error': 'Each fixture needs team1 and team2'}), 400
+            slate.append((fixture['team1'], fixture['team2'], fixture.get('venue')))
+        
+        return jsonify({'success': True, 'predictions': predictor.predict_many(slate)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/team-insights/<team>', methods=['GET'])
 def team_insights(team):
     """Get team insights"""
@@ -332,18 +1771,64 @@ def team_insights(team):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/ratings', methods=['GET'])
+def ratings():
+    """Team ratings behind the predictions"""
+    try:
+        return jsonify({
+            'success': True,
+            'ratings': predictor.get_ratings(),
+            'home_advantage': ELO_HOME_ADVANTAGE,
+            'k_factor': ELO_K
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/ratings/<team>/history', methods=['GET'])
+def rating_history(team):
+    """How a team's rating has moved"""
+    try:
+        history = predictor.get_rating_history(team)
+        if history is None:
+            return jsonify({'success': False, 'error': f'No rating for {team}'}), 404
+        return jsonify({'success': True, **history})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/simulate-season', methods=['POST'])
+def simulate_season_route():
+    """Top-4, top-2 and title chances from Monte Carlo runs of the rest of the season"""
+    try:
+        data = request.get_json(silent=True) or {}
+        table, fixtures = data.get('table'), data.get('fixtures')
+        if table is None or fixtures is None:
+            live_table, live_fixtures = fetch_season_state()
+            table = live_table if table is None else table
+            fixtures = live_fixtures if fixtures is None else fixtures
+        
+        result = simulate_season(predictor.model, table, fixtures,
+                                 simulations=data.get('simulations', SEASON_SIMULATIONS), seed=data.get('seed'))
+        return jsonify({'success': True, **result})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except requests.RequestException as e:
+        return jsonify({'success': False, 'error': f'Scores API unavailable: {e}'}), 502
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get overall statistics"""
     try:
+        model = predictor.model
         return jsonify({
             'success': True,
             'stats': {
                 'total_matches': len(predictor.matches),
-                'teams': len(predictor.team_stats),
-                'venues': len(predictor.venue_stats),
-                'toss_impact': predictor.toss_impact,
-                'team_stats': dict(predictor.team_stats)
+                'teams': len(model.team_stats),
+                'venues': len(model.venue_stats),
+                'toss_impact': model.toss_impact,
+                'team_stats': model.team_stats
             }
         })
     except Exception as e:
@@ -355,11 +1840,42 @@ def chat():
     try:
         data = request.json
         message = data.get('message', '').lower()
+        teams = [t for t in ['MI', 'CSK', 'RCB', 'KKR', 'DC', 'SRH', 'RR', 'PBKS', 'GT', 'LSG']
+                if t.lower() in message]
+        
+        # Check for playoff chances query
+        if any(keyword in message for keyword in PLAYOFF_KEYWORDS):
+            try:
+                table, fixtures = data.get('table'), data.get('fixtures')
+                if table is None or fixtures is None:
+                    table, fixtures = fetch_season_state()
+                simulation = simulate_season(predictor.model, table, fixtures)
+            except (ValueError, requests.RequestException):
+                return jsonify({
+                    'success': True,
+                    'response': "I couldn't load the current points table and fixtures to simulate the season. Please try again shortly."
+                })
+            
+            rows = [row for row in simulation['teams'] if row['team'] in teams] or simulation['teams']
+            lines = '\n'.join(f"• {row['team']}: Top 4 **{row['top4_probability']}%** | Top 2 {row['top2_probability']}% | "
+                              f"Title {row['title_probability']}% | Expected points {row['expected_points']}"
+                              for row in rows)
+            response = f"""🎲 **Playoff Chances**
+
+Simulated the remaining {simulation['fixtures_remaining']} matches {simulation['simulations']:,} times:
+
+{lines}
+
+✨ Every match is played out with the trained model's win probabilities!"""
+            
+            return jsonify({
+                'success': True,
+                'response': response,
+                'simulation': simulation
+            })
         
         # Check for prediction query
         if 'predict' in message:
-            teams = [t for t in ['MI', 'CSK', 'RCB', 'KKR', 'DC', 'SRH', 'RR', 'PBKS', 'GT', 'LSG']
-                    if t.lower() in message]
             
             if len(teams) >= 2:
                 prediction = predictor.predict_match(teams[0], teams[1])
@@ -393,10 +1909,13 @@ def chat():
 
 @app.route('/health')
 def health():
+    model = predictor.model
     return jsonify({
         'status': 'healthy',
-        'model_loaded': len(predictor.team_stats) > 0,
+        'model_loaded': len(model.team_stats) > 0,
+        'model_version': model.version,
         'matches_available': len(predictor.matches),
+        'training_job': training_jobs.active,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -407,7 +1926,7 @@ def health():
 if __name__ == '__main__':
     print("🤖 IPL Enhanced AI with ML Training Starting...")
     print(f"📊 Loaded {len(predictor.matches)} historical matches")
-    print(f"📈 {len(predictor.team_stats)} teams in database")
+    print(f"📈 {len(predictor.model.team_stats)} teams in database")
     print("🚀 Server running on http://localhost:5001")
     print("="*50)
     print("Admin can add matches at: /admin-ml-training.html")
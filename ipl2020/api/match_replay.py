@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+IPL Cricket Hub - Match Replay Load Test
+Replays a recorded ball-by-ball match into a running app.py at 1x-1000x speed
+while simulated clients watch it through the live-score endpoints, then
+reports ball-ingested-to-client-observed latency and server resource usage.
+
+Recording format: NDJSON, one ball event per line in the shape accepted by
+POST /api/matches/<id>/balls. An optional first line {"match": {...}} gives the
+fixture, and an optional "at" field on each ball gives its offset in seconds
+from the first ball (otherwise balls are BALL_SECONDS apart). The JSON saved
+from GET /api/matches/<id>/balls is accepted as well.
+
+Usage:
+    python match_replay.py recording.ndjson --speed 100 --clients 200
+    python match_replay.py --synthetic --speed 1000 --mix poll,stream
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BALL_SECONDS = 40          # real-time gap between deliveries (~85 minute innings)
+CLIENT_KINDS = ('poll', 'match', 'changes', 'stream')
+RESOURCE_SAMPLE_INTERVAL = 1.0
+DEFAULT_FIXTURE = {"team1": "MI", "team2": "CSK", "venue": "Wankhede Stadium, Mumbai", "time": "7:30 PM"}
+
+def load_recording(path):
+    """Return (fixture, balls) from an NDJSON recording or a saved /balls response"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+
+    fixture = {}
+    try:
+        document = json.loads(text)
+    except ValueError:
+        document = None   # more than one line of JSON: NDJSON
+    if isinstance(document, dict) and isinstance(document.get('data', document.get('balls')), list):
+        fixture = document.get('match', {})
+        balls = document.get('data', document.get('balls'))
+    else:
+        balls = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'match' in record:
+                fixture = record['match']
+            else:
+                balls.append(record)
+
+    for number, ball in enumerate(balls):
+        ball.setdefault('at', number * BALL_SECONDS)
+    return fixture, balls
+
+def synthetic_recording(seed=38):
+    """A plausible two-innings T20 match for when no recording is at hand"""
+    rng = random.Random(seed)
+    balls = []
+    target = None
+    for innings in (1, 2):
+        runs = wickets = legal = 0
+        while legal < 120 and wickets < 10 and (target is None or runs < target):
+            roll = rng.random()
+            if roll < 0.04:
+                ball = {'runs': 0, 'extras': 1, 'extra_type': 'wide'}
+            elif roll < 0.09:
+                ball = {'runs': 0, 'wicket': True, 'dismissal': rng.choice(('bowled', 'caught', 'lbw'))}
+            else:
+                ball = {'runs': rng.choice((0, 0, 0, 1, 1, 1, 1, 2, 3, 4, 4, 6))}
+            ball['batter'] = f"Batter {innings}.{wickets + 1}"
+            ball['bowler'] = f"Bowler {innings}.{legal // 6 % 5 + 1}"
+            ball['at'] = len(balls) * BALL_SECONDS
+            balls.append(ball)
+
+            runs += ball['runs'] + ball.get('extras', 0)
+            wickets += bool(ball.get('wicket'))
+            legal += ball.get('extra_type') != 'wide'
+        target = runs + 1
+    return {}, balls
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+class Replay:
+    """Feeds one recording into the server and tracks when each ball was sent"""
+
+    def __init__(self, base_url, fixture, balls, speed):
+        self.base_url = base_url.rstrip('/')
+        self.fixture = fixture
+        self.balls = balls
+        self.speed = speed
+        self.match_id = None
+        self.ingested = {}          # ball seq -> perf_counter() when the POST went out
+        self.post_latency = []
+        self.errors = 0
+        self.done = threading.Event()
+
+    def start_match(self):
+        fixture = dict(DEFAULT_FIXTURE, date=datetime.now().strftime("%Y-%m-%d"))
+        fixture.update({k: v for k, v in self.fixture.items() if k in ('team1', 'team2', 'venue', 'date', 'time')})
+        first_day = datetime.strptime(fixture['date'], "%Y-%m-%d")
+        # Repeat runs (or the server's own mock data) may already be scoring this
+        # pairing on that day, so move to the next free date
+        for offset in range(366):
+            fixture['date'] = (first_day + timedelta(days=offset)).strftime("%Y-%m-%d")
+            response = requests.post(f"{self.base_url}/api/matches", json=fixture, timeout=10)
+            if response.status_code == 201:
+                self.match_id = response.json()['data']['id']
+                return self.match_id
+            if 'already being scored' not in response.text:
+                break
+        sys.exit(f"Could not start match: {response.status_code} {response.text}")
+
+    def run(self):
+        session = requests.Session()
+        url = f"{self.base_url}/api/matches/{self.match_id}/balls"
+        start = time.perf_counter()
+        try:
+            for seq, ball in enumerate(self.balls, start=1):
+                delay = start + ball['at'] / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+                event = {k: v for k, v in ball.items() if k not in ('at', 'seq', 'innings', 'over')}
+                sent = time.perf_counter()
+                self.ingested[seq] = sent
+                response = session.post(url, json=event, timeout=10)
+                self.post_latency.append(time.perf_counter() - sent)
+                if response.status_code != 201:
+                    self.errors += 1
+                    if 'already complete' in response.text:
+                        break
+        finally:
+            self.done.set()
+            session.close()
+
+class Client(threading.Thread):
+    """One simulated viewer; records when it first sees each ball"""
+
+    def __init__(self, kind, replay, poll_interval):
+        super().__init__(daemon=True)
+        self.kind = kind
+        self.replay = replay
+        self.poll_interval = poll_interval
+        self.observed = {}           # ball seq -> perf_counter() when first seen
+        self.requests = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+    def see(self, match):
+        last_ball = (match or {}).get('last_ball')
+        if last_ball and last_ball.get('seq') not in self.observed:
+            self.observed[last_ball['seq']] = time.perf_counter()
+
+    def run(self):
+        try:
+            if self.kind == 'stream':
+                self.watch_stream()
+            else:
+                self.poll()
+        finally:
+            self.session.close()
+
+    def poll(self):
+        base = self.replay.base_url
+        match_id = self.replay.match_id
+        etag = None
+        version = -1
+        # Stagger clients so they don't poll in lockstep
+        time.sleep(random.uniform(0, self.poll_interval))
+        while not self.replay.done.is_set():
+            try:
+                self.requests += 1
+                if self.kind == 'poll':
+                    headers = {'If-None-Match': etag} if etag else {}
+                    response = self.session.get(f"{base}/api/live-scores", headers=headers, timeout=10)
+                    if response.status_code == 304:
+                        self.not_modified += 1
+                    else:
+                        etag = response.headers.get('ETag')
+                        for match in response.json()['data']:
+                            if match['id'] == match_id:
+                                self.see(match)
+                elif self.kind == 'match':
+                    self.see(self.session.get(f"{base}/api/matches/{match_id}", timeout=10).json()['data'])
+                else:
+                    body = self.session.get(f"{base}/api/live-scores/changes", params={'since': version}, timeout=10).json()
+                    version = body['version']
+                    if body['full']:
+                        for match in body['data']:
+                            if match['id'] == match_id:
+                                self.see(match)
+                    else:
+                        for change in body['data']:
+                            if change.get('id') == match_id:
+                                self.see(change)
+            except (requests.RequestException, ValueError, KeyError):
+                self.errors += 1
+            time.sleep(self.poll_interval)
+
+    def watch_stream(self):
+        url = f"{self.replay.base_url}/api/live-scores/stream"
+        try:
+            self.requests += 1
+            with self.session.get(url, params={'match': self.replay.match_id}, stream=True, timeout=(10, 30)) as response:
+                for line in response.iter_lines(decode_unicode=True):
+                    if self.replay.done.is_set() and self.caught_up():
+                        return
+                    if not line or not line.startswith('data: '):
+                        continue
+                    data = json.loads(line[6:])
+                    if isinstance(data.get('data'), list):
+                        for match in data['data']:
+                            self.see(match)
+                    else:
+                        self.see(data)
+        except (requests.RequestException, ValueError):
+            self.errors += 1
+
+    def caught_up(self):
+        return len(self.replay.ingested) in self.observed
+
+class ResourceSampler(threading.Thread):
+    """Samples the server's /health process counters while the replay runs"""
+
+    def __init__(self, base_url, stop):
+        super().__init__(daemon=True)
+        self.url = base_url.rstrip('/') + '/health'
+        self.stop = stop
+        self.samples = []
+
+    def sample(self):
+        try:
+            process = requests.get(self.url, timeout=5).json().get('process')
+        except (requests.RequestException, ValueError):
+            return
+        if process:
+            self.samples.append((time.perf_counter(), process))
+
+    def run(self):
+        self.sample()
+        while not self.stop.wait(RESOURCE_SAMPLE_INTERVAL):
+            self.sample()
+        self.sample()
+
+    def summary(self):
+        if len(self.samples) < 2:
+            return None
+        (t0, first), (t1, last) = self.samples[0], self.samples[-1]
+        cpu = (last['cpu_user'] + last['cpu_system']) - (first['cpu_user'] + first['cpu_system'])
+        busiest = 0.0
+        for (ta, a), (tb, b) in zip(self.samples, self.samples[1:]):
+            used = (b['cpu_user'] + b['cpu_system']) - (a['cpu_user'] + a['cpu_system'])
+            busiest = max(busiest, used / (tb - ta) if tb > ta else 0.0)
+        return {
+            'pid': last['pid'],
+            'cpu_seconds': round(cpu, 3),
+            'cpu_percent_avg': round(100 * cpu / (t1 - t0), 1),
+            'cpu_percent_peak': round(100 * busiest, 1),
+            'max_rss_kb': max(p['max_rss_kb'] for _, p in self.samples),
+            'threads_peak': max(p['threads'] for _, p in self.samples),
+            'stream_subscribers_peak': max(p['stream_subscribers'] for _, p in self.samples)
+        }
+
+def latency_summary(samples):
+    if not samples:
+        return {'observed': 0}
+    return {
+        'observed': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 1),
+        'p95_ms': round(percentile(samples, 95) * 1000, 1),
+        'p99_ms': round(percentile(samples, 99) * 1000, 1),
+        'max_ms': round(max(samples) * 1000, 1)
+    }
+
+def run_replay(base_url, fixture, balls, speed, clients, mix, poll_interval, drain):
+    replay = Replay(base_url, fixture, balls, speed)
+    replay.start_match()
+
+    stop_sampling = threading.Event()
+    sampler = ResourceSampler(base_url, stop_sampling)
+    sampler.start()
+
+    watchers = [Client(mix[i % len(mix)], replay, poll_interval) for i in range(clients)]
+    for watcher in watchers:
+        watcher.start()
+    time.sleep(min(1.0, poll_interval))   # let stream clients connect before the first ball
+
+    started = time.perf_counter()
+    replay.run()
+    elapsed = time.perf_counter() - started
+
+    # Give clients a last chance to observe the final balls
+    deadline = time.perf_counter() + drain
+    for watcher in watchers:
+        watcher.join(max(0.0, deadline - time.perf_counter()))
+    stop_sampling.set()
+    sampler.join(5)
+
+    by_kind = defaultdict(lambda: {'clients': 0, 'latencies': [], 'requests': 0, 'not_modified': 0, 'errors': 0, 'balls_seen': 0})
+    for watcher in watchers:
+        totals = by_kind[watcher.kind]
+        totals['clients'] += 1
+        totals['requests'] += watcher.requests
+        totals['not_modified'] += watcher.not_modified
+        totals['errors'] += watcher.errors
+        totals['balls_seen'] += len(watcher.observed)
+        for seq, seen in watcher.observed.items():
+            if seq in replay.ingested:
+                totals['latencies'].append(max(0.0, seen - replay.ingested[seq]))
+
+    report = {
+        'match_id': replay.match_id,
+        'balls': len(replay.ingested),
+        'speed': speed,
+        'elapsed_seconds': round(elapsed, 2),
+        'balls_per_second': round(len(replay.ingested) / elapsed, 1) if elapsed else None,
+        'ingest': dict(latency_summary(replay.post_latency), errors=replay.errors),
+        'clients': {},
+        'server': sampler.summary()
+    }
+    for kind, totals in by_kind.items():
+        report['clients'][kind] = dict(
+            latency_summary(totals['latencies']),
+            clients=totals['clients'],
+            requests=totals['requests'],
+            not_modified=totals['not_modified'],
+            errors=totals['errors'],
+            coverage=round(totals['balls_seen'] / (totals['clients'] * len(replay.ingested)), 3) if replay.ingested else None
+        )
+    return report
+
+def print_report(report):
+    print(f"\n🏏 Replayed {report['balls']} balls into match {report['match_id']} "
+          f"at {report['speed']}x in {report['elapsed_seconds']}s ({report['balls_per_second']} balls/s)")
+    ingest = report['ingest']
+    print(f"📥 Ingest POST: p50 {ingest.get('p50_ms')} ms, p99 {ingest.get('p99_ms')} ms, errors {ingest['errors']}")
+    print("\n👀 Ball ingested -> client observed")
+    print(f"{'kind':<8} {'clients':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'coverage':>9} {'requests':>9} {'304s':>7} {'errors':>6}")
+    for kind, row in sorted(report['clients'].items()):
+        print(f"{kind:<8} {row['clients']:>7} {str(row.get('p50_ms')):>8} {str(row.get('p95_ms')):>8} "
+              f"{str(row.get('p99_ms')):>8} {str(row.get('max_ms')):>8} {str(row['coverage']):>9} "
+              f"{row['requests']:>9} {row['not_modified']:>7} {row['errors']:>6}")
+    server = report['server']
+    if server:
+        print(f"\n🖥️  Server pid {server['pid']}: CPU {server['cpu_seconds']}s "
+              f"(avg {server['cpu_percent_avg']}%, peak {server['cpu_percent_peak']}%), "
+              f"max RSS {server['max_rss_kb'] // 1024} MB, peak threads {server['threads_peak']}, "
+              f"peak stream subscribers {server['stream_subscribers_peak']}")
+    else:
+        print("\n🖥️  Server resource usage unavailable (/health has no process section)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded match against the live-score API')
+    parser.add_argument('recording', nargs='?', help='NDJSON ball-by-ball recording')
+    parser.add_argument('--synthetic', action='store_true', help='generate a random match instead of reading a recording')
+    parser.add_argument('--url', default='http://localhost:5000', help='base URL of app.py')
+    parser.add_argument('--speed', type=float, default=100, help='replay speed, 1 (real time) to 1000')
+    parser.add_argument('--clients', type=int, default=50, help='number of simulated viewers')
+    parser.add_argument('--mix', default=','.join(CLIENT_KINDS),
+                        help=f"client kinds assigned round-robin ({', '.join(CLIENT_KINDS)})")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds between polls for polling clients')
+    parser.add_argument('--drain', type=float, default=5.0, help='seconds to wait for clients after the last ball')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    if not 1 <= args.speed <= 1000:
+        parser.error('--speed must be between 1 and 1000')
+    mix = [kind.strip() for kind in args.mix.split(',') if kind.strip()]
+    if not mix or any(kind not in CLIENT_KINDS for kind in mix):
+        parser.error(f"--mix must list kinds from: {', '.join(CLIENT_KINDS)}")
+    if args.synthetic:
+        fixture, balls = synthetic_recording()
+    elif args.recording:
+        fixture, balls = load_recording(args.recording)
+    else:
+        parser.error('give a recording file or --synthetic')
+
+    report = run_replay(args.url, fixture, balls, args.speed, args.clients, mix, args.poll_interval, args.drain)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
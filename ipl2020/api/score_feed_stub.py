@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+IPL Cricket Hub - Local Score Feed Stub
+Serves a CricAPI-style currentMatches feed for offline testing of the
+score feed poller in app.py. One simulated match advances a ball per
+request; responses carry an ETag so conditional requests get 304s.
+
+Usage:
+    python score_feed_stub.py [--fail-rate 0.2] [--port 5050]
+    SCORE_FEED_URL=http://localhost:5050/v1/currentMatches python app.py
+"""
+
+from flask import Flask, jsonify, request
+from datetime import datetime, timedelta
+import argparse
+import hashlib
+import json
+import random
+import threading
+
+app = Flask(__name__)
+
+class SimulatedMatch:
+    """RCB v KKR (fixture 4 in app.py's mock data), scored ball by ball"""
+
+    TEAMS = [
+        {"name": "Royal Challengers Bangalore", "shortname": "RCB"},
+        {"name": "Kolkata Knight Riders", "shortname": "KKR"}
+    ]
+
+    def __init__(self, seed=37, balls_per_request=1):
+        self.random = random.Random(seed)
+        self.balls_per_request = balls_per_request
+        self.date = (datetime.now() + timedelta(days=2)).strftime("%Y-%m-%d")
+        self.innings = [{'r': 0, 'w': 0, 'balls': 0}]
+        self.ended = False
+        self.lock = threading.Lock()
+
+    def advance(self):
+        with self.lock:
+            for _ in range(self.balls_per_request):
+                if self.ended:
+                    return
+                innings = self.innings[-1]
+                if self.random.random() < 0.05:
+                    innings['w'] += 1
+                else:
+                    innings['r'] += self.random.choice((0, 0, 1, 1, 1, 2, 4, 6))
+                innings['balls'] += 1
+
+                chasing = len(self.innings) == 2
+                over = innings['w'] >= 10 or innings['balls'] >= 120
+                if chasing and (over or innings['r'] > self.innings[0]['r']):
+                    self.ended = True
+                elif over:
+                    self.innings.append({'r': 0, 'w': 0, 'balls': 0})
+
+    def payload(self):
+        with self.lock:
+            score = [{
+                "r": innings['r'],
+                "w": innings['w'],
+                "o": float(f"{innings['balls'] // 6}.{innings['balls'] % 6}"),
+                "inning": f"{self.TEAMS[number]['name']} Inning 1"
+            } for number, innings in enumerate(self.innings)]
+            return {
+                "status": "success",
+                "data": [{
+                    "id": "stub-rcb-kkr",
+                    "name": "Royal Challengers Bangalore vs Kolkata Knight Riders",
+                    "venue": "M Chinnaswamy Stadium, Bangalore",
+                    "date": self.date,
+                    "teams": [team['name'] for team in self.TEAMS],
+                    "teamInfo": self.TEAMS,
+                    "score": score,
+                    "matchStarted": True,
+                    "matchEnded": self.ended
+                }]
+            }
+
+match = SimulatedMatch()
+settings = {'fail_rate': 0.0, 'api_key': None}
+
+@app.route('/v1/currentMatches')
+def current_matches():
+    if settings['api_key'] and request.args.get('apikey') != settings['api_key']:
+        return jsonify({"status": "failure", "reason": "Invalid API key"}), 401
+    if random.random() < settings['fail_rate']:
+        return jsonify({"status": "failure", "reason": "Simulated upstream error"}), 503
+
+    match.advance()
+    body = json.dumps(match.payload())
+    etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest()[:16] + '"'
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304, {'ETag': etag}
+    return app.response_class(body, mimetype='application/json', headers={'ETag': etag})
+
+@app.route('/health')
+def health():
+    return jsonify({"status": "healthy", "ended": match.ended})
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local CricAPI-style score feed')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--balls-per-request', type=int, default=1)
+    parser.add_argument('--api-key', help='require this apikey query parameter')
+    args = parser.parse_args()
+
+    settings['fail_rate'] = args.fail_rate
+    settings['api_key'] = args.api_key
+    match.balls_per_request = args.balls_per_request
+
+    print("🏏 IPL Score Feed Stub Starting...")
+    print(f"📡 Feed at http://localhost:{args.port}/v1/currentMatches")
+    app.run(host='0.0.0.0', port=args.port)
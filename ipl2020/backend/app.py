@@ -11,6 +11,7 @@ import jwt
 import datetime
 import re
 import os
+import threading
 from functools import wraps
 
 app = Flask(__name__)
@@ -23,6 +24,9 @@ app.config['JWT_EXPIRATION_HOURS'] = 24
 # Database setup
 DB_PATH = 'ipl_data.db'
 
+# Resources cached in-process and kept coherent across workers
+CACHED_RESOURCES = ('rosters', 'blocked_users', 'comments', 'commentary')
+
 def init_db():
     """Initialize the database with required tables"""
     conn = sqlite3.connect(DB_PATH)
@@ -78,6 +82,18 @@ def init_db():
         )
     ''')
     
+    # Cache version counters (one row per cached resource, bumped on every write)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            resource TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.executemany(
+        'INSERT OR IGNORE INTO cache_versions (resource, version) VALUES (?, 0)',
+        [(resource,) for resource in CACHED_RESOURCES]
+    )
+    
     # Create default admin if not exists
     cursor.execute('SELECT COUNT(*) FROM admins')
     if cursor.fetchone()[0] == 0:
@@ -93,6 +109,75 @@ def init_db():
 # Initialize database on startup
 init_db()
 
+# ===== CROSS-WORKER CACHE COHERENCE =====
+#
+# Every write to a cached resource bumps its row in cache_versions inside the
+# same transaction. Each worker keeps a per-thread connection and only re-reads
+# the version table when PRAGMA data_version says another connection committed,
+# so the per-request check is a single pragma on an already open connection.
+
+_version_state = threading.local()
+
+def bump_version(cursor, resource):
+    """Invalidate a cached resource in every worker (call before commit)"""
+    cursor.execute(
+        'UPDATE cache_versions SET version = version + 1 WHERE resource = ?',
+        (resource,)
+    )
+
+def get_resource_versions():
+    """Return {resource: version}, re-reading SQLite only after foreign commits"""
+    conn = getattr(_version_state, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _version_state.conn = conn
+        _version_state.data_version = None
+        _version_state.versions = {}
+    
+    data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+    if data_version != _version_state.data_version:
+        _version_state.versions = dict(
+            conn.execute('SELECT resource, version FROM cache_versions').fetchall()
+        )
+        _version_state.data_version = data_version
+    
+    return _version_state.versions
+
+class VersionedCache:
+    """Process-local cache for one resource, dropped when its version changes"""
+    
+    def __init__(self, resource):
+        self.resource = resource
+        self.version = None
+        self.entries = {}
+        self.lock = threading.Lock()
+    
+    def get(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss"""
+        # Read the version before loading so a concurrent write can only make
+        # the cached value newer than its version, never older.
+        version = get_resource_versions().get(self.resource, 0)
+        
+        with self.lock:
+            if version != self.version:
+                self.entries = {}
+                self.version = version
+            elif key in self.entries:
+                return self.entries[key]
+        
+        value = loader()
+        
+        with self.lock:
+            if self.version == version:
+                self.entries[key] = value
+        
+        return value
+
+roster_cache = VersionedCache('rosters')
+blocked_users_cache = VersionedCache('blocked_users')
+comments_cache = VersionedCache('comments')
+commentary_cache = VersionedCache('commentary')
+
 # Helper functions
 def validate_email(email):
     """Validate email format"""
@@ -240,17 +325,13 @@ def post_comment(current_user_id):
     if not is_match_related(text):
         return jsonify({'error': 'Please post only match-related comments'}), 400
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     # Check if user is blocked
-    cursor.execute('SELECT is_blocked FROM users WHERE id = ?', (current_user_id,))
-    user = cursor.fetchone()
-    
-    if user and user[0]:
-        conn.close()
+    if current_user_id in blocked_users_cache.get('ids', load_blocked_user_ids):
         return jsonify({'error': 'You have been blocked from posting comments'}), 403
     
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
     # Insert comment
     cursor.execute(
         'INSERT INTO comments (user_id, text) VALUES (?, ?)',
@@ -262,9 +343,10 @@ def post_comment(current_user_id):
         'UPDATE users SET comment_count = comment_count + 1, last_active = CURRENT_TIMESTAMP WHERE id = ?',
         (current_user_id,)
     )
+    comment_id = cursor.lastrowid
     
+    bump_version(cursor, 'comments')
     conn.commit()
-    comment_id = cursor.lastrowid
     conn.close()
     
     return jsonify({
@@ -273,9 +355,23 @@ def post_comment(current_user_id):
         'message': 'Comment posted successfully'
     }), 201
 
+def load_blocked_user_ids():
+    """Load the set of blocked user ids"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id FROM users WHERE is_blocked = 1')
+    blocked = frozenset(row[0] for row in cursor.fetchall())
+    conn.close()
+    return blocked
+
 @app.route('/api/comments', methods=['GET'])
 def get_comments():
     """Get all comments (not deleted)"""
+    comments = comments_cache.get('all', load_comments)
+    return jsonify({'comments': comments}), 200
+
+def load_comments():
+    """Load all non-deleted comments, newest first"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -298,7 +394,7 @@ def get_comments():
         })
     
     conn.close()
-    return jsonify({'comments': comments}), 200
+    return comments
 
 # ===== ADMIN ENDPOINTS =====
 
@@ -372,6 +468,7 @@ def block_user(admin_id, user_id):
     cursor = conn.cursor()
     
     cursor.execute('UPDATE users SET is_blocked = 1 WHERE id = ?', (user_id,))
+    bump_version(cursor, 'blocked_users')
     conn.commit()
     conn.close()
     
@@ -385,6 +482,7 @@ def unblock_user(admin_id, user_id):
     cursor = conn.cursor()
     
     cursor.execute('UPDATE users SET is_blocked = 0 WHERE id = ?', (user_id,))
+    bump_version(cursor, 'blocked_users')
     conn.commit()
     conn.close()
     
@@ -398,6 +496,7 @@ def delete_comment(admin_id, comment_id):
     cursor = conn.cursor()
     
     cursor.execute('UPDATE comments SET is_deleted = 1 WHERE id = ?', (comment_id,))
+    bump_version(cursor, 'comments')
     conn.commit()
     conn.close()
     
@@ -421,9 +520,10 @@ def post_admin_commentary(admin_id):
         'INSERT INTO admin_commentary (over_number, text, admin_id) VALUES (?, ?, ?)',
         (over_number, text, admin_id)
     )
+    commentary_id = cursor.lastrowid
     
+    bump_version(cursor, 'commentary')
     conn.commit()
-    commentary_id = cursor.lastrowid
     conn.close()
     
     return jsonify({
@@ -435,6 +535,11 @@ def post_admin_commentary(admin_id):
 @app.route('/api/admin/commentary', methods=['GET'])
 def get_admin_commentary():
     """Get all admin commentary"""
+    commentary = commentary_cache.get('all', load_admin_commentary)
+    return jsonify({'commentary': commentary}), 200
+
+def load_admin_commentary():
+    """Load all non-deleted admin commentary, newest first"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -455,7 +560,7 @@ def get_admin_commentary():
         })
     
     conn.close()
-    return jsonify({'commentary': commentary}), 200
+    return commentary
 
 @app.route('/api/admin/commentary/<int:commentary_id>', methods=['DELETE'])
 @admin_required
@@ -465,6 +570,7 @@ def delete_admin_commentary(admin_id, commentary_id):
     cursor = conn.cursor()
     
     cursor.execute('UPDATE admin_commentary SET is_deleted = 1 WHERE id = ?', (commentary_id,))
+    bump_version(cursor, 'commentary')
     conn.commit()
     conn.close()
     
@@ -511,6 +617,17 @@ def get_team_players(team_code):
     if team_code not in valid_teams:
         return jsonify({'error': 'Invalid team code'}), 400
     
+    players = roster_cache.get(team_code, lambda: load_team_players(team_code))
+    
+    return jsonify({
+        'success': True,
+        'team': team_code.upper(),
+        'count': len(players),
+        'players': players
+    }), 200
+
+def load_team_players(team_code):
+    """Load the roster for a team from the database"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -567,13 +684,7 @@ def get_team_players(team_code):
         players.append({k: v for k, v in player.items() if v is not None})
     
     conn.close()
-    
-    return jsonify({
-        'success': True,
-        'team': team_code.upper(),
-        'count': len(players),
-        'players': players
-    }), 200
+    return players
 
 @app.route('/api/players/<team_code>', methods=['POST'])
 @admin_required
@@ -622,6 +733,7 @@ def upload_team_players(team_code, current_admin_id):
         except Exception as e:
             print(f"Error inserting player: {e}")
     
+    bump_version(cursor, 'rosters')
     conn.commit()
     conn.close()
     
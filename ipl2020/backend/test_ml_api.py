@@ -0,0 +1,361 @@
+"""
+Pytest suite for the ML chatbot API (api/chatbot-ai-enhanced.py)
+Run with: python -m pytest backend/test_ml_api.py
+"""
+
+import importlib.util
+import json
+import os
+import random
+import time
+
+import pytest
+
+CHATBOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api', 'chatbot-ai-enhanced.py')
+TEAMS = ['MI', 'CSK', 'RCB', 'KKR', 'DC', 'SRH', 'RR', 'PBKS', 'GT', 'LSG']
+
+@pytest.fixture(scope='module')
+def chatbot(tmp_path_factory):
+    """Import the chatbot (a script with a hyphenated name) in a scratch directory,
+    since it creates its data files in the working directory"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('chatbot'))
+    try:
+        spec = importlib.util.spec_from_file_location('chatbot', CHATBOT_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Each test gets its own match log and model artifact"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def make_matches(count, seed=0):
+    rng = random.Random(seed)
+    matches = []
+    for i in range(count):
+        team1, team2 = rng.sample(TEAMS, 2)
+        matches.append({
+            'date': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}',
+            'team1': team1,
+            'team2': team2,
+            'team1Score': 140 + rng.randrange(60),
+            'team2Score': 140 + rng.randrange(60),
+            'venue': f'Ground {i % 7}',
+            'winner': rng.choice(['team1', 'team2']),
+            'tossWinner': 'team1',
+            'tossDecision': rng.choice(['bat', 'bowl'])
+        })
+    return matches
+
+def model_state(model):
+    return json.dumps([model.team_stats, model.venue_stats, model.toss_impact], sort_keys=True)
+
+def test_workers_learn_each_others_matches_once(chatbot, workdir):
+    first = chatbot.AdvancedCricketPredictor()
+    for match in make_matches(20):
+        first.add_match(match)
+    assert first.train()['success']
+    second = chatbot.AdvancedCricketPredictor()
+
+    # Interleaved adds from two workers sharing the log and the artifact
+    extra = make_matches(10, seed=1)
+    for i, match in enumerate(extra):
+        (first if i % 2 else second).add_match(match)
+    first.sync_log()
+    second.sync_log()
+
+    expected = chatbot.build_model(first.columns, len(first.columns))
+    assert len(first.matches) == len(second.matches) == 30
+    assert first.model.matches_trained == second.model.matches_trained == 30
+    assert model_state(first.model) == model_state(second.model) == model_state(expected)
+
+def test_training_job_loads_supplied_matches_as_a_stage(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    jobs = chatbot.TrainingJobs(predictor)
+    with pytest.raises(ValueError):
+        jobs.start([{'team1': 'MI'}])
+    assert jobs.active is None
+
+    job, _ = jobs.start(make_matches(30))
+    for _ in range(500):
+        if jobs.get(job['id'])['status'] not in ('queued', 'running'):
+            break
+        time.sleep(0.01)
+    job = jobs.get(job['id'])
+    assert job['status'] == 'succeeded'
+    assert 'loading' in job['stage_seconds']
+    assert len(predictor.matches) == 30
+
+def test_reload_adopts_another_workers_model_and_catches_up(chatbot, workdir):
+    first = chatbot.AdvancedCricketPredictor()
+    second = chatbot.AdvancedCricketPredictor()
+    first.replace_matches(make_matches(20))
+    assert first.train()['success']
+    first.add_match(make_matches(1, seed=2)[0])
+
+    second.reload_checked_at = 0
+    assert second.maybe_reload()
+    assert second.model.version == first.model.version
+    assert second.model.matches_trained == 21
+    assert model_state(second.model) == model_state(first.model)
+
+    # After a re-upload the saved model counts matches of the old history,
+    # so a worker loading it must not replay the new history from its count
+    first.replace_matches(make_matches(25, seed=3))
+    third = chatbot.AdvancedCricketPredictor()
+    assert third.model.history != third.history
+    assert third.model.matches_trained == 20
+
+def test_unusable_artifact_keeps_the_current_model(chatbot, workdir, capsys):
+    predictor = chatbot.AdvancedCricketPredictor()
+    predictor.replace_matches(make_matches(20))
+    assert predictor.train()['success']
+    model = predictor.model
+    (workdir / chatbot.MODEL_FILE).write_bytes(b'not a model')
+    capsys.readouterr()
+
+    for _ in range(3):
+        predictor.reload_checked_at = 0
+        assert not predictor.maybe_reload()
+    assert predictor.model is model
+    assert capsys.readouterr().out.count('Could not load') == 1
+
+    # A fresh worker rebuilds the artifact from the log instead of failing to start
+    restarted = chatbot.AdvancedCricketPredictor()
+    assert model_state(restarted.model) == model_state(model)
+
+def test_table_and_ratings_apply_idle_decay(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    matches = make_matches(20)
+    # KTK (Kochi) only played two years before the model's latest match
+    matches.append(dict(matches[0], date='2022-01-05', team1='KTK', team2='MI', winner='team1'))
+    matches.sort(key=lambda match: match['date'])
+    predictor.replace_matches(matches)
+    assert predictor.train()['success']
+    model = predictor.model
+    model = model.with_match(dict(matches[-1], date='2024-12-28'))
+
+    day = model.latest_day
+    decayed = model.rating('KTK', day)
+    assert decayed != model.ratings['KTK']
+    table = model.table()
+    ktk, mi = table['team_ids']['KTK'], table['team_ids']['MI']
+    expected = 1 / (1 + 10 ** (-(decayed - model.rating('MI', day)) / chatbot.ELO_SCALE))
+    assert table['tensor'][ktk, mi, -1] == pytest.approx(expected)
+
+    predictor.model = model
+    quoted = {row['team']: row['rating'] for row in predictor.get_ratings()}
+    assert quoted['KTK'] == round(decayed, 1)
+
+@pytest.mark.parametrize('bad', [
+    {'team1Score': 1e12},
+    {'team1Score': 10 ** 12},
+    {'team2Score': float('nan')},
+    {'team1Score': -1},
+    {'team1Score': 150.5},
+    {'team1': ['MI']},
+    {'team2': {'name': 'CSK'}},
+    {'venue': ['Wankhede']}
+])
+def test_rejected_match_is_not_logged(chatbot, workdir, bad):
+    predictor = chatbot.AdvancedCricketPredictor()
+    for match in make_matches(5):
+        predictor.add_match(match)
+    client = chatbot.app.test_client()
+    chatbot.predictor, saved = predictor, chatbot.predictor
+    try:
+        response = client.post('/api/add-match', json={**make_matches(1, seed=4)[0], **bad})
+    finally:
+        chatbot.predictor = saved
+
+    assert response.status_code == 400
+    assert len(predictor.matches) == len(predictor.columns) == 5
+    restarted = chatbot.AdvancedCricketPredictor()
+    assert len(restarted.matches) == len(restarted.columns) == 5
+
+def test_startup_skips_invalid_logged_matches(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    for match in make_matches(5):
+        predictor.add_match(match)
+    # A record an older version let through
+    predictor.match_log.append({**make_matches(1, seed=4)[0], 'team1Score': 10 ** 12})
+    predictor.match_log.sync()
+
+    restarted = chatbot.AdvancedCricketPredictor()
+    assert len(restarted.matches) == len(restarted.columns) == 5
+
+def test_match_cannot_pose_as_a_reset_marker(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    for match in make_matches(5):
+        predictor.add_match(match)
+    with pytest.raises(ValueError):
+        predictor.add_match({**make_matches(1, seed=4)[0], 'op': 'reset'})
+    with pytest.raises(ValueError):
+        predictor.replace_matches([{**make_matches(1, seed=4)[0], 'op': 'reset'}])
+
+    restarted = chatbot.AdvancedCricketPredictor()
+    assert len(restarted.matches) == 5
+
+def test_unparseable_date_is_rejected(chatbot, workdir):
+    client = chatbot.app.test_client()
+    response = client.post('/api/add-match', json={**make_matches(1)[0], 'date': 'garbage'})
+    assert response.status_code == 400
+    assert 'date' in response.get_json()['error']
+
+def season_state():
+    table = [{'team': team, 'points': 2 * (i % 4), 'nrr': 0.1 * i} for i, team in enumerate(TEAMS)]
+    fixtures = [{'team1': TEAMS[i], 'team2': TEAMS[(i + 3) % len(TEAMS)]} for i in range(len(TEAMS))]
+    return table, fixtures
+
+def test_seeded_season_simulation_repeats(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    predictor.replace_matches(make_matches(40))
+    assert predictor.train()['success']
+    table, fixtures = season_state()
+
+    first = chatbot.simulate_season(predictor.model, table, fixtures, simulations=2000, seed=7)
+    second = chatbot.simulate_season(predictor.model, table, fixtures, simulations=2000, seed=7)
+    assert first['teams'] == second['teams']
+
+def test_simulate_season_rejects_a_bad_seed(chatbot):
+    table, fixtures = season_state()
+    response = chatbot.app.test_client().post('/api/simulate-season', json={
+        'table': table, 'fixtures': fixtures, 'simulations': 100, 'seed': 'x'
+    })
+    assert response.status_code == 400
+    assert 'seed' in response.get_json()['error']
+
+def test_playoff_chat_survives_an_unexpected_scores_response(chatbot, monkeypatch):
+    class Response:
+        def raise_for_status(self):
+            pass
+        
+        def json(self):
+            return {'success': False}
+    
+    monkeypatch.setattr(chatbot.requests, 'get', lambda *args, **kwargs: Response())
+    response = chatbot.app.test_client().post('/api/chat', json={'message': 'MI playoff chances?'})
+    assert response.status_code == 200
+    assert "couldn't load" in response.get_json()['response']
+
+def reference_probability(chatbot, model, team1, team2, venue):
+    """Team 1's win probability computed straight from the ratings (home edge only at known venues)"""
+    day = model.latest_day
+    home = chatbot.is_home(team1, venue) - chatbot.is_home(team2, venue) if venue in model.venue_stats else 0
+    diff = model.rating(team1, day) - model.rating(team2, day) + chatbot.ELO_HOME_ADVANTAGE * home
+    return 100 / (1 + 10 ** (-diff / chatbot.ELO_SCALE))
+
+def test_batch_predictions_match_the_ratings(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    matches = make_matches(60)
+    for match in matches[::4]:
+        match['venue'] = 'Wankhede Stadium, Mumbai'
+    predictor.replace_matches(matches)
+    assert predictor.train()['success']
+    predictor.add_match(make_matches(1, seed=5)[0])   # the table is rebuilt for the new snapshot
+
+    slate = [('MI', 'CSK', 'Wankhede Stadium, Mumbai'), ('CSK', 'MI', 'Wankhede Stadium, Mumbai'),
+             ('RCB', 'KKR', 'Ground 3'), ('GT', 'LSG', None), ('MI', 'Kochi', 'Nowhere')]
+    predictions = predictor.predict_many(slate)
+    for (team1, team2, venue), prediction in zip(slate, predictions):
+        assert prediction['team1_probability'] == pytest.approx(
+            reference_probability(chatbot, predictor.model, team1, team2, venue), abs=0.01)
+        assert prediction == predictor.predict_match(team1, team2, venue)
+
+    chatbot.predictor, saved = predictor, chatbot.predictor
+    try:
+        response = chatbot.app.test_client().post('/api/predict/batch', json={
+            'fixtures': [{'team1': t1, 'team2': t2, 'venue': v} for t1, t2, v in slate]
+        })
+    finally:
+        chatbot.predictor = saved
+    assert response.get_json()['predictions'] == predictions
+
+def test_form_and_venue_counters_follow_added_matches(chatbot, workdir):
+    predictor = chatbot.AdvancedCricketPredictor()
+    matches = make_matches(40, seed=6)
+    predictor.replace_matches(matches[:20])
+    assert predictor.train()['success']
+    for match in matches[20:]:
+        assert predictor.add_match(match)['learned']
+    model = predictor.model
+
+    results, venue_wins = {}, {}
+    for match in matches:
+        winner = match[match['winner']]
+        for team in (match['team1'], match['team2']):
+            results.setdefault(team, []).append('W' if team == winner else 'L')
+        wins = venue_wins.setdefault(winner, {})
+        wins[match['venue']] = wins.get(match['venue'], 0) + 1
+    for team, form in results.items():
+        assert list(model.team_form[team]) == form[-chatbot.FORM_WINDOW:]
+        assert model.team_venues[team] == venue_wins.get(team, {})
+    assert {team: list(form) for team, form in model.team_form.items()} == \
+        {team: list(form) for team, form in chatbot.build_model(predictor.columns, 40).team_form.items()}
+
+    team = matches[-1]['team1']
+    best = model.best_venues(team, limit=2)
+    rates = sorted((wins / model.venue_stats[venue]['matches'] * 100 for venue, wins in venue_wins[team].items()),
+                   reverse=True)
+    assert [venue['win_rate'] for venue in best] == rates[:2]
+    win_rate = results[team][-chatbot.FORM_WINDOW:].count('W') / chatbot.FORM_WINDOW * 100
+    assert model.form(team) == ('Excellent' if win_rate >= 60 else 'Good' if win_rate >= 40 else 'Poor')
+
+def test_idle_rating_decays_by_half_life(chatbot):
+    model = chatbot.ModelSnapshot(ratings={'MI': 1600.0, 'CSK': 1450.0}, rating_days={'MI': 1000, 'CSK': 0})
+    half_life = chatbot.ELO_HALF_LIFE_DAYS
+
+    assert model.rating('MI', 1000 + half_life) == pytest.approx(1550.0)
+    assert model.rating('MI', 1000 + 2 * half_life) == pytest.approx(1525.0)
+    assert model.rating('MI', 900) == 1600.0          # no decay before the last match
+    assert model.rating('CSK', 5000) == 1450.0        # undated teams are not decayed
+    assert model.rating('GT', 5000) == chatbot.ELO_BASE
+
+def test_home_advantage_in_online_step_and_fit(chatbot):
+    step = chatbot.ModelSnapshot().with_match({
+        'date': '2024-04-01', 'team1': 'MI', 'team2': 'CSK', 'team1Score': 180, 'team2Score': 170,
+        'venue': 'Wankhede Stadium, Mumbai', 'winner': 'team1'
+    })
+    expected = 1 / (1 + 10 ** (-chatbot.ELO_HOME_ADVANTAGE / chatbot.ELO_SCALE))
+    assert step.ratings['MI'] == pytest.approx(chatbot.ELO_BASE + chatbot.ELO_K * (1 - expected))
+    assert step.ratings['MI'] + step.ratings['CSK'] == pytest.approx(2 * chatbot.ELO_BASE)
+
+    # Each side always wins at home: equal ratings, and only the venue separates them
+    matches = []
+    for i in range(20):
+        home, away, ground = (('MI', 'CSK', 'Wankhede Stadium, Mumbai') if i % 2
+                              else ('CSK', 'MI', 'MA Chidambaram Stadium'))
+        matches.append({'date': f'2024-04-{1 + i:02d}', 'team1': home, 'team2': away, 'team1Score': 170,
+                        'team2Score': 160, 'venue': ground, 'winner': 'team1'})
+    columns = chatbot.MatchColumns.from_matches(matches)
+    model = chatbot.build_model(columns, len(columns))
+    assert model.ratings['MI'] == pytest.approx(model.ratings['CSK'], abs=0.5)
+
+    table = model.table()
+    mi, csk = table['team_ids']['MI'], table['team_ids']['CSK']
+    wankhede = table['venue_ids']['Wankhede Stadium, Mumbai']
+    assert table['tensor'][mi, csk, wankhede] == pytest.approx(expected, abs=0.01)
+    assert table['tensor'][csk, mi, wankhede] == pytest.approx(1 - expected, abs=0.01)
+    assert table['tensor'][mi, csk, -1] == pytest.approx(0.5, abs=0.01)
+
+def test_season_simulation_totals_and_a_finished_league(chatbot):
+    table, fixtures = season_state()
+    result = chatbot.simulate_season(chatbot.ModelSnapshot(), table, fixtures, simulations=5000, seed=3)
+    rows = result['teams']
+    assert sum(row['top4_probability'] for row in rows) == pytest.approx(400, abs=0.5)
+    assert sum(row['top2_probability'] for row in rows) == pytest.approx(200, abs=0.5)
+    assert sum(row['title_probability'] for row in rows) == pytest.approx(100, abs=0.5)
+    # Ten fixtures, two points each, all handed out
+    assert sum(row['expected_points'] - row['points'] for row in rows) == pytest.approx(20, abs=0.1)
+
+    # With nothing left to play the table decides: points, then net run rate
+    rows = chatbot.simulate_season(chatbot.ModelSnapshot(), table, [], simulations=100, seed=3)['teams']
+    standings = sorted(table, key=lambda row: (-row['points'], -row['nrr']))
+    top4 = {row['team'] for row in standings[:4]}
+    assert {row['team']: row['top4_probability'] for row in rows} == \
+        {row['team']: 100.0 if row['team'] in top4 else 0.0 for row in table}
@@ -0,0 +1,319 @@
+"""
+Pytest suite for the live-scores API (api/app.py)
+Run with: python -m pytest backend/test_scores_api.py
+"""
+
+import importlib.util
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api', 'app.py')
+
+def load_app():
+    """Import api/app.py as a module (it is a script, not a package)"""
+    spec = importlib.util.spec_from_file_location('scores_app', APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+scores = load_app()
+
+@pytest.fixture
+def store(monkeypatch):
+    """A fresh data store behind the Flask routes for each test"""
+    store = scores.IPLDataStore()
+    monkeypatch.setattr(scores, 'data_store', store)
+    return store
+
+@pytest.fixture
+def client(store):
+    return scores.app.test_client()
+
+def start_match(client, team1='GT', team2='LSG'):
+    response = client.post('/api/matches', json={
+        'team1': team1,
+        'team2': team2,
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'venue': 'Narendra Modi Stadium'
+    })
+    assert response.status_code == 201
+    return response.get_json()['data']
+
+def test_invalid_ball_batch_applies_nothing(client, store):
+    match = start_match(client)
+    response = client.post(f"/api/matches/{match['id']}/balls", json={
+        'events': [{'runs': 4}, {'runs': 1}, {'runs': 'six'}]
+    })
+
+    assert response.status_code == 400
+    assert store.scorers[match['id']].events == []
+    assert store.scorers[match['id']].innings[0]['runs'] == 0
+
+def test_ball_batch_past_the_end_of_the_match_applies_nothing(client, store):
+    match = start_match(client)
+    scorer = store.scorers[match['id']]
+    scorer.sync([{'runs': 150, 'wickets': 9, 'balls': 120}, {'runs': 148, 'wickets': 9, 'balls': 119}])
+    response = client.post(f"/api/matches/{match['id']}/balls", json={
+        'events': [{'runs': 0, 'wicket': True}, {'runs': 4}]
+    })
+
+    assert response.status_code == 400
+    assert not scorer.complete
+    assert scorer.innings[1]['wickets'] == 9
+
+def test_ball_batch_is_recorded(client, store):
+    match = start_match(client)
+    response = client.post(f"/api/matches/{match['id']}/balls", json={
+        'events': [{'runs': 4}, {'runs': 1}, {'runs': 0, 'extras': 1, 'extra_type': 'wide'}]
+    })
+
+    assert response.status_code == 201
+    assert response.get_json()['recorded'] == 3
+    assert response.get_json()['data']['team1_score'] == '6/0'
+
+def test_changes_feed_from_zero_includes_new_match(client):
+    match = start_match(client)
+    response = client.get('/api/live-scores/changes?since=0')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['full'] is False
+    changes = {change['id']: change for change in body['data']}
+    assert changes[match['id']]['team1'] == 'GT'
+
+def persistent_store(directory):
+    store = scores.IPLDataStore()
+    store.enable_persistence(str(directory))
+    return store
+
+def test_journal_restore_and_single_writer(tmp_path):
+    writer = persistent_store(tmp_path)
+    assert writer.claim_journal()
+    match = writer.start_match({'team1': 'GT', 'team2': 'LSG', 'date': '2026-04-01'})
+    writer.record_balls(match['id'], [{'runs': 4}, {'runs': 6, 'wicket': False}])
+
+    follower = persistent_store(tmp_path)
+    assert not follower.claim_journal()
+    assert follower.read_only
+    assert follower.scorers[match['id']].match['team1_score'] == '10/0'
+
+    # Followers pick up the writer's new records, including across a compaction
+    writer.record_ball(match['id'], {'runs': 1})
+    writer.compact()
+    writer.record_ball(match['id'], {'runs': 2})
+    follower.journal.followed_at = 0
+    follower.claim_journal()
+    assert follower.scorers[match['id']].match['team1_score'] == '13/0'
+
+def test_journal_ignores_torn_tail(tmp_path):
+    writer = persistent_store(tmp_path)
+    writer.claim_journal()
+    match = writer.start_match({'team1': 'GT', 'team2': 'LSG', 'date': '2026-04-01'})
+    writer.record_ball(match['id'], {'runs': 4})
+    with open(tmp_path / 'journal.ndjson', 'ab') as f:
+        # Valid JSON, but the writer died before the newline
+        f.write(b'{"op":"ball","match_id":%d,"event":{"runs":6},"seq":99}' % match['id'])
+    writer.journal.lock_file.close()   # release the lock as a dead process would
+
+    restored = persistent_store(tmp_path)
+    assert restored.scorers[match['id']].match['team1_score'] == '4/0'
+    assert restored.claim_journal()
+    assert (tmp_path / 'journal.ndjson').read_bytes().endswith(b'\n')
+
+def test_invalid_result_leaves_no_partial_state(client, store):
+    played = {row['team']: row['played'] for row in store.points_table}
+    completed, archived = store.stats.completed, len(store.archive)
+    venues = list(store.archive.names['venue'])
+    response = client.post('/api/results', json={
+        'team1': 'MI', 'team2': 'CSK', 'winner': 'MI', 'season': 'abc', 'venue': 'New Ground',
+        'team1_runs': 180, 'team1_balls': 120, 'team2_runs': 170, 'team2_balls': 120
+    })
+
+    assert response.status_code == 400
+    assert {row['team']: row['played'] for row in store.points_table} == played
+    assert (store.stats.completed, len(store.archive)) == (completed, archived)
+    assert store.archive.names['venue'] == venues
+
+def test_ball_after_sync_extends_the_series(client, store):
+    match = store.sync_match({
+        'team1': 'GT', 'team2': 'LSG', 'date': '2026-04-02', 'venue': 'Ekana',
+        'innings': [{'runs': 100, 'wickets': 2, 'balls': 63}]
+    })
+    response = client.post(f"/api/matches/{match['id']}/balls", json={'runs': 4})
+
+    assert response.status_code == 201
+    assert response.get_json()['data']['team1_score'] == '104/2'
+    series = client.get(f"/api/matches/{match['id']}/series").get_json()['data']['innings'][0]
+    assert len(series['runs_per_over']) == 11
+    assert series['cumulative_runs'][-1] == 104
+    assert sum(series['runs_per_over']) == 104
+
+    # A restored scorer rebuilds the same series from the synced totals and the log
+    restored = scores.MatchScorer.from_state(store.scorers[match['id']].export_state())
+    assert restored.series_data() == store.scorers[match['id']].series_data()
+
+def test_invalid_sync_changes_nothing(store):
+    upcoming = list(store.upcoming_matches)
+    fixture = upcoming[0]
+    with pytest.raises(ValueError):
+        store.sync_match({
+            'team1': fixture['team1'], 'team2': fixture['team2'], 'date': fixture['date'],
+            'innings': [{'runs': 50, 'wickets': 1, 'balls': 30}, {'runs': 'n/a', 'wickets': 0, 'balls': 0}]
+        })
+    assert store.upcoming_matches == upcoming
+    assert fixture['id'] not in store.scorers
+
+def test_feed_promotion_keeps_the_scheduled_fixture(store):
+    fixture = next(m for m in store.upcoming_matches if m['time'] != '7:30 PM')
+    match = store.sync_match({
+        'team1': fixture['team2'].lower(), 'team2': fixture['team1'], 'date': fixture['date'],
+        'venue': 'Somewhere Else', 'time': '7:30 PM',
+        'innings': [{'runs': 40, 'wickets': 1, 'balls': 30}]
+    })
+
+    assert match['id'] == fixture['id']
+    assert (match['venue'], match['time']) == (fixture['venue'], fixture['time'])
+    # The feed decides who batted first; the names are the fixture's
+    assert (match['team1'], match['team2']) == (fixture['team2'], fixture['team1'])
+    assert match['team1_score'] == '40/1'
+
+def test_chase_won_by_a_wide_before_a_legal_ball(client, store):
+    match = start_match(client)
+    won, lost = store.standings.rows['LSG']['won'], store.standings.rows['GT']['lost']
+    store.scorers[match['id']].sync([{'runs': 0, 'wickets': 10, 'balls': 12}])
+    response = client.post(f"/api/matches/{match['id']}/balls", json={'runs': 0, 'extra_type': 'wide'})
+
+    assert response.status_code == 201
+    assert store.scorers[match['id']].complete
+    assert store.standings.rows['LSG']['won'] == won + 1
+    assert store.standings.rows['GT']['lost'] == lost + 1
+
+def test_ball_is_not_applied_when_its_result_is_refused(client, store, monkeypatch):
+    match = start_match(client)
+    scorer = store.scorers[match['id']]
+    scorer.sync([{'runs': 150, 'wickets': 9, 'balls': 120}, {'runs': 148, 'wickets': 9, 'balls': 119}])
+
+    def refuse(result, teams):
+        raise ValueError('refused')
+    monkeypatch.setattr(scores, 'normalize_result', refuse)
+    response = client.post(f"/api/matches/{match['id']}/balls", json={'runs': 0, 'wicket': True})
+
+    assert response.status_code == 400
+    assert not scorer.complete
+    assert scorer.innings[1] == {'runs': 148, 'wickets': 9, 'balls': 119}
+
+def test_nrr_charges_full_overs_to_a_side_bowled_out():
+    table = scores.StandingsTable(['MI', 'CSK', 'RCB'])
+    table.record_result({
+        'team1': 'MI', 'team1_runs': 180, 'team1_balls': 120, 'team1_wickets': 6,
+        'team2': 'CSK', 'team2_runs': 120, 'team2_balls': 90, 'team2_wickets': 10,
+        'winner': 'MI'
+    })
+
+    # CSK faced 15 overs but is charged 20: 180/20 - 120/20 = +3.0
+    assert table.net_run_rate('MI') == pytest.approx(3.0)
+    assert table.net_run_rate('CSK') == pytest.approx(-3.0)
+    assert [row['team'] for row in table.snapshot] == ['MI', 'RCB', 'CSK']
+    assert table.snapshot[0]['points'] == 2
+    assert table.snapshot[2]['against'] == '180/20.0'
+
+def test_fixtures_query_filters_match_a_full_scan(client, store):
+    teams = ['MI', 'CSK', 'RCB', 'KKR', 'GT']
+    venues = ['Wankhede Stadium, Mumbai', 'Eden Gardens, Kolkata', 'Ekana Stadium, Lucknow']
+    for i in range(40):
+        store.fixtures.add({
+            'id': store.fixtures.max_id + 1, 'date': f'2027-04-{1 + i % 20:02d}',
+            'time': '3:30 PM' if i % 3 else '7:30 PM',
+            'team1': teams[i % 5], 'team2': teams[(i + 1 + i // 5 % 4) % 5], 'venue': venues[i % 3]
+        })
+    everything = sorted(store.fixtures.by_id.values(), key=store.fixtures._key)
+    fixture = everything[len(everything) // 2]
+    team, venue = fixture['team1'], fixture['venue']
+    date_from, date_to = everything[0]['date'], fixture['date']
+
+    def scan(**filters):
+        return [m['id'] for m in everything
+                if ('team' not in filters or team in (m['team1'], m['team2']))
+                and ('venue' not in filters or m['venue'].lower() == venue.lower())
+                and ('range' not in filters or date_from <= m['date'] <= date_to)]
+
+    for query, expected in (
+        (f'team={team.lower()}', scan(team=True)),
+        (f'venue={venue.upper()}', scan(venue=True)),
+        (f'team={team}&venue={venue}', scan(team=True, venue=True)),
+        (f'from={date_from}&to={date_to}', scan(range=True)),
+        (f'team={team}&from={date_from}&to={date_to}', scan(team=True, range=True))
+    ):
+        body = client.get(f'/api/fixtures?{query}&limit=100').get_json()
+        assert body['total'] == len(expected), query
+        assert [m['id'] for m in body['data']] == expected, query
+
+    body = client.get('/api/fixtures?order=desc&limit=2&offset=1').get_json()
+    assert [m['id'] for m in body['data']] == [m['id'] for m in everything[::-1][1:3]]
+    assert client.get('/api/fixtures?limit=0').status_code == 400
+
+def test_fixture_import_dedupes_and_reports_rejected_rows(client, store):
+    csv_text = '\n'.join([
+        'Date,Team 1,Team_2,Venue,Time',
+        '2027-05-01,mi,CSK,Wankhede Stadium,19:30',
+        '2027-05-01,CSK,MI,Wankhede Stadium,7:30 PM',   # same fixture, sides swapped
+        '2027-05-02,KXIP,DD,Mohali,15:30',              # old franchise names
+        '2027-05-32,RCB,KKR,Chinnaswamy,19:30',
+        '2027-05-03,RCB,XYZ,Chinnaswamy,19:30',
+        '2027-05-04,GT,GT,Ahmedabad,19:30',
+        '2027-05-05,GT,LSG,,19:30',
+        '',
+        '2027-05-06,RR,SRH,Jaipur,25:00'
+    ])
+    report = client.post('/api/fixtures/import', data=csv_text).get_json()['data']
+
+    assert (report['rows'], report['imported'], report['duplicates'], report['error_count']) == (8, 2, 1, 5)
+    assert [error['line'] for error in report['errors']] == [5, 6, 7, 8, 10]
+    total, page = store.fixtures.query(team='PBKS', date_from='2027-05-02', date_to='2027-05-02')
+    assert total == 1 and page[0]['team2'] == 'DC' and page[0]['time'] == '3:30 PM'
+
+    ndjson = '{"date": "2027-05-01", "team1": "MI", "team2": "CSK", "venue": "Wankhede"}\nnot json\n'
+    report = client.post('/api/fixtures/import?format=ndjson', data=ndjson).get_json()['data']
+    assert (report['duplicates'], report['error_count']) == (1, 1)
+
+def test_archive_group_by_matches_plain_python(tmp_path):
+    archive = scores.ScorecardArchive(capacity=4)
+    innings = []
+    teams = ['MI', 'CSK', 'RCB', 'KKR']
+    for i in range(30):
+        team1, team2 = teams[i % 4], teams[(i + 1 + i // 4 % 3) % 4]
+        runs1, runs2 = 140 + (i * 7) % 60, 130 + (i * 11) % 70
+        result = {
+            'team1': team1, 'team1_runs': runs1, 'team1_balls': 120, 'team1_wickets': i % 10,
+            'team2': team2, 'team2_runs': runs2, 'team2_balls': 120, 'team2_wickets': 10,
+            'winner': team1 if runs1 > runs2 else team2,
+            'venue': ['Wankhede Stadium', 'M Chinnaswamy Stadium'][i % 2], 'season': 2018 + i % 6
+        }
+        archive.append_result(result)
+        innings += [(team1, result['season'], runs1, 1), (team2, result['season'], runs2, 2)]
+
+    def expected(aggregate, key, rows):
+        groups = {}
+        for row in rows:
+            groups.setdefault(key(row), []).append(row[2])
+        return {group: round(aggregate(values), 2) for group, values in groups.items()}
+
+    since = [row for row in innings if row[1] >= 2020]
+    summary = archive.query(season_from=2020, group_by='team')
+    assert {g['team']: g['value'] for g in summary['groups']} == expected(lambda v: sum(v) / len(v), lambda r: r[0], since)
+    assert summary['innings'] == len(since)
+
+    first = [row for row in innings if row[3] == 1 and row[0] == 'MI']
+    summary = archive.query(team='mi', innings=1, aggregate='median', group_by='season')
+    assert {g['season']: g['value'] for g in summary['groups']} == expected(
+        lambda v: float(np.median(v)), lambda r: r[1], first)
+
+    summary = archive.query(venue='chinnaswamy', aggregate='count', group_by='venue')
+    assert summary['groups'] == [{'venue': 'M Chinnaswamy Stadium', 'value': 30}]
+
+    archive.save(str(tmp_path))
+    loaded = scores.ScorecardArchive.load(str(tmp_path))
+    assert loaded.query(season_from=2020, group_by='team') == archive.query(season_from=2020, group_by='team')
@@ -6,6 +6,9 @@
 let matchesData = [];
 let editingMatchId = null;
 
+const TRAINING_POLL_INTERVAL = 1000;  // ms between job status checks
+const TRAINING_POLL_LIMIT = 600;      // give up after this many checks (10 minutes)
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
     loadMatches();
@@ -208,10 +211,15 @@ function updateStats() {
     // Get model accuracy
     const accuracy = localStorage.getItem('ml_model_accuracy');
     if (accuracy) {
-        document.getElementById('modelAccuracy').textContent = accuracy + '%';
+        document.getElementById('modelAccuracy').textContent = formatAccuracy(accuracy);
     }
 }
 
+// The backend reports no accuracy (null) until there are enough matches to hold out
+function formatAccuracy(accuracy) {
+    return accuracy === null || accuracy === 'n/a' ? 'n/a' : accuracy + '%';
+}
+
 // Train ML model
 async function trainModel() {
     if (matchesData.length < 10) {
@@ -221,9 +229,10 @@ async function trainModel() {
 
     showToast('Training ML model... This may take a moment.', true);
 
+    let response;
     try {
         // Send data to Python ML backend
-        const response = await fetch('http://localhost:5001/api/train', {
+        response = await fetch('http://localhost:5001/api/train', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -232,23 +241,10 @@ async function trainModel() {
                 matches: matchesData
             })
         });
-
-        if (response.ok) {
-            const result = await response.json();
-            
-            // Save training info
-            localStorage.setItem('ml_last_training', new Date().toISOString());
-            localStorage.setItem('ml_model_accuracy', result.accuracy || 75);
-            
-            updateStats();
-            showToast(`Model trained successfully! Accuracy: ${result.accuracy || 75}%`);
-        } else {
-            throw new Error('Training failed');
-        }
     } catch (error) {
         console.error('Training error:', error);
         
-        // Fallback: simulate training
+        // Fallback: simulate training (only when the backend cannot be reached)
         setTimeout(() => {
             const accuracy = calculateSimulatedAccuracy();
             localStorage.setItem('ml_last_training', new Date().toISOString());
@@ -256,7 +252,50 @@ async function trainModel() {
             updateStats();
             showToast(`Model trained successfully! Accuracy: ${accuracy}%`);
         }, 2000);
+        return;
+    }
+
+    try {
+        const body = await response.json();
+        if (!response.ok) {
+            throw new Error(body.error || 'Training failed');
+        }
+        const result = await waitForTrainingJob(body.job_id);
+        const accuracy = result.accuracy ?? 'n/a';
+        
+        // Save training info
+        localStorage.setItem('ml_last_training', new Date().toISOString());
+        localStorage.setItem('ml_model_accuracy', accuracy);
+        
+        updateStats();
+        showToast(`Model trained successfully! Accuracy: ${formatAccuracy(accuracy)}`);
+    } catch (error) {
+        console.error('Training error:', error);
+        showToast(`Training failed: ${error.message}`, false);
+    }
+}
+
+// Poll a background training job until it finishes; resolves with its result
+async function waitForTrainingJob(jobId) {
+    for (let attempt = 0; attempt < TRAINING_POLL_LIMIT; attempt++) {
+        await new Promise(resolve => setTimeout(resolve, TRAINING_POLL_INTERVAL));
+        const response = await fetch(`http://localhost:5001/api/train/${jobId}`);
+        if (response.status === 404) {
+            // Pruned from the job history, or the server restarted
+            throw new Error('The training job is no longer known to the server');
+        }
+        if (!response.ok) {
+            throw new Error(`Checking the training job failed (HTTP ${response.status})`);
+        }
+        const { job } = await response.json();
+        if (job.status === 'succeeded') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Training failed');
+        }
     }
+    throw new Error('Timed out waiting for the training job');
 }
 
 // Calculate simulated accuracy based on data quality